@@ -0,0 +1,66 @@
+"""
+Latency/throughput trade-off of the request coalescer.
+
+Concurrent client threads each send single synthetic tweets. Every
+(max_batch_size, max_wait_us) setting is compared against scoring each
+request on its own, and p50/p99 latency plus throughput are reported.
+
+    python -m benchmarks.coalescer_benchmark --concurrency 32 --requests 4000
+"""
+import os
+import argparse
+import tempfile
+
+from benchmarks.common import drive, summarize_latencies, write_results
+from benchmarks.stub_bundle import write_stub_bundle
+from benchmarks.synthetic import generate_tweets
+from src.pipeline.prediction_pipeline import load_bundle
+from src.pipeline.request_coalescer import RequestCoalescer
+from src.utils.text_normalizer import normalize_texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--waits-us", type=int, nargs="+", default=[200, 1000, 5000])
+    parser.add_argument("--output", help="results file (default: reports/benchmarks/coalescer.json)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        predictor = load_bundle(write_stub_bundle(os.path.join(tmp_dir, "bundle")))
+
+    def score_batch(texts):
+        return predictor.predict_cleaned(normalize_texts(texts))
+
+    def predict_direct(text):
+        labels, probabilities = score_batch([text])
+        return labels[0], probabilities[0]
+
+    texts, _ = generate_tweets(args.requests, seed=7)
+    score_batch(texts[:100])  # warm up
+
+    results = {"concurrency": args.concurrency, "direct": summarize_latencies(*drive(predict_direct, texts, args.concurrency))}
+    print(f"direct: {results['direct']}")
+
+    results["coalesced"] = []
+    for max_batch_size in args.batch_sizes:
+        for max_wait_us in args.waits_us:
+            coalescer = RequestCoalescer(score_batch, max_batch_size=max_batch_size, max_wait_us=max_wait_us)
+            summary = summarize_latencies(*drive(coalescer.predict, texts, args.concurrency))
+            info = coalescer.info()
+            summary.update(
+                max_batch_size=max_batch_size,
+                max_wait_us=max_wait_us,
+                mean_batch_size=info["mean_batch_size"],
+                mean_queue_wait_ms=info["mean_queue_wait_s"] * 1000,
+            )
+            results["coalesced"].append(summary)
+            print(f"batch={max_batch_size} wait={max_wait_us}us: {summary}")
+
+    print(f"results written to {write_results('coalescer', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
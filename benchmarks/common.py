@@ -0,0 +1,119 @@
+"""Helpers shared by the benchmark scripts."""
+import os
+import sys
+import json
+import time
+import platform
+import threading
+import subprocess
+import urllib.request
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "reports", "benchmarks")
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of ``values`` (0 < q <= 100)."""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(int(round(q / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def drive(call, payloads, concurrency):
+    """Run ``call(payload)`` from ``concurrency`` threads; returns per-call latencies and wall time."""
+    latencies = []
+    lock = threading.Lock()
+    chunks = [payloads[i::concurrency] for i in range(concurrency)]
+
+    def client(chunk):
+        local = []
+        for payload in chunk:
+            start = time.perf_counter()
+            call(payload)
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, time.perf_counter() - start
+
+
+def summarize_latencies(latencies, wall):
+    return {
+        "requests": len(latencies),
+        "throughput_rps": len(latencies) / wall,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def start_gunicorn(bundle_dir, port, **env_overrides):
+    """Serve ``bundle_dir`` with flask_app/gunicorn.conf.py on ``port``; returns the process once it answers."""
+    env = dict(os.environ, MODEL_SOURCE="bundle", MODEL_BUNDLE_DIR=bundle_dir, PYTHONPATH=REPO_ROOT,
+               GUNICORN_BIND=f"127.0.0.1:{port}", **env_overrides)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", os.path.join("flask_app", "gunicorn.conf.py"), "flask_app.app:app"],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/stats", timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn did not start in time")
+
+
+def machine_info():
+    """CPU model, logical CPUs and total memory of this machine, recorded with every result file."""
+    cpu_model = platform.processor() or None
+    memory_gb = None
+    try:
+        with open("/proc/cpuinfo") as file:
+            cpu_model = next((line.split(":", 1)[1].strip() for line in file if line.startswith("model name")),
+                             cpu_model)
+        memory_gb = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 2**30
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"cpu_model": cpu_model, "cpu_count": os.cpu_count(), "memory_gb": memory_gb}
+
+
+def write_results(name, results, output_path=None):
+    """Write ``results`` plus run metadata as JSON so runs can be diffed commit to commit."""
+    output_path = output_path or os.path.join(RESULTS_DIR, f"{name}.json")
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    payload = {
+        "benchmark": name,
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "machine": machine_info(),
+        "results": results,
+    }
+    with open(output_path, "w") as file:
+        json.dump(payload, file, indent=4)
+    return output_path
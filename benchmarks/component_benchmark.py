@@ -0,0 +1,185 @@
+"""
+Offline benchmark of each pipeline component at growing dataset sizes.
+
+For every size, synthetic tweets are generated and pushed through the
+reference preprocessing steps one at a time, the fused normalizer,
+data_preprocessing.normalize_text, vectorize_text, train_model,
+evaluate_model, and single-text vs batch inference with a Predictor. Each
+component reports seconds (best of --repeat), rows per second and how far the
+peak RSS rose during the call; across sizes this gives throughput and memory
+scaling curves, plus the exponent of time vs rows between neighbouring sizes
+(1.0 is linear).
+
+    python -m benchmarks.component_benchmark --sizes 10000 100000 1000000
+    python -m benchmarks.component_benchmark --baseline benchmarks/baselines/component.json --fail-on-regression
+    python -m benchmarks.component_benchmark --save-baseline
+
+Baselines are machine specific: record benchmarks/baselines/component.json
+with --save-baseline on the machine that compares against it, never by hand.
+The file carries that machine's CPU model, CPU count and memory, and the
+comparison warns when they differ from the current machine. The lemmatization
+step calls WordNet and needs the vendored NLTK corpora (``ensure_nltk_data()``
+downloads them); without them it is skipped, and --save-baseline refuses to
+write a baseline that is missing a step.
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+
+import pandas as pd
+
+from benchmarks.common import REPO_ROOT, machine_info, write_results
+from benchmarks.stub_bundle import install_synthetic_resources
+from benchmarks.synthetic import generate_tweets
+from src.utils import text_normalizer
+from src.utils.profiling import current_rss_mb, peak_rss_mb, reset_peak_rss
+
+BASELINE_PATH = os.path.join(REPO_ROOT, "benchmarks", "baselines", "component.json")
+PREPROCESSING_STEPS = ("lower_case", "remove_stop_words", "removing_numbers", "removing_punctuations",
+                       "removing_urls", "lemmatization")
+
+
+def wordnet_available():
+    try:
+        text_normalizer.warm_up_lemmatizer()
+        return True
+    except LookupError:
+        return False
+
+
+def measure(fn, repeat):
+    """Best wall time of ``repeat`` calls and the largest peak RSS rise over them."""
+    best, peak_rise = math.inf, 0.0
+    for _ in range(repeat):
+        reset_peak_rss()
+        before = current_rss_mb() or 0.0
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+        peak_rise = max(peak_rise, (peak_rss_mb() or 0.0) - before)
+    return best, peak_rise
+
+
+def components(texts, labels, args):
+    """Yield (name, rows, zero-argument callable) in pipeline order; later entries use earlier outputs."""
+    from src.components.data_preprocessing import normalize_text
+    from src.components.text_vectorization import vectorize_text
+    from src.components.model_trainer import train_model
+    from src.components.model_evaluation import evaluate_model
+    from src.pipeline.prediction_pipeline import Predictor
+
+    for name in PREPROCESSING_STEPS:
+        step_fn = getattr(text_normalizer, name)
+        yield name, len(texts), lambda step_fn=step_fn: [step_fn(text) for text in texts]
+    yield "normalize_texts", len(texts), lambda: text_normalizer.normalize_texts(texts)
+
+    frame = pd.DataFrame({"content": texts, "sentiment": labels})
+    yield "normalize_text", len(frame), lambda: normalize_text(frame.copy(), args.n_jobs, args.chunk_size)
+
+    processed = normalize_text(frame.copy(), args.n_jobs, args.chunk_size)
+    split = int(len(processed) * 0.8)
+    train_df, test_df = processed.iloc[:split], processed.iloc[split:]
+    yield "vectorize_text", len(processed), lambda: vectorize_text(train_df, test_df, args.max_features)
+
+    X_train, X_test, vectorizer = vectorize_text(train_df, test_df, args.max_features)
+    model_params = {"C": 0.01, "max_iter": 100, "solver": "liblinear"}
+    yield "train_model", X_train.shape[0], lambda: train_model(X_train, train_df["sentiment"].values, model_params)
+
+    model = train_model(X_train, train_df["sentiment"].values, model_params)
+    yield "evaluate_model", X_test.shape[0], lambda: evaluate_model(model, X_test, test_df["sentiment"].values)
+
+    predictor = Predictor(model, vectorizer, "benchmark")
+    cleaned = test_df["content"].tolist()[:args.inference_texts]
+    yield "inference_single", len(cleaned), lambda: [predictor.predict_cleaned([text]) for text in cleaned]
+    yield "inference_batch", len(cleaned), lambda: [
+        predictor.predict_cleaned(cleaned[i:i + args.batch_size]) for i in range(0, len(cleaned), args.batch_size)
+    ]
+
+
+def add_scaling(curves):
+    """Annotate each curve point with the time-vs-rows exponent from the previous size."""
+    for points in curves.values():
+        for previous, point in zip(points, points[1:]):
+            if previous["seconds"] > 0 and point["rows"] != previous["rows"]:
+                point["time_exponent"] = (math.log(point["seconds"] / previous["seconds"])
+                                          / math.log(point["rows"] / previous["rows"]))
+
+
+def compare(results, baseline_path, tolerance):
+    """Print throughput changes against a baseline; returns the (component, size) pairs slower than ``tolerance``."""
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    print(f"compared with {baseline_path} (commit {baseline.get('commit')}):")
+    if baseline.get("machine") != machine_info():
+        print(f"  warning: baseline machine {baseline.get('machine')} differs from this one {machine_info()}; "
+              "throughput changes include the hardware difference")
+    regressions = []
+    for name, points in results["curves"].items():
+        before = {point["size"]: point for point in baseline["results"]["curves"].get(name, [])}
+        for point in points:
+            previous = before.get(point["size"])
+            if previous is None:
+                continue
+            change = point["rows_per_s"] / previous["rows_per_s"] - 1
+            flag = ""
+            if change < -tolerance:
+                regressions.append((name, point["size"]))
+                flag = "  <-- regression"
+            print(f"  {name} @ {point['size']}: {change:+.1%} rows/s{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000],
+                        help="synthetic tweets per run, e.g. 10000 100000 1000000 10000000")
+    parser.add_argument("--components", nargs="+", help="only run these components")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the fastest is kept")
+    parser.add_argument("--n-jobs", type=int, default=1, help="normalize_text processes")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--max-features", type=int, default=100)
+    parser.add_argument("--inference-texts", type=int, default=2000, help="texts scored by the inference benchmarks")
+    parser.add_argument("--batch-size", type=int, default=64, help="texts per call for inference_batch")
+    parser.add_argument("--baseline", help="results file to compare against (e.g. the stored baseline)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed throughput drop before flagging")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit with status 1 on a regression")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write the results to {BASELINE_PATH}")
+    parser.add_argument("--output", help="results file (default: reports/benchmarks/component.json)")
+    args = parser.parse_args()
+
+    skipped = [] if wordnet_available() else ["lemmatization"]
+    if skipped and args.save_baseline:
+        parser.error("--save-baseline needs every step; vendor the WordNet corpora with "
+                     "python -c 'from src.utils.text_normalizer import ensure_nltk_data; ensure_nltk_data()'")
+    if skipped:
+        print("skipping lemmatization: the WordNet corpora are missing, run "
+              "python -c 'from src.utils.text_normalizer import ensure_nltk_data; ensure_nltk_data()'")
+    results = {"sizes": args.sizes, "repeat": args.repeat, "n_jobs": args.n_jobs,
+               "max_features": args.max_features, "skipped": skipped, "curves": {}}
+    for size in args.sizes:
+        texts, labels = generate_tweets(size, seed=11)
+        install_synthetic_resources(texts)
+        for name, rows, fn in components(texts, labels, args):
+            if name in skipped or (args.components and name not in args.components):
+                continue
+            seconds, peak_rise = measure(fn, args.repeat)
+            point = {"size": size, "rows": rows, "seconds": seconds, "rows_per_s": rows / seconds,
+                     "peak_rss_rise_mb": peak_rise}
+            results["curves"].setdefault(name, []).append(point)
+            print(f"{name} @ {size}: {seconds:.3f}s, {point['rows_per_s']:,.0f} rows/s, peak RSS +{peak_rise:.0f} MB")
+    add_scaling(results["curves"])
+
+    # compare before writing, the baseline may be the file about to be overwritten
+    regressions = compare(results, args.baseline, args.tolerance) if args.baseline else []
+    print(f"results written to {write_results('component', results, args.output)}")
+    if args.save_baseline:
+        print(f"baseline written to {write_results('component', results, BASELINE_PATH)}")
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
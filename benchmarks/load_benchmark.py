@@ -0,0 +1,145 @@
+"""
+Load test for the Flask service.
+
+Drives /predict (one synthetic tweet per request) or /predict_batch at each
+requested concurrency and reports throughput with p50/p95/p99 latency. The
+app serves a stub bundle, so no DagsHub access is needed. ``--mode inprocess``
+calls the app through Flask's test client (no network, no WSGI server);
+``--mode gunicorn`` starts a local gunicorn with flask_app/gunicorn.conf.py.
+
+    python -m benchmarks.load_benchmark --mode gunicorn --concurrency 1 8 32 --requests 2000
+    python -m benchmarks.load_benchmark --baseline reports/benchmarks/load_main.json
+
+The prediction cache is off unless --cache is given, so every request pays
+for normalization and scoring.
+"""
+import os
+import json
+import argparse
+import tempfile
+import threading
+import urllib.parse
+import urllib.request
+
+from benchmarks.common import drive, start_gunicorn, summarize_latencies, write_results
+from benchmarks.synthetic import generate_tweets
+
+
+def build_payloads(endpoint, requests, batch_size, seed=5):
+    if endpoint == "predict":
+        texts, _ = generate_tweets(requests, seed=seed)
+        return texts
+    texts, _ = generate_tweets(requests * batch_size, seed=seed)
+    return [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+
+def inprocess_caller(endpoint):
+    """Return call(payload) that goes through a per-thread Flask test client."""
+    from flask_app.app import app
+
+    local = threading.local()
+
+    def call(payload):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        if endpoint == "predict":
+            response = client.post("/predict", data={"text": payload})
+        else:
+            response = client.post("/predict_batch", json={"texts": payload})
+        if response.status_code != 200:
+            raise RuntimeError(f"/{endpoint} returned {response.status_code}")
+
+    return call
+
+
+def http_caller(endpoint, url):
+    def call(payload):
+        if endpoint == "predict":
+            request = urllib.request.Request(url + "/predict", data=urllib.parse.urlencode({"text": payload}).encode())
+        else:
+            request = urllib.request.Request(url + "/predict_batch", data=json.dumps({"texts": payload}).encode(),
+                                             headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(request, timeout=30).read()
+
+    return call
+
+
+def compare(results, baseline_path):
+    """Print the change of each scenario against the same scenario in a previous results file."""
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    previous = {(s["endpoint"], s["concurrency"], s["batch_size"]): s for s in baseline["results"]["scenarios"]}
+    print(f"compared with {baseline_path} (commit {baseline.get('commit')}):")
+    for scenario in results["scenarios"]:
+        before = previous.get((scenario["endpoint"], scenario["concurrency"], scenario["batch_size"]))
+        if before is None:
+            continue
+        deltas = ", ".join(
+            f"{key} {100 * (scenario[key] - before[key]) / before[key]:+.1f}%"
+            for key in ("throughput_rps", "p50_ms", "p99_ms")
+        )
+        print(f"  /{scenario['endpoint']} concurrency={scenario['concurrency']}: {deltas}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["inprocess", "gunicorn"], default="inprocess")
+    parser.add_argument("--endpoint", choices=["predict", "predict_batch"], default="predict")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per concurrency level")
+    parser.add_argument("--batch-size", type=int, default=32, help="texts per /predict_batch request")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers")
+    parser.add_argument("--threads", type=int, default=8, help="gunicorn threads per worker")
+    parser.add_argument("--port", type=int, default=5056)
+    parser.add_argument("--cache", action="store_true", help="keep the prediction cache enabled")
+    parser.add_argument("--bundle-dir", help="inference bundle to serve (default: a synthetic stub bundle)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--output", help="results file (default: reports/benchmarks/load.json)")
+    args = parser.parse_args()
+
+    batch_size = args.batch_size if args.endpoint == "predict_batch" else 1
+    results = {"mode": args.mode, "cache": args.cache, "scenarios": []}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bundle_dir = args.bundle_dir
+        if bundle_dir is None:
+            from benchmarks.stub_bundle import write_stub_bundle
+            bundle_dir = os.path.join(tmp_dir, "bundle")
+            write_stub_bundle(bundle_dir)
+        bundle_dir = os.path.abspath(bundle_dir)
+        cache_size = "10000" if args.cache else "0"
+
+        process = None
+        if args.mode == "gunicorn":
+            results.update(workers=args.workers, threads=args.threads)
+            process = start_gunicorn(bundle_dir, args.port, WEB_CONCURRENCY=str(args.workers),
+                                     GUNICORN_THREADS=str(args.threads), PREDICTION_CACHE_SIZE=cache_size)
+            call = http_caller(args.endpoint, f"http://127.0.0.1:{args.port}")
+        else:
+            os.environ.update(MODEL_SOURCE="bundle", MODEL_BUNDLE_DIR=bundle_dir, PREDICTION_CACHE_SIZE=cache_size)
+            call = inprocess_caller(args.endpoint)
+
+        try:
+            for payload in build_payloads(args.endpoint, 20, batch_size, seed=1):
+                call(payload)  # warm up
+            for concurrency in args.concurrency:
+                payloads = build_payloads(args.endpoint, args.requests, batch_size)
+                summary = summarize_latencies(*drive(call, payloads, concurrency))
+                summary.update(endpoint=args.endpoint, concurrency=concurrency, batch_size=batch_size)
+                results["scenarios"].append(summary)
+                print(f"/{args.endpoint} concurrency={concurrency}: {summary['throughput_rps']:.0f} req/s, "
+                      f"p50 {summary['p50_ms']:.2f} ms, p95 {summary['p95_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms")
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=30)
+
+    # compare before writing, the baseline may be the file about to be overwritten
+    if args.baseline:
+        compare(results, args.baseline)
+    print(f"results written to {write_results('load', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Per-worker memory of the gunicorn deployment, with and without preload.
+
+Starts gunicorn with flask_app/gunicorn.conf.py serving a bundle, sends some
+traffic, then reads RSS, PSS and USS of every worker (PSS/USS need Linux).
+USS is the memory a worker does not share with anyone, i.e. what each extra
+worker really costs. Every request carries a word missing from the bundle's
+lemma table, so the workers lemmatize through WordNet as real traffic does.
+
+    python -m benchmarks.memory_benchmark --workers 4
+"""
+import os
+import argparse
+import tempfile
+import urllib.parse
+import urllib.request
+
+import psutil
+
+from benchmarks.common import start_gunicorn, write_results
+from benchmarks.synthetic import generate_tweets
+
+# real English words outside the synthetic vocabulary, hence outside the stub bundle's lemma table
+UNSEEN_WORDS = ["running", "geese", "studies", "wolves", "happier", "churches", "mice", "flying",
+                "leaves", "knives", "berries", "swimming", "oxen", "cacti", "wrote", "buses"]
+
+
+def worker_memory(master_pid):
+    workers = []
+    for child in psutil.Process(master_pid).children():
+        info = child.memory_full_info()
+        workers.append({"pid": child.pid, "rss_mb": info.rss / 2**20,
+                        "pss_mb": getattr(info, "pss", 0) / 2**20, "uss_mb": info.uss / 2**20})
+    return workers
+
+
+def measure(bundle_dir, workers, preload, port, requests):
+    process = start_gunicorn(bundle_dir, port, WEB_CONCURRENCY=str(workers),
+                             GUNICORN_PRELOAD="1" if preload else "0")
+    url = f"http://127.0.0.1:{port}"
+    try:
+        texts, _ = generate_tweets(requests, seed=11)
+        for index, text in enumerate(texts):
+            text = f"{text} {UNSEEN_WORDS[index % len(UNSEEN_WORDS)]}"
+            data = urllib.parse.urlencode({"text": text}).encode()
+            urllib.request.urlopen(url + "/predict", data=data, timeout=10).read()
+
+        per_worker = worker_memory(process.pid)
+        return {
+            "preload": preload,
+            "workers": per_worker,
+            "mean_rss_mb": sum(w["rss_mb"] for w in per_worker) / len(per_worker),
+            "mean_pss_mb": sum(w["pss_mb"] for w in per_worker) / len(per_worker),
+            "mean_uss_mb": sum(w["uss_mb"] for w in per_worker) / len(per_worker),
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bundle-dir", help="inference bundle to serve (default: a synthetic stub bundle)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--output", help="results file (default: reports/benchmarks/memory.json)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bundle_dir = args.bundle_dir
+        if bundle_dir is None:
+            from benchmarks.stub_bundle import write_stub_bundle
+            bundle_dir = os.path.join(tmp_dir, "bundle")
+            write_stub_bundle(bundle_dir)
+
+        results = {"workers": args.workers, "runs": []}
+        for preload in (False, True):
+            run = measure(os.path.abspath(bundle_dir), args.workers, preload, args.port, args.requests)
+            results["runs"].append(run)
+            print(f"preload={preload}: per worker RSS {run['mean_rss_mb']:.1f} MB, "
+                  f"PSS {run['mean_pss_mb']:.1f} MB, USS {run['mean_uss_mb']:.1f} MB")
+
+    print(f"results written to {write_results('memory', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Full local retrain: the dvc.yaml stage commands one process at a time (what
+``dvc repro`` runs) vs the in-memory runner src/pipeline/training_pipeline.py.
+
+Each variant runs in its own scratch directory on the same synthetic
+tweet_emotions-style source, with a cold normalization cache, and the DVC
+outputs of both are compared file by file afterwards. Neither variant talks
+to DagsHub: model_evaluation runs as an offline stand-in (load the model and
+test features, evaluate, write reports/metrics.yaml, like the runner without
+--mlflow), and model_registration and the sweep are left out of both.
+
+    python -m benchmarks.pipeline_benchmark --rows 200000
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import hashlib
+import argparse
+import tempfile
+import subprocess
+
+import pandas as pd
+import yaml
+
+from benchmarks.common import REPO_ROOT, write_results
+from benchmarks.synthetic import generate_tweets
+
+SKIPPED_STAGES = ("model_sweep", "model_registration")
+# stages whose command needs DagsHub, replaced by the same work without MLflow
+OFFLINE_COMMANDS = {"model_evaluation": "python -m benchmarks.pipeline_benchmark --evaluate-offline"}
+# pickles embed object ids (CountVectorizer._stop_words_id), so they differ between any two runs
+UNCOMPARABLE = ("vectorizer.pkl", "artifacts/bundle")
+
+
+def write_source(path, rows, seed=7):
+    texts, labels = generate_tweets(rows, seed=seed)
+    rng = random.Random(seed)
+    # about a tenth of other emotions, which data_ingestion filters out
+    sentiments = ["worry" if rng.random() < 0.1 else ("happiness" if label else "sadness") for label in labels]
+    pd.DataFrame({"tweet_id": range(rows), "sentiment": sentiments, "content": texts}).to_csv(path, index=False)
+
+
+def prepare_workdir(workdir, source_path):
+    with open(os.path.join(REPO_ROOT, "params.yaml")) as file:
+        params = yaml.safe_load(file)
+    params["data_ingestion"]["source_url"] = source_path
+    os.makedirs(workdir)
+    with open(os.path.join(workdir, "params.yaml"), "w") as file:
+        yaml.safe_dump(params, file, sort_keys=False)
+
+
+def stage_commands():
+    with open(os.path.join(REPO_ROOT, "dvc.yaml")) as file:
+        stages = yaml.safe_load(file)["stages"]
+    return [(name, OFFLINE_COMMANDS.get(name, stage["cmd"])) for name, stage in stages.items()
+            if name not in SKIPPED_STAGES]
+
+
+def evaluate_offline():
+    """The model_evaluation stage without MLflow, run in the current directory."""
+    import joblib
+    from src.components.model_evaluation import evaluate_model, load_data, save_metrics
+    from src.utils.profiling import profile_stage
+
+    with open("params.yaml") as file:
+        eval_params = yaml.safe_load(file)["model_evaluation"]
+    with profile_stage("model_evaluation"):
+        model = joblib.load(eval_params["model_path"])
+        X_test, y_test = load_data(eval_params["input_test"])
+        acc, report = evaluate_model(model, X_test, y_test)
+        save_metrics(acc, report, eval_params["metrics_path"])
+
+
+def run_command(command, workdir):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    # stage scripts are given relative to the repo root, the data lives in the scratch directory
+    args = [sys.executable if arg == "python" else arg for arg in command.split()]
+    args = [os.path.join(REPO_ROOT, arg) if arg.startswith("src/") else arg for arg in args]
+    start = time.perf_counter()
+    subprocess.run(args, cwd=workdir, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def output_digests(workdir):
+    digests = {}
+    for root, _, files in os.walk(os.path.join(workdir, "artifacts")):
+        for name in files:
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, workdir)
+            if any(part in relative for part in UNCOMPARABLE):
+                continue
+            with open(path, "rb") as file:
+                digests[relative] = hashlib.sha256(file.read()).hexdigest()
+    return digests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000, help="rows in the synthetic source file")
+    parser.add_argument("--output", help="results file (default: reports/benchmarks/pipeline.json)")
+    parser.add_argument("--evaluate-offline", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.evaluate_offline:
+        evaluate_offline()
+        return
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        source_path = os.path.join(tmp_dir, "tweet_emotions.csv")
+        write_source(source_path, args.rows)
+
+        stages_dir, runner_dir = os.path.join(tmp_dir, "stages"), os.path.join(tmp_dir, "runner")
+        prepare_workdir(stages_dir, source_path)
+        prepare_workdir(runner_dir, source_path)
+
+        stage_seconds = {name: run_command(command, stages_dir) for name, command in stage_commands()}
+        for name, seconds in stage_seconds.items():
+            print(f"stage {name}: {seconds:.2f}s")
+        stages_total = sum(stage_seconds.values())
+        runner_total = run_command("python -m src.pipeline.training_pipeline", runner_dir)
+
+        stage_outputs, runner_outputs = output_digests(stages_dir), output_digests(runner_dir)
+        mismatched = sorted(path for path in stage_outputs if stage_outputs[path] != runner_outputs.get(path))
+        results = {
+            "rows": args.rows,
+            "stage_seconds": stage_seconds,
+            "stages_total_s": stages_total,
+            "runner_total_s": runner_total,
+            "speedup": stages_total / runner_total,
+            "outputs_compared": len(stage_outputs),
+            "mismatched_outputs": mismatched,
+        }
+        print(f"stages {stages_total:.2f}s, runner {runner_total:.2f}s ({results['speedup']:.2f}x); "
+              f"{len(stage_outputs) - len(mismatched)}/{len(stage_outputs)} outputs identical")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    print(f"results written to {write_results('pipeline', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
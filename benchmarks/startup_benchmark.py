@@ -0,0 +1,121 @@
+"""
+Cold-start benchmark for the Flask app.
+
+Every measurement runs in a fresh interpreter, like a newly forked gunicorn
+worker: the time to import flask_app.app in bundle and compact mode (model
+load included) and the import time of each heavy dependency on its own.
+
+    python -m benchmarks.startup_benchmark --runs 5
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+
+from benchmarks.common import REPO_ROOT, write_results
+
+HEAVY_MODULES = ["flask", "numpy", "scipy.sparse", "sklearn", "joblib", "pandas", "nltk", "mlflow"]
+
+APP_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import flask_app.app
+elapsed = time.perf_counter() - start
+print(json.dumps({"import_app_s": elapsed, "modules_loaded": len(sys.modules)}))
+"""
+
+MODULE_SNIPPET = """
+import json, time
+start = time.perf_counter()
+import {module}
+print(json.dumps({{"import_s": time.perf_counter() - start}}))
+"""
+
+
+def run_fresh(snippet, env):
+    """Run ``snippet`` in a new interpreter; returns its JSON output and the process wall time."""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", snippet], cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else "failed")
+    return json.loads(completed.stdout.strip().splitlines()[-1]), wall
+
+
+def summarize(values):
+    return {
+        "runs": len(values),
+        "mean_s": statistics.mean(values),
+        "median_s": statistics.median(values),
+        "min_s": min(values),
+        "max_s": max(values),
+    }
+
+
+def benchmark_app_startup(bundle_dir, runs, source="bundle"):
+    env = dict(os.environ, MODEL_SOURCE=source, MODEL_BUNDLE_DIR=bundle_dir, PYTHONPATH=REPO_ROOT)
+    import_times, process_times, modules_loaded = [], [], 0
+    for _ in range(runs):
+        output, wall = run_fresh(APP_SNIPPET, env)
+        import_times.append(output["import_app_s"])
+        process_times.append(wall)
+        modules_loaded = output["modules_loaded"]
+    return {
+        "import_app": summarize(import_times),
+        "process_wall": summarize(process_times),
+        "modules_loaded": modules_loaded,
+    }
+
+
+def benchmark_module_imports(runs):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    results = {}
+    for module in HEAVY_MODULES:
+        try:
+            times = [run_fresh(MODULE_SNIPPET.format(module=module), env)[0]["import_s"] for _ in range(runs)]
+        except RuntimeError as error:
+            results[module] = {"error": str(error)}
+            continue
+        results[module] = summarize(times)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bundle-dir", help="inference bundle to load (default: a synthetic stub bundle)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="results file (default: reports/benchmarks/startup.json)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bundle_dir = args.bundle_dir
+        if bundle_dir is None:
+            from benchmarks.stub_bundle import write_stub_bundle
+            bundle_dir = os.path.join(tmp_dir, "bundle")
+            write_stub_bundle(bundle_dir)
+
+        results = {
+            "app_startup": benchmark_app_startup(os.path.abspath(bundle_dir), args.runs),
+            "app_startup_compact": benchmark_app_startup(os.path.abspath(bundle_dir), args.runs, "compact"),
+            "module_imports": benchmark_module_imports(args.runs),
+        }
+
+    output_path = write_results("startup", results, args.output)
+    for key, mode in (("app_startup", "bundle"), ("app_startup_compact", "compact")):
+        startup = results[key]
+        print(f"app import ({mode} mode): median {startup['import_app']['median_s']:.3f}s, "
+              f"worker process: median {startup['process_wall']['median_s']:.3f}s, "
+              f"{startup['modules_loaded']} modules")
+    for module, timing in results["module_imports"].items():
+        print(f"  import {module}: " + (f"{timing['median_s']:.3f}s" if "median_s" in timing else timing["error"]))
+    print(f"results written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Build a realistic inference bundle from synthetic tweets.
+
+The stop words and lemma table are supplied explicitly (the lemma table maps
+every synthetic token to itself), so neither NLTK corpora nor DagsHub are
+needed to serve it.
+"""
+import os
+import json
+import tempfile
+
+import joblib
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from benchmarks.synthetic import STOP_WORDS, generate_tweets
+from src.components.model_export import export_bundle
+from src.utils.text_normalizer import set_stop_words, tokenize, normalize_texts, set_lemma_table
+
+
+def install_synthetic_resources(texts):
+    """Install stop words and an identity lemma table covering ``texts``; returns the table."""
+    set_stop_words(STOP_WORDS)
+    lemma_table = {token: token for text in set(texts) for token in tokenize(text)}
+    set_lemma_table(lemma_table)
+    return lemma_table
+
+
+def write_stub_bundle(bundle_dir, n_train=5000, max_features=1000, seed=42):
+    """Train a small model on synthetic tweets and export it as a bundle; returns the version dir."""
+    texts, labels = generate_tweets(n_train, seed=seed)
+    lemma_table = install_synthetic_resources(texts)
+
+    vectorizer = CountVectorizer(max_features=max_features)
+    features = vectorizer.fit_transform(normalize_texts(texts))
+    model = LogisticRegression(C=1.0, max_iter=200).fit(features, labels)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = os.path.join(tmp_dir, "model.pkl")
+        vectorizer_path = os.path.join(tmp_dir, "vectorizer.pkl")
+        lemma_table_path = os.path.join(tmp_dir, "lemma_table.json")
+        joblib.dump(model, model_path)
+        joblib.dump(vectorizer, vectorizer_path)
+        with open(lemma_table_path, "w") as file:
+            json.dump(lemma_table, file)
+
+        return export_bundle(model_path, vectorizer_path, lemma_table_path, bundle_dir,
+                             model_name="emotion_predictor_model", stop_words=STOP_WORDS)
@@ -0,0 +1,30 @@
+"""Deterministic synthetic tweets for offline benchmarks."""
+import random
+
+POSITIVE_WORDS = ["love", "happy", "great", "awesome", "fun", "smile", "best", "thanks", "excited", "good"]
+NEGATIVE_WORDS = ["sad", "miss", "hate", "awful", "cry", "worst", "sick", "tired", "sorry", "bad"]
+NEUTRAL_WORDS = [
+    "day", "work", "today", "tomorrow", "night", "morning", "home", "friends", "music", "weekend",
+    "school", "movie", "game", "coffee", "rain", "sun", "phone", "show", "time", "week",
+]
+STOP_WORDS = ["i", "me", "my", "the", "a", "an", "is", "are", "was", "to", "and", "of", "it", "this", "so", "just"]
+EXTRAS = ["@user", "#mood", "http://t.co/abc", "2day", "!!", "...", ":)", ":(", "lol", "omg"]
+
+
+def generate_tweets(n, seed=42):
+    """Return ``n`` tweet-like texts and their 0/1 sentiment labels."""
+    rng = random.Random(seed)
+    texts, labels = [], []
+    for _ in range(n):
+        label = rng.random() < 0.5
+        sentiment_words = POSITIVE_WORDS if label else NEGATIVE_WORDS
+        words = rng.choices(sentiment_words, k=rng.randint(1, 3))
+        # a little label noise so the models are not trivially perfect
+        words += rng.choices(NEGATIVE_WORDS if label else POSITIVE_WORDS, k=rng.randint(0, 1))
+        words += rng.choices(NEUTRAL_WORDS, k=rng.randint(2, 8))
+        words += rng.choices(STOP_WORDS, k=rng.randint(1, 5))
+        words += rng.choices(EXTRAS, k=rng.randint(0, 2))
+        rng.shuffle(words)
+        texts.append(" ".join(word.upper() if rng.random() < 0.05 else word for word in words))
+        labels.append(int(label))
+    return texts, labels
@@ -0,0 +1,114 @@
+"""
+Batch LogisticRegression vs streaming SGD (partial_fit) for the model_trainer stage.
+
+Synthetic tweets (with a rare-token tail, see vectorizer_benchmark) are
+vectorized and written to a temporary feature store. Each configuration then
+trains in a fresh spawned process and reports how far its peak RSS (VmHWM)
+rose above the post-import baseline, i.e. the memory of loading the features
+and fitting; test accuracy and agreement with the batch model's predictions
+are reported alongside.
+
+    python -m benchmarks.training_benchmark --rows 200000 --chunk-size 10000 50000 --epochs 5
+"""
+import os
+import time
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import write_results
+from benchmarks.stub_bundle import install_synthetic_resources
+from benchmarks.synthetic import generate_tweets
+from benchmarks.vectorizer_benchmark import add_rare_tokens
+from src.components.text_vectorization import vectorize_text
+from src.utils.feature_store import load_features, save_features
+from src.utils.profiling import peak_rss_mb
+from src.utils.text_normalizer import normalize_texts
+
+
+def train(train_dir, test_dir, config):
+    from src.components.model_trainer import load_data, train_model, train_model_streaming
+
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+    if config["mode"] == "batch":
+        X_train, y_train = load_data(train_dir)
+        model = train_model(X_train, y_train, config["model_params"])
+    else:
+        model = train_model_streaming(train_dir, config["sgd_params"], chunk_size=config["chunk_size"],
+                                      epochs=config["epochs"])
+    train_s = time.perf_counter() - start
+    training_peak_rss = peak_rss_mb() - baseline_rss
+
+    X_test, y_test = load_features(test_dir, mmap=False)
+    predictions = model.predict(X_test)
+    return {
+        **config,
+        "train_s": train_s,
+        "training_peak_rss_mb": training_peak_rss,
+        "accuracy": float(np.mean(predictions == y_test)),
+        "predictions": predictions,
+    }
+
+
+def run_isolated(*args):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(train, *args).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--rare-vocabulary", type=int, default=100000, help="size of the rare-token tail")
+    parser.add_argument("--max-features", type=int, default=50000)
+    parser.add_argument("--C", type=float, default=0.01, help="batch LogisticRegression C")
+    parser.add_argument("--alpha", type=float, default=None,
+                        help="SGD alpha (default: 1 / (C * training rows), the equivalent L2 penalty)")
+    parser.add_argument("--chunk-size", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--output", help="results file (default: reports/benchmarks/training.json)")
+    args = parser.parse_args()
+
+    texts, labels = generate_tweets(args.rows, seed=3)
+    install_synthetic_resources(texts)
+    frame = pd.DataFrame({"content": add_rare_tokens(normalize_texts(texts), args.rare_vocabulary),
+                          "sentiment": labels})
+    split = int(len(frame) * 0.8)
+    train_df, test_df = frame.iloc[:split], frame.iloc[split:]
+    alpha = args.alpha if args.alpha is not None else 1 / (args.C * split)
+
+    configs = [{"mode": "batch", "model_params": {"C": args.C, "max_iter": 100, "penalty": "l2",
+                                                  "solver": "liblinear"}}]
+    configs += [{"mode": "streaming", "chunk_size": chunk_size, "epochs": args.epochs,
+                 "sgd_params": {"loss": "log_loss", "penalty": "l2", "alpha": alpha, "random_state": 42}}
+                for chunk_size in args.chunk_size]
+
+    results = {"rows": args.rows, "max_features": args.max_features, "runs": []}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        X_train, X_test, _ = vectorize_text(train_df, test_df, args.max_features)
+        train_dir, test_dir = os.path.join(tmp_dir, "train"), os.path.join(tmp_dir, "test")
+        save_features(train_dir, X_train, train_df["sentiment"].values)
+        save_features(test_dir, X_test, test_df["sentiment"].values)
+        del X_train, X_test
+
+        baseline = None
+        for config in configs:
+            result = run_isolated(train_dir, test_dir, config)
+            predictions = result.pop("predictions")
+            if baseline is None:
+                baseline = predictions
+            result["agreement_with_batch"] = float(np.mean(predictions == baseline))
+            results["runs"].append(result)
+            label = config["mode"] if config["mode"] == "batch" else f"streaming chunk_size={config['chunk_size']}"
+            print(f"{label}: train {result['train_s']:.2f}s, peak RSS +{result['training_peak_rss_mb']:.0f} MB, "
+                  f"accuracy {result['accuracy']:.4f}, agreement {result['agreement_with_batch']:.4f}")
+
+    print(f"results written to {write_results('training', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
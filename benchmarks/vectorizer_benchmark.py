@@ -0,0 +1,99 @@
+"""
+CountVectorizer vs HashingVectorizer for the text_vectorization stage.
+
+On normalized synthetic tweets (padded with a long tail of rare tokens so the
+vocabulary is realistically large), every configuration is timed for fit and
+transform of the train and test splits, its peak traced memory (a second,
+traced run) and pickled size are recorded, and a LogisticRegression is
+trained on it to compare test accuracy.
+
+    python -m benchmarks.vectorizer_benchmark --rows 200000 --n-jobs 4
+"""
+import time
+import random
+import pickle
+import argparse
+import tracemalloc
+
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+
+from benchmarks.common import write_results
+from benchmarks.stub_bundle import install_synthetic_resources
+from benchmarks.synthetic import generate_tweets
+from src.components.text_vectorization import vectorize_text
+from src.utils.text_normalizer import normalize_texts
+
+
+def add_rare_tokens(texts, vocabulary_size, seed=0):
+    """Append 0-3 Zipf-distributed rare tokens to every text."""
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, vocabulary_size + 1)]
+    extra = rng.choices(range(vocabulary_size), weights=weights, k=3 * len(texts))
+    return [text + "".join(f" tok{token}" for token in extra[3 * i:3 * i + rng.randint(0, 3)])
+            for i, text in enumerate(texts)]
+
+
+def run(train_df, test_df, **options):
+    start = time.perf_counter()
+    X_train, X_test, vectorizer = vectorize_text(train_df, test_df, **options)
+    vectorize_s = time.perf_counter() - start
+
+    # tracing slows allocation down, so memory is measured on a separate run
+    tracemalloc.start()
+    vectorize_text(train_df, test_df, **options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    model = LogisticRegression(C=1.0, solver="liblinear", max_iter=100).fit(X_train, train_df["sentiment"])
+    train_s = time.perf_counter() - start
+
+    return {
+        **options,
+        "vectorize_s": vectorize_s,
+        "peak_traced_mb": peak / 2**20,
+        "vectorizer_pickle_kb": len(pickle.dumps(vectorizer)) / 1024,
+        "train_nnz": int(X_train.nnz),
+        "train_s": train_s,
+        "accuracy": accuracy_score(test_df["sentiment"], model.predict(X_test)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--rare-vocabulary", type=int, default=100000, help="size of the rare-token tail")
+    parser.add_argument("--max-features", type=int, nargs="+", default=[100, 50000])
+    parser.add_argument("--n-features", type=int, nargs="+", default=[2 ** 10, 2 ** 18])
+    parser.add_argument("--n-jobs", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--output", help="results file (default: reports/benchmarks/vectorizer.json)")
+    args = parser.parse_args()
+
+    texts, labels = generate_tweets(args.rows, seed=3)
+    install_synthetic_resources(texts)
+    frame = pd.DataFrame({"content": add_rare_tokens(normalize_texts(texts), args.rare_vocabulary),
+                          "sentiment": labels})
+    split = int(len(frame) * 0.8)
+    train_df, test_df = frame.iloc[:split], frame.iloc[split:]
+
+    configs = [dict(method="count", max_features=max_features) for max_features in args.max_features]
+    for n_features in args.n_features:
+        for n_jobs in sorted({1, args.n_jobs}):
+            configs.append(dict(method="hashing", max_features=None, n_features=n_features,
+                                n_jobs=n_jobs, chunk_size=args.chunk_size))
+
+    results = {"rows": args.rows, "rare_vocabulary": args.rare_vocabulary, "runs": []}
+    for config in configs:
+        result = run(train_df, test_df, **config)
+        results["runs"].append(result)
+        print(f"{config}: vectorize {result['vectorize_s']:.2f}s, peak {result['peak_traced_mb']:.0f} MB, "
+              f"pickle {result['vectorizer_pickle_kb']:.1f} KB, accuracy {result['accuracy']:.4f}")
+
+    print(f"results written to {write_results('vectorizer', results, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
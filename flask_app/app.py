@@ -1,111 +1,238 @@
-from flask import Flask, render_template,request
-import mlflow
-import pickle
+from flask import Flask, render_template, request, jsonify, g, Response, stream_with_context
 import os
-import pandas as pd
-
-import numpy as np
-import pandas as pd
-import os
-import re
-import nltk
-import string
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
+import json
+import time
+import random
 from pathlib import Path
-import pickle
-
-nltk.download('stopwords')
-nltk.download('wordnet')
-
-def lemmatization(text):
-    """Lemmatize the text."""
-    lemmatizer = WordNetLemmatizer()
-    text = text.split()
-    text = [lemmatizer.lemmatize(word) for word in text]
-    return " ".join(text)
-
-def remove_stop_words(text):
-    """Remove stop words from the text."""
-    stop_words = set(stopwords.words("english"))
-    text = [word for word in str(text).split() if word not in stop_words]
-    return " ".join(text)
-
-def removing_numbers(text):
-    """Remove numbers from the text."""
-    text = ''.join([char for char in text if not char.isdigit()])
-    return text
-
-def lower_case(text):
-    """Convert text to lower case."""
-    text = text.split()
-    text = [word.lower() for word in text]
-    return " ".join(text)
-
-def removing_punctuations(text):
-    """Remove punctuations from the text."""
-    text = re.sub('[%s]' % re.escape(string.punctuation), ' ', text)
-    text = text.replace('؛', "")
-    text = re.sub('\s+', ' ', text).strip()
-    return text
-
-def removing_urls(text):
-    """Remove URLs from the text."""
-    url_pattern = re.compile(r'https?://\S+|www\.\S+')
-    return url_pattern.sub(r'', text)
-
-def remove_small_sentences(df):
-    """Remove sentences with less than 3 words."""
-    for i in range(len(df)):
-        if len(df.text.iloc[i].split()) < 3:
-            df.text.iloc[i] = np.nan
-
-def normalize_text(text):
-    text = lower_case(text)
-    text = remove_stop_words(text)
-    text = removing_numbers(text)
-    text = removing_punctuations(text)
-    text = removing_urls(text)
-    text = lemmatization(text)
-
-    return text
-
-
-# Set up DagsHub credentials for MLflow tracking
-dagshub_token = os.getenv("DAGSHUB_PAT")
-if not dagshub_token:
-    raise EnvironmentError("DAGSHUB_PAT environment variable is not set")
-
-os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
-os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
-
-dagshub_url = "https://dagshub.com"
-repo_owner = "iamprashantjain"
-repo_name = "Emotion-Detection-MLOps"
-
-# Set up MLflow tracking URI
-mlflow.set_tracking_uri(f'{dagshub_url}/{repo_owner}/{repo_name}.mlflow')
 
-app = Flask(__name__)
+from src.utils.text_normalizer import (
+    normalize_texts,
+    normalize_texts_staged,
+    load_lemma_table,
+    lemma_cache_info,
+    ensure_nltk_data,
+    warm_up_lemmatizer,
+)
+from src.utils.prediction_cache import PredictionCache
+from src.utils.metrics import MetricsRegistry
+from src.pipeline.prediction_pipeline import (
+    load_bundle,
+    load_registry_model,
+    latest_bundle_version,
+    get_latest_model_version,
+)
+from src.pipeline.model_watcher import ModelWatcher
+from src.pipeline.request_coalescer import RequestCoalescer, QueueFullError, CoalescerTimeoutError
+from src.logger.logging import logging
 
-# load model from model registry
-def get_latest_model_version(model_name):
-    client = mlflow.MlflowClient()
-    latest_version = client.get_latest_versions(model_name, stages=["Production"])
-    if not latest_version:
-        latest_version = client.get_latest_versions(model_name, stages=["None"])
-    return latest_version[0].version if latest_version else None
+app = Flask(__name__)
 
 model_name = "emotion_predictor_model"
-model_version = get_latest_model_version(model_name)
-
-model_uri = f'models:/{model_name}/{model_version}'
-model = mlflow.pyfunc.load_model(model_uri)
 
+# MODEL_SOURCE=bundle serves the local bundle written by the model_export stage and
+# never touches the network; MODEL_SOURCE=compact serves the same bundle through its
+# NumPy-only scorer (no joblib/scipy/sklearn at all); the default still pulls the
+# Production model from the registry
+MODEL_SOURCE = os.getenv("MODEL_SOURCE", "registry")
 
+bundle_dir = os.getenv("MODEL_BUNDLE_DIR", os.path.join('artifacts', 'bundle'))
 vectorizer_path = Path('artifacts') / 'data' / 'vectorized' / 'vectorizer.pkl'
-vectorizer = pickle.load(vectorizer_path.open('rb'))
 
+BUNDLE_SOURCES = ("bundle", "compact")
+
+if MODEL_SOURCE in BUNDLE_SOURCES:
+    predictor = load_bundle(bundle_dir, compact=MODEL_SOURCE == "compact")
+else:
+    ensure_nltk_data()
+
+    predictor = load_registry_model(model_name, vectorizer_path)
+
+    # frozen token -> lemma table built by the data_preprocessing stage; warm lookups skip WordNet
+    lemma_table_path = Path(os.getenv("LEMMA_TABLE_PATH", Path('artifacts') / 'data' / 'processed' / 'lemma_table.json'))
+    if lemma_table_path.exists():
+        load_lemma_table(lemma_table_path)
+
+# WordNet is a lazy corpus: in a preloading master it is loaded here, before gc.freeze() and
+# the fork, so the workers share it instead of each reading its own on a lemma table miss
+if os.getenv("SERVING_PRELOAD") == "1":
+    warm_up_lemmatizer()
+
+# largest number of texts accepted by the batch endpoint in a single request
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "1000"))
+
+# texts scored per model call by the streaming endpoint; bounds its memory per request
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "1000"))
+
+# predictions keyed by normalized text and model version; PREDICTION_CACHE_DB adds a
+# SQLite tier shared by every gunicorn worker, PREDICTION_CACHE_SIZE=0 disables caching
+prediction_cache_size = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+prediction_cache = PredictionCache(
+    maxsize=prediction_cache_size,
+    ttl=float(os.getenv("PREDICTION_CACHE_TTL", "3600")),
+    db_path=os.getenv("PREDICTION_CACHE_DB"),
+    db_max_rows=int(os.getenv("PREDICTION_CACHE_DB_MAX_ROWS", "1000000")),
+) if prediction_cache_size > 0 else None
+if prediction_cache is not None:
+    prediction_cache.set_live_version(predictor.version)
+
+
+# latency histograms per stage of the request path, served on /metrics
+metrics = MetricsRegistry()
+stage_latency = metrics.histogram(
+    "emotion_stage_latency_seconds", "Latency of each stage of the prediction path.", ("stage", "model_version")
+)
+request_latency = metrics.histogram(
+    "emotion_request_latency_seconds", "End-to-end request latency.", ("endpoint",)
+)
+requests_total = metrics.counter("emotion_requests_total", "Requests served.", ("endpoint", "status"))
+predictions_total = metrics.counter("emotion_predictions_total", "Texts scored.", ("model_version",))
+
+# share of requests whose normalization is also broken down by sub-step; the
+# per-step path is slower than the fused one, so only a sample pays for it
+METRICS_SUBSTEP_SAMPLE_RATE = float(os.getenv("METRICS_SUBSTEP_SAMPLE_RATE", "0.01"))
+
+
+def normalize_observed(texts, version):
+    start = time.perf_counter()
+    if METRICS_SUBSTEP_SAMPLE_RATE > 0 and random.random() < METRICS_SUBSTEP_SAMPLE_RATE:
+        cleaned = normalize_texts_staged(
+            texts, lambda step, seconds: stage_latency.observe(seconds, "normalize_" + step, version)
+        )
+    else:
+        cleaned = normalize_texts(texts)
+    stage_latency.observe(time.perf_counter() - start, "normalize", version)
+    return cleaned
+
+
+def score_cleaned(current, cleaned):
+    """Vectorize and score normalized texts, timing each stage."""
+    start = time.perf_counter()
+    features = current.vectorizer.transform(cleaned)
+    vectorized = time.perf_counter()
+    labels, probabilities = current.score_features(features)
+    stage_latency.observe(vectorized - start, "vectorize", current.version)
+    stage_latency.observe(time.perf_counter() - vectorized, "model_predict", current.version)
+    return labels, probabilities
+
+
+def predict_texts(texts, current=None):
+    """Normalize, vectorize and score a list of texts with one model call."""
+    if not texts:
+        return [], []
+    # read the global once so a concurrent hot reload cannot mix two models in one call
+    current = current or predictor
+    predictions_total.inc(current.version, amount=len(texts))
+    cleaned = normalize_observed(texts, current.version)
+    # a stream started before a hot reload keeps its model; it must not touch the new model's cache
+    if prediction_cache is None or current is not predictor:
+        return score_cleaned(current, cleaned)
+
+    # only texts missing from the cache go through the vectorizer and the model
+    start = time.perf_counter()
+    cached = prediction_cache.get_many(current.version, cleaned)
+    stage_latency.observe(time.perf_counter() - start, "cache_lookup", current.version)
+    missing = [text for text in dict.fromkeys(cleaned) if text not in cached]
+    if missing:
+        labels, probabilities = score_cleaned(current, missing)
+        scored = {
+            text: (int(label), float(probability))
+            for text, label, probability in zip(missing, labels, probabilities)
+        }
+        prediction_cache.set_many(current.version, scored)
+        cached.update(scored)
+
+    labels, probabilities = zip(*(cached[text] for text in cleaned))
+    return labels, probabilities
+
+
+def latest_model_version():
+    if MODEL_SOURCE in BUNDLE_SOURCES:
+        return latest_bundle_version(bundle_dir)
+    return get_latest_model_version(model_name)
+
+
+def load_model_version(version):
+    if MODEL_SOURCE in BUNDLE_SOURCES:
+        return load_bundle(os.path.join(bundle_dir, version), compact=MODEL_SOURCE == "compact")
+    # no local fallback: after a retrain artifacts/ holds a vectorizer that may not match this version
+    return load_registry_model(model_name, model_version=version)
+
+
+def warm_up(new_predictor):
+    """Exercise a freshly loaded model off the request path before it takes traffic."""
+    new_predictor.predict_cleaned(normalize_texts(["I love this!", "This is the worst day ever"]))
+
+
+def swap_predictor(new_predictor):
+    global predictor
+    if prediction_cache is not None:
+        prediction_cache.set_live_version(new_predictor.version)
+    predictor = new_predictor
+
+
+# MODEL_RELOAD_INTERVAL > 0 polls the bundle directory (or the registry) every that many
+# seconds and hot-swaps newly promoted models without restarting the worker
+model_watcher = ModelWatcher(
+    latest_model_version,
+    load_model_version,
+    swap_predictor,
+    current_version=predictor.version,
+    poll_interval=float(os.getenv("MODEL_RELOAD_INTERVAL", "0")),
+    warmup=warm_up,
+)
+
+
+# SERVING_MODE=coalesce micro-batches concurrent /predict calls into one vectorized call;
+# it only pays off with threaded workers (e.g. gunicorn --threads 8)
+SERVING_MODE = os.getenv("SERVING_MODE", "direct")
+coalescer = RequestCoalescer(
+    predict_texts,
+    max_batch_size=int(os.getenv("COALESCE_MAX_BATCH_SIZE", "64")),
+    max_wait_us=int(os.getenv("COALESCE_MAX_WAIT_US", "2000")),
+    max_queue_size=int(os.getenv("COALESCE_QUEUE_SIZE", "10000")),
+    score_timeout_s=float(os.getenv("COALESCE_SCORE_TIMEOUT_S", "5")),
+    autostart=False,
+) if SERVING_MODE == "coalesce" else None
+
+
+def start_background_threads():
+    """Start the model watcher and the coalescer; safe to call more than once."""
+    if model_watcher.poll_interval > 0:
+        model_watcher.start()
+    if coalescer is not None:
+        coalescer.start()
+
+
+# under gunicorn --preload (flask_app/gunicorn.conf.py) this module is imported once in the
+# master and its memory is shared copy-on-write by the forked workers; threads do not survive
+# a fork, so each worker starts its own from the post_worker_init hook instead
+if os.getenv("SERVING_PRELOAD") != "1":
+    start_background_threads()
+
+
+def predict_one(text):
+    """Score one text, going through the coalescer when it is enabled."""
+    if coalescer is not None:
+        try:
+            return coalescer.predict(text)
+        except CoalescerTimeoutError as error:
+            # the scheduler stalled or died: restart it if needed and score this text directly
+            logging.info("%s, scoring directly", error)
+            coalescer.start()
+    labels, probabilities = predict_texts([text])
+    return labels[0], probabilities[0]
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    endpoint = request.endpoint or "unknown"
+    request_latency.observe(time.perf_counter() - g.request_start, endpoint)
+    requests_total.inc(endpoint, str(response.status_code))
+    return response
 
 @app.route('/')
 def home():
@@ -116,21 +243,133 @@ def predict():
 
     text = request.form['text']
 
-    # clean
-    text = normalize_text(text)
-
-    # bow
-    features = vectorizer.transform([text])
-
-    # Convert sparse matrix to DataFrame
-    features_df = pd.DataFrame.sparse.from_spmatrix(features)
-    features_df = pd.DataFrame(features.toarray(), columns=[str(i) for i in range(features.shape[1])])
-
-    # prediction
-    result = model.predict(features_df)
+    # clean, bow and score straight from the sparse matrix
+    try:
+        label, _ = predict_one(text)
+    except QueueFullError as error:
+        return str(error), 503
 
     # show
-    return render_template('index.html', result=result[0])
+    start = time.perf_counter()
+    page = render_template('index.html', result=label)
+    stage_latency.observe(time.perf_counter() - start, "render", predictor.version)
+    return page
+
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    payload = request.get_json(silent=True)
+    # any valid JSON parses, so lists, strings and numbers get the same 400 as a missing 'texts'
+    texts = payload.get('texts') if isinstance(payload, dict) else None
+
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        return jsonify(error="request body must be a JSON object with a 'texts' list of strings"), 400
+    if len(texts) > MAX_BATCH_SIZE:
+        return jsonify(error=f"batch size {len(texts)} exceeds the maximum of {MAX_BATCH_SIZE}"), 413
+    current = predictor
+    if not texts:
+        return jsonify(model_version=current.version, predictions=[])
+
+    labels, probabilities = predict_texts(texts, current)
+
+    predictions = [prediction_record(label, probability) for label, probability in zip(labels, probabilities)]
+    return jsonify(model_version=current.version, predictions=predictions)
+
+def prediction_record(label, probability):
+    return {"label": int(label), "sentiment": "happy" if label == 1 else "sad", "probability": float(probability)}
+
+def parse_stream_line(line):
+    """An NDJSON line is a JSON string or an object with 'text' (and optionally 'id'); returns (id, text)."""
+    item = json.loads(line)
+    if isinstance(item, str):
+        return None, item
+    if isinstance(item, dict) and isinstance(item.get('text'), str):
+        return item.get('id'), item['text']
+    raise ValueError("expected a JSON string or an object with a 'text' string")
+
+@app.route('/predict_stream', methods=['POST'])
+def predict_stream():
+    """
+    Score an NDJSON body of any size, STREAM_CHUNK_SIZE lines per model call,
+    writing one NDJSON result per input line in input order as each chunk finishes.
+    """
+    # one model version for the whole stream, even if a hot reload happens halfway
+    current = predictor
+    body = request.stream
+
+    def score(chunk):
+        labels, probabilities = predict_texts([text for _, _, text in chunk], current)
+        for (index, item_id, _), label, probability in zip(chunk, labels, probabilities):
+            record = {"index": index, **prediction_record(label, probability)}
+            if item_id is not None:
+                record["id"] = item_id
+            yield json.dumps(record) + "\n"
+
+    def generate():
+        chunk = []
+        index = 0
+        for line in body:
+            if not line.strip():
+                continue
+            try:
+                item_id, text = parse_stream_line(line)
+            except ValueError as error:
+                # flush first so results stay in input order
+                yield from score(chunk)
+                chunk = []
+                yield json.dumps({"index": index, "error": str(error)}) + "\n"
+            else:
+                chunk.append((index, item_id, text))
+                if len(chunk) >= STREAM_CHUNK_SIZE:
+                    yield from score(chunk)
+                    chunk = []
+            index += 1
+        yield from score(chunk)
+
+    response = Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+    response.headers["X-Model-Version"] = current.version
+    return response
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify(
+        model_version=predictor.version,
+        model_watcher=model_watcher.info(),
+        lemma_cache=lemma_cache_info(),
+        prediction_cache=prediction_cache.info() if prediction_cache is not None else None,
+        coalescer=coalescer.info() if coalescer is not None else None,
+    )
+
+def collect_runtime_metrics():
+    """Cache and coalescer statistics exported at scrape time."""
+    version = {"model_version": predictor.version}
+    yield "emotion_model_info", "gauge", "Model version currently served.", [(version, 1)]
+
+    lemma = lemma_cache_info()
+    yield "emotion_lemma_cache_hits_total", "counter", "Lemma LRU cache hits.", [({}, lemma["hits"])]
+    yield "emotion_lemma_cache_misses_total", "counter", "Lemma LRU cache misses.", [({}, lemma["misses"])]
+    yield "emotion_lemma_cache_evictions_total", "counter", "Lemma LRU cache evictions.", [({}, lemma["evictions"])]
+    yield "emotion_lemma_cache_size", "gauge", "Tokens in the lemma LRU cache.", [({}, lemma["cache_size"])]
+    yield "emotion_lemma_table_size", "gauge", "Tokens in the frozen lemma table.", [({}, lemma["table_size"])]
+
+    if prediction_cache is not None:
+        cache = prediction_cache.info()
+        for key in ("hits", "shared_hits", "misses", "evictions", "expired"):
+            yield (f"emotion_prediction_cache_{key}_total", "counter", f"Prediction cache {key.replace('_', ' ')}.",
+                   [(version, cache[key])])
+        yield "emotion_prediction_cache_size", "gauge", "Entries in the in-process prediction cache.", [(version, cache["size"])]
+
+    if coalescer is not None:
+        info = coalescer.info()
+        yield "emotion_coalescer_batches_total", "counter", "Batches scored by the coalescer.", [({}, info["batches"])]
+        yield "emotion_coalescer_requests_total", "counter", "Requests scored by the coalescer.", [({}, info["requests"])]
+        yield "emotion_coalescer_queue_size", "gauge", "Requests waiting in the coalescer queue.", [({}, info["queue_size"])]
+
+
+metrics.add_collector(collect_runtime_metrics)
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port = 5000)
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""
+Gunicorn settings for the Flask app (read automatically from the working directory).
+
+With preload (the default) the app module, and with it the model, vectorizer,
+stop words, lemma table and WordNet corpus, is loaded once in the master
+before the workers fork. Workers share those pages copy-on-write, so adding workers adds little
+memory. gc.freeze() keeps the garbage collector from writing to the shared
+objects, which would otherwise copy their pages into every worker.
+
+    GUNICORN_PRELOAD=0 loads the app separately in each worker.
+"""
+import os
+import gc
+import sys
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+if preload_app:
+    # tells the app to leave background threads to post_worker_init
+    os.environ["SERVING_PRELOAD"] = "1"
+
+
+def when_ready(server):
+    if preload_app:
+        gc.collect()
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    # the Flask app is named after its module (app or flask_app.app)
+    sys.modules[worker.wsgi.import_name].start_background_threads()
@@ -1,10 +1,15 @@
 import os
 import sys
+import json
+import hashlib
+import urllib.request
+import urllib.error
 import pandas as pd
 from sklearn.model_selection import train_test_split
 import yaml
 from src.logger.logging import logging
 from src.exception.exception import customexception
+from src.utils.profiling import profile_stage, step
 
 # Load parameters
 def load_params(params_path: str) -> dict:
@@ -23,7 +28,7 @@ def basic_cleaning(df: pd.DataFrame) -> pd.DataFrame:
     try:
         df.drop(columns=['tweet_id'], inplace=True)
         df = df[df['sentiment'].isin(['happiness', 'sadness'])]
-        df['sentiment'] = df['sentiment'].replace({'sadness': 0, 'happiness': 1})
+        df['sentiment'] = df['sentiment'].map({'sadness': 0, 'happiness': 1})
         logging.info("Data basic cleaning done with happiness/sadness filtering and encoding.")
         return df
     except Exception as e:
@@ -31,6 +36,94 @@ def basic_cleaning(df: pd.DataFrame) -> pd.DataFrame:
         raise customexception(e, sys)
 
 
+# Download the source once and reuse it; the cached copy is revalidated with its ETag
+def fetch_source(source_url: str, cache_dir: str) -> str:
+    """
+    Return a local path for ``source_url``. Remote files are cached in ``cache_dir``
+    with their ETag/Last-Modified and sha256; a 304, a 5xx or an unreachable server
+    falls back to the cached copy, so reruns and offline runs read from disk.
+    """
+    try:
+        if not source_url.startswith(("http://", "https://")):
+            return source_url
+
+        os.makedirs(cache_dir, exist_ok=True)
+        key = hashlib.sha256(source_url.encode()).hexdigest()[:16]
+        data_path = os.path.join(cache_dir, f"{key}.csv")
+        meta_path = os.path.join(cache_dir, f"{key}.json")
+
+        meta = None
+        if os.path.exists(meta_path) and os.path.exists(data_path):
+            with open(meta_path) as file:
+                meta = json.load(file)
+            if file_sha256(data_path) != meta["sha256"]:
+                logging.info("Cached copy of %s is corrupt, downloading again", source_url)
+                meta = None
+
+        request = urllib.request.Request(source_url)
+        if meta is not None:
+            if meta.get("etag"):
+                request.add_header("If-None-Match", meta["etag"])
+            if meta.get("last_modified"):
+                request.add_header("If-Modified-Since", meta["last_modified"])
+
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                tmp_path = data_path + ".tmp"
+                digest = hashlib.sha256()
+                with open(tmp_path, "wb") as file:
+                    for block in iter(lambda: response.read(1 << 20), b""):
+                        digest.update(block)
+                        file.write(block)
+                os.replace(tmp_path, data_path)
+                meta = {
+                    "url": source_url,
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "sha256": digest.hexdigest(),
+                }
+                with open(meta_path, "w") as file:
+                    json.dump(meta, file, indent=4)
+                logging.info("Downloaded %s to %s (sha256 %s)", source_url, data_path, meta["sha256"])
+        except urllib.error.HTTPError as error:
+            if meta is None or (error.code != 304 and error.code < 500):
+                raise
+            if error.code == 304:
+                logging.info("Source %s not modified, using cached copy %s", source_url, data_path)
+            else:
+                logging.info("Source %s unavailable (HTTP %d), using cached copy %s", source_url, error.code, data_path)
+        except urllib.error.URLError as error:
+            if meta is None:
+                raise
+            logging.info("Source %s unreachable (%s), using cached copy %s", source_url, error.reason, data_path)
+
+        return data_path
+    except Exception as e:
+        logging.info("Exception occurred during fetch_source in data_ingestion.")
+        raise customexception(e, sys)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Read the source chunk by chunk, keeping only the rows basic_cleaning retains
+def read_source(path: str, chunk_size: int) -> pd.DataFrame:
+    try:
+        chunks = [basic_cleaning(chunk) for chunk in pd.read_csv(path, chunksize=chunk_size)]
+        # the original row labels are kept, so the frame equals cleaning a single full read
+        df = pd.concat(chunks)
+        logging.info("Read %d happiness/sadness rows from %s in chunks of %d", len(df), path, chunk_size)
+        return df
+    except Exception as e:
+        logging.info("Exception occurred during read_source in data_ingestion.")
+        raise customexception(e, sys)
+
+
 # Save data to raw directory
 def save_data(train_data: pd.DataFrame, test_data: pd.DataFrame, data_path: str) -> None:
     try:
@@ -44,6 +137,7 @@ def save_data(train_data: pd.DataFrame, test_data: pd.DataFrame, data_path: str)
         raise customexception(e, sys)
 
 
+@profile_stage("data_ingestion")
 def main():
     try:
         params = load_params(params_path="params.yaml")
@@ -54,24 +148,29 @@ def main():
         random_state = ingestion_params['random_state']
         data_path = ingestion_params['data_path']
 
-        # Read dataset
-        df = pd.read_csv(source_url)
+        # Read dataset from the local cache, filtering and encoding chunk by chunk
+        with step("fetch_source"):
+            source_path = fetch_source(source_url, ingestion_params.get('cache_dir', os.path.join('.cache', 'data_ingestion')))
+        with step("read_source") as record:
+            df_cleaned = read_source(source_path, ingestion_params.get('chunk_size', 100000))
+            record["rows"] = len(df_cleaned)
         logging.info("Data read successfully from %s", source_url)
 
-        # Clean data
-        df_cleaned = basic_cleaning(df)
-
         # Train-test split
-        train_data, test_data = train_test_split(
-            df_cleaned,
-            test_size=test_size,
-            random_state=random_state,
-            stratify=df_cleaned['sentiment']
-        )
+        with step("train_test_split") as record:
+            train_data, test_data = train_test_split(
+                df_cleaned,
+                test_size=test_size,
+                random_state=random_state,
+                stratify=df_cleaned['sentiment']
+            )
+            record["rows"] = len(df_cleaned)
         logging.info(f"Train-test split done with test_size={test_size}, random_state={random_state}")
 
         # Save to CSV
-        save_data(train_data, test_data, data_path)
+        with step("save_data") as record:
+            save_data(train_data, test_data, data_path)
+            record["rows"] = len(train_data) + len(test_data)
 
         logging.info("Data ingestion pipeline completed successfully.")
 
@@ -2,56 +2,48 @@ import os
 import sys
 import numpy as np
 import pandas as pd
-import re
-import nltk
-import string
+import yaml
 
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
 from src.logger.logging import logging
 from src.exception.exception import customexception
-
-nltk.download('stopwords')
-nltk.download('wordnet')
-
-# Preprocessing Functions
-lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words("english"))
-
-def lemmatization(text):
-    return " ".join([lemmatizer.lemmatize(word) for word in text.split()])
-
-def remove_stop_words(text):
-    return " ".join([word for word in text.split() if word not in stop_words])
-
-def removing_numbers(text):
-    return ''.join([char for char in text if not char.isdigit()])
-
-def lower_case(text):
-    return " ".join([word.lower() for word in text.split()])
-
-def removing_punctuations(text):
-    text = re.sub('[%s]' % re.escape(string.punctuation), ' ', text)
-    text = text.replace('؛', "")
-    return re.sub('\s+', ' ', text).strip()
-
-def removing_urls(text):
-    return re.sub(r'https?://\S+|www\.\S+', '', text)
+# the step functions are re-exported so existing imports from this module keep working
+from src.utils.text_normalizer import (
+    lemmatization,
+    remove_stop_words,
+    removing_numbers,
+    lower_case,
+    removing_punctuations,
+    removing_urls,
+    normalize_series,
+    configure_lemma_cache,
+    build_lemma_table,
+    save_lemma_table,
+    set_lemma_table,
+    lemma_cache_info,
+    ensure_nltk_data,
+    normalizer_fingerprint,
+)
+from src.utils.normalization_cache import NormalizationCache
+from src.utils.profiling import profile_stage, step
+
+def load_params(params_path: str) -> dict:
+    try:
+        with open(params_path, 'r') as file:
+            params = yaml.safe_load(file)
+        logging.info("Parameters loaded from %s", params_path)
+        return params
+    except Exception as e:
+        logging.info("Exception occurred while loading params.yaml")
+        raise customexception(e, sys)
 
 def remove_small_sentences(df):
     df['content'] = df['content'].apply(lambda x: np.nan if len(str(x).split()) < 3 else x)
     return df
 
-def normalize_text(df):
+def normalize_text(df, n_jobs=1, chunk_size=10000, cache=None):
     try:
-        logging.info("Starting text normalization.")
-        df['content'] = df['content'].astype(str)
-        df['content'] = df['content'].apply(lower_case)\
-                                     .apply(remove_stop_words)\
-                                     .apply(removing_numbers)\
-                                     .apply(removing_punctuations)\
-                                     .apply(removing_urls)\
-                                     .apply(lemmatization)
+        logging.info("Starting text normalization with n_jobs=%s.", n_jobs)
+        df['content'] = normalize_series(df['content'], n_jobs, chunk_size, cache)
         df = remove_small_sentences(df)
         df = df.dropna(subset=['content'])
         logging.info("Text normalization completed.")
@@ -60,24 +52,73 @@ def normalize_text(df):
         logging.info("Exception occurred during normalize_text in data_preprocessing.")
         raise customexception(e, sys)
 
+def create_lemma_table(df, lemma_table_path):
+    """Build the token -> lemma table from the training corpus and save it for serving."""
+    try:
+        table = build_lemma_table(df['content'].map(str))
+        save_lemma_table(table, lemma_table_path)
+        set_lemma_table(table)
+        logging.info("Lemma table with %d tokens saved to %s", len(table), lemma_table_path)
+        return table
+    except Exception as e:
+        logging.info("Exception occurred during create_lemma_table in data_preprocessing.")
+        raise customexception(e, sys)
+
+@profile_stage("data_preprocessing")
 def main():
     try:
-        input_train = "artifacts/data/raw/train.csv"
-        input_test = "artifacts/data/raw/test.csv"
-        output_path = "artifacts/data/processed"
+        params = load_params("params.yaml")
+        preprocessing_params = params['data_preprocessing']
+
+        input_train = preprocessing_params['input_train']
+        input_test = preprocessing_params['input_test']
+        output_path = preprocessing_params['output_path']
         os.makedirs(output_path, exist_ok=True)
 
-        df_train = pd.read_csv(input_train)
-        df_test = pd.read_csv(input_test)
-        logging.info("Train and test data loaded.")
+        ensure_nltk_data()
+        configure_lemma_cache(preprocessing_params['lemma_cache_size'])
 
-        df_train_processed = normalize_text(df_train)
-        df_test_processed = normalize_text(df_test)
+        with step("load_data") as record:
+            df_train = pd.read_csv(input_train)
+            df_test = pd.read_csv(input_test)
+            record["rows"] = len(df_train) + len(df_test)
+        logging.info("Train and test data loaded.")
 
-        df_train_processed.to_csv(os.path.join(output_path, "train_processed.csv"), index=False)
-        df_test_processed.to_csv(os.path.join(output_path, "test_processed.csv"), index=False)
+        if preprocessing_params['build_lemma_table']:
+            with step("create_lemma_table") as record:
+                create_lemma_table(df_train, preprocessing_params['lemma_table_path'])
+                record["rows"] = len(df_train)
+        else:
+            # lemma_table.json is a declared out of this stage; an empty table leaves every lookup to WordNet
+            save_lemma_table({}, preprocessing_params['lemma_table_path'])
+
+        # n_jobs > 1 (or -1 for every core) normalizes chunk_size texts per task in a process pool
+        n_jobs = preprocessing_params.get('n_jobs', 1)
+        chunk_size = preprocessing_params.get('chunk_size', 10000)
+        # texts normalized by earlier runs with the same normalizer are read back instead of recomputed
+        cache = None
+        if preprocessing_params.get('normalization_cache'):
+            cache = NormalizationCache(preprocessing_params['normalization_cache'], normalizer_fingerprint())
+
+        with step("normalize_text") as record:
+            df_train_processed = normalize_text(df_train, n_jobs, chunk_size, cache)
+            df_test_processed = normalize_text(df_test, n_jobs, chunk_size, cache)
+            record["rows"] = len(df_train) + len(df_test)
+
+        if cache is not None:
+            logging.info("Normalization cache stats: %s", cache.info())
+            with step("compact_normalization_cache"):
+                removed = cache.compact(preprocessing_params.get('normalization_cache_max_age_days'))
+            logging.info("Normalization cache compacted, %d stale entries removed", removed)
+            cache.close()
+
+        with step("save_data") as record:
+            df_train_processed.to_csv(os.path.join(output_path, "train_processed.csv"), index=False)
+            df_test_processed.to_csv(os.path.join(output_path, "test_processed.csv"), index=False)
+            record["rows"] = len(df_train_processed) + len(df_test_processed)
 
         logging.info("Train and test preprocessed data saved to %s", output_path)
+        logging.info("Lemma cache stats: %s", lemma_cache_info())
 
     except Exception as e:
         logging.info("Exception occurred in main data_preprocessing pipeline.")
@@ -1,36 +1,20 @@
 import os
 import sys
 import json
-import pandas as pd
 import yaml
 import joblib
 from sklearn.metrics import accuracy_score, classification_report
 from src.logger.logging import logging
 from src.exception.exception import customexception
-import dagshub
-import mlflow
+from src.utils.feature_store import load_features
+from src.utils.profiling import profile_stage, step
+from src.pipeline.prediction_pipeline import VECTORIZER_ARTIFACT, configure_dagshub_tracking
 
 # Initialize DagsHub + MLflow Tracking URI
 # mlflow.set_tracking_uri("https://dagshub.com/iamprashantjain/Emotion-Detection-MLOps.mlflow")
 # dagshub.init(repo_owner='iamprashantjain', repo_name='Emotion-Detection-MLOps', mlflow=True)
 
 
-# Set up DagsHub credentials for MLflow tracking
-dagshub_token = os.getenv("DAGSHUB_PAT")
-if not dagshub_token:
-    raise EnvironmentError("DAGSHUB_PAT environment variable is not set")
-
-os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
-os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
-
-dagshub_url = "https://dagshub.com"
-repo_owner = "iamprashantjain"
-repo_name = "Emotion-Detection-MLOps"
-
-# Set up MLflow tracking URI
-mlflow.set_tracking_uri(f'{dagshub_url}/{repo_owner}/{repo_name}.mlflow')
-
-
 def load_params(params_path: str):
     try:
         with open(params_path, 'r') as file:
@@ -44,9 +28,7 @@ def load_params(params_path: str):
 
 def load_data(file_path: str):
     try:
-        df = pd.read_csv(file_path)
-        X = df.drop(columns=["sentiment"]).values
-        y = df["sentiment"].values
+        X, y = load_features(file_path)
         logging.info(f"Test data loaded from {file_path}")
         return X, y
     except Exception as e:
@@ -99,8 +81,46 @@ def save_model_info(run_id: str, artifact_path: str, output_file: str):
         raise customexception(e, sys)
 
 
+def tracked_params(trainer_params: dict) -> dict:
+    """Hyperparameters of the model model_trainer actually fit, for the MLflow run."""
+    if trainer_params.get("mode", "batch") == "streaming":
+        streaming = trainer_params["streaming"]
+        return {**streaming["sgd_params"], "mode": "streaming", "epochs": streaming.get("epochs", 5),
+                "chunk_size": streaming.get("chunk_size", 50000)}
+    return trainer_params["model_params"]
+
+
+def log_to_mlflow(model, acc, report, model_params, run_name: str, experiment_info_path: str,
+                  vectorizer_path: str = None):
+    """Log params, metrics, the model and its vectorizer to the active MLflow experiment and save the run info."""
+    # imported here: mlflow takes about a second to import and only this step needs it
+    import mlflow
+
+    try:
+        with mlflow.start_run(run_name=run_name) as run:
+            mlflow.log_params(model_params)
+            mlflow.log_metric("accuracy", acc)
+            mlflow.log_metric("precision_class_0", report["0"]["precision"])
+            mlflow.log_metric("precision_class_1", report["1"]["precision"])
+            mlflow.log_metric("recall_class_0", report["0"]["recall"])
+            mlflow.log_metric("recall_class_1", report["1"]["recall"])
+
+            mlflow.sklearn.log_model(model, artifact_path="model")
+            if vectorizer_path:
+                # served with the registered model, see prediction_pipeline.load_run_vectorizer
+                mlflow.log_artifact(vectorizer_path, artifact_path=os.path.dirname(VECTORIZER_ARTIFACT))
+            save_model_info(run.info.run_id, "model", experiment_info_path)
+    except Exception as e:
+        logging.info("Error logging to MLflow")
+        raise customexception(e, sys)
+
+
+@profile_stage("model_evaluation")
 def main():
     try:
+        # DagsHub credentials are only needed here, so the module imports offline
+        configure_dagshub_tracking()
+
         params = load_params("params.yaml")
         eval_params = params["model_evaluation"]
         trainer_params = params["model_trainer"]
@@ -111,28 +131,28 @@ def main():
         experiment_name = eval_params["experiment_name"]
         run_name = eval_params["run_name"]
         experiment_info_path = eval_params["experiment_info_path"]
+        vectorizer_path = eval_params["vectorizer_path"]
 
         logging.info(f"Loading model from {model_path}")
-        model = joblib.load(model_path)
+        with step("load_model"):
+            model = joblib.load(model_path)
 
-        X_test, y_test = load_data(input_test)
+        with step("load_data") as record:
+            X_test, y_test = load_data(input_test)
+            record["rows"] = X_test.shape[0]
 
-        acc, report = evaluate_model(model, X_test, y_test)
+        with step("evaluate_model") as record:
+            acc, report = evaluate_model(model, X_test, y_test)
+            record["rows"] = X_test.shape[0]
 
         save_metrics(acc, report, metrics_path)
 
+        import mlflow
         mlflow.set_experiment(experiment_name)
 
-        with mlflow.start_run(run_name=run_name) as run:
-            mlflow.log_params(trainer_params["model_params"])
-            mlflow.log_metric("accuracy", acc)
-            mlflow.log_metric("precision_class_0", report["0"]["precision"])
-            mlflow.log_metric("precision_class_1", report["1"]["precision"])
-            mlflow.log_metric("recall_class_0", report["0"]["recall"])
-            mlflow.log_metric("recall_class_1", report["1"]["recall"])
-
-            mlflow.sklearn.log_model(model, artifact_path="model")
-            save_model_info(run.info.run_id, "model", experiment_info_path)
+        with step("mlflow_logging"):
+            log_to_mlflow(model, acc, report, tracked_params(trainer_params), run_name, experiment_info_path,
+                          vectorizer_path)
 
         logging.info("Model evaluation pipeline completed successfully with MLflow tracking.")
 
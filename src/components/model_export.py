@@ -0,0 +1,143 @@
+import os
+import sys
+import json
+import shutil
+import hashlib
+from datetime import datetime, timezone
+import yaml
+from src.logger.logging import logging
+from src.exception.exception import customexception
+from src.utils.text_normalizer import NORMALIZER_VERSION, get_stop_words
+from src.pipeline.compact_scorer import compile_compact_model, load_compact_model, compare_with_sklearn
+from src.utils.profiling import profile_stage, step
+
+MANIFEST_FILE = "manifest.json"
+LATEST_FILE = "LATEST"
+COMPACT_FILE = "scorer.npz"
+
+
+def load_params(params_path: str) -> dict:
+    try:
+        with open(params_path, 'r') as file:
+            params = yaml.safe_load(file)
+        logging.info("Parameters loaded from %s", params_path)
+        return params
+    except Exception as e:
+        logging.info("Error loading params.yaml")
+        raise customexception(e, sys)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def compile_compact_scorer(model_path: str, vectorizer_path: str, output_path: str, quantization: str):
+    """Compile the NumPy-only scorer and check it against the sklearn model it came from; None if unsupported."""
+    import joblib
+
+    model = joblib.load(model_path)
+    vectorizer = joblib.load(vectorizer_path)
+    if not hasattr(vectorizer, "vocabulary_"):
+        # a HashingVectorizer has no token list to compile; such bundles serve through the pickles
+        logging.info("Vectorizer %s has no vocabulary, skipping the compact scorer", type(vectorizer).__name__)
+        return None
+    compile_compact_model(model, vectorizer, output_path, quantization)
+
+    parity = compare_with_sklearn(model, vectorizer, load_compact_model(output_path))
+    # float32 must reproduce every label; quantized modes only report their error
+    if quantization == "float32" and parity["label_agreement"] < 1.0:
+        raise ValueError(f"Compact scorer disagrees with the sklearn model: {parity}")
+    logging.info(f"Compact scorer ({quantization}) compiled: {parity}")
+    return {"file": COMPACT_FILE, "quantization": quantization, **parity}
+
+
+def export_bundle(model_path: str, vectorizer_path: str, lemma_table_path: str, bundle_dir: str,
+                  model_name: str, stop_words=None, compact_quantization="float32") -> str:
+    """
+    Write a self-contained inference bundle to ``bundle_dir/<version>`` and point
+    ``bundle_dir/LATEST`` at it.
+
+    The bundle holds the model, the vectorizer, the normalizer resources (stop words
+    and lemma table), the compact NumPy-only scorer unless ``compact_quantization`` is
+    None, and a manifest with checksums. The version is derived from the content, so
+    re-exporting unchanged artifacts yields the same bundle.
+    """
+    try:
+        staging_dir = os.path.join(bundle_dir, ".staging")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+
+        shutil.copyfile(model_path, os.path.join(staging_dir, "model.pkl"))
+        shutil.copyfile(vectorizer_path, os.path.join(staging_dir, "vectorizer.pkl"))
+        if lemma_table_path and os.path.exists(lemma_table_path):
+            shutil.copyfile(lemma_table_path, os.path.join(staging_dir, "lemma_table.json"))
+
+        compact = None
+        if compact_quantization:
+            compact = compile_compact_scorer(model_path, vectorizer_path,
+                                             os.path.join(staging_dir, COMPACT_FILE), compact_quantization)
+
+        stop_words = sorted(get_stop_words() if stop_words is None else stop_words)
+        with open(os.path.join(staging_dir, "stop_words.json"), 'w', encoding='utf-8') as file:
+            json.dump(stop_words, file, ensure_ascii=False)
+
+        files = {name: file_sha256(os.path.join(staging_dir, name)) for name in sorted(os.listdir(staging_dir))}
+        version = hashlib.sha256(json.dumps(files, sort_keys=True).encode()).hexdigest()[:12]
+
+        manifest = {
+            "version": version,
+            "model_name": model_name,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "normalizer_version": NORMALIZER_VERSION,
+            "files": files,
+            "compact": compact,
+        }
+        with open(os.path.join(staging_dir, MANIFEST_FILE), 'w') as file:
+            json.dump(manifest, file, indent=4)
+
+        version_dir = os.path.join(bundle_dir, version)
+        shutil.rmtree(version_dir, ignore_errors=True)
+        os.replace(staging_dir, version_dir)
+
+        # write the pointer last and atomically so readers never see a half-written bundle
+        latest_tmp = os.path.join(bundle_dir, LATEST_FILE + ".tmp")
+        with open(latest_tmp, 'w') as file:
+            file.write(version)
+        os.replace(latest_tmp, os.path.join(bundle_dir, LATEST_FILE))
+
+        logging.info(f"Inference bundle {version} exported to {version_dir}")
+        return version_dir
+    except Exception as e:
+        logging.info("Error exporting inference bundle.")
+        raise customexception(e, sys)
+
+
+@profile_stage("model_export")
+def main():
+    try:
+        params = load_params("params.yaml")
+        export_params = params['model_export']
+
+        with step("export_bundle"):
+            export_bundle(
+                model_path=export_params['model_path'],
+                vectorizer_path=export_params['vectorizer_path'],
+                lemma_table_path=export_params['lemma_table_path'],
+                bundle_dir=export_params['bundle_dir'],
+                model_name=params['model_registration']['model_name'],
+                compact_quantization=export_params.get('compact_quantization', 'float32'),
+            )
+
+        logging.info("Model export pipeline completed.")
+
+    except Exception as e:
+        logging.info("Exception in model_export main function.")
+        raise customexception(e, sys)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import dagshub
 
 from src.logger.logging import logging
 from src.exception.exception import customexception
+from src.utils.profiling import profile_stage, step
 
 # mlflow.set_tracking_uri("https://dagshub.com/iamprashantjain/Emotion-Detection-MLOps.mlflow")
 # dagshub.init(repo_owner='iamprashantjain', repo_name='Emotion-Detection-MLOps', mlflow=True)
@@ -46,6 +47,9 @@ def load_model_info(file_path: str) -> dict:
 def register_model(model_name: str, model_info: dict):
     """Register the model to the MLflow Model Registry."""
     try:
+        if model_info['run_id'] is None:
+            raise ValueError("The model was evaluated without MLflow tracking (training_pipeline without "
+                             "--mlflow); rerun model_evaluation before registering it")
         model_uri = f"runs:/{model_info['run_id']}/{model_info['artifact_path']}"
         
         # Register the model
@@ -78,6 +82,7 @@ def load_params(params_path):
 
 
 
+@profile_stage("model_register")
 def main():
     try:
         params = load_params("params.yaml")
@@ -87,7 +92,8 @@ def main():
         model_name = registration_params['model_name']
 
         model_info = load_model_info(model_info_path)
-        register_model(model_name, model_info)
+        with step("register_model"):
+            register_model(model_name, model_info)
 
     except Exception as e:
         logging.info('Failed to complete the model registration process: %s', e)
@@ -1,11 +1,19 @@
 import os
 import sys
-import pandas as pd
+import csv
+import time
 import joblib
 import yaml
-from sklearn.linear_model import LogisticRegression
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
 from src.logger.logging import logging
 from src.exception.exception import customexception
+from src.utils.feature_store import load_features, read_meta, iter_feature_chunks
+from src.utils.profiling import profile_stage, step
 
 
 def load_params(params_path: str) -> dict:
@@ -21,10 +29,8 @@ def load_params(params_path: str) -> dict:
 
 def load_data(file_path: str):
     try:
-        df = pd.read_csv(file_path)
-        X = df.drop(columns=["sentiment"]).values
-        y = df["sentiment"].values
-        logging.info("Data loaded from %s", file_path)
+        X, y = load_features(file_path)
+        logging.info("Data loaded from %s (%s rows, %s features, %s non-zeros)", file_path, X.shape[0], X.shape[1], X.nnz)
         return X, y
     except Exception as e:
         logging.info(f"Error loading data from {file_path}")
@@ -42,6 +48,193 @@ def train_model(X_train, y_train, model_params):
         raise customexception(e, sys)
 
 
+def load_checkpoint(checkpoint_path, fingerprint):
+    """Return the saved training state if it belongs to the same data and settings, else None."""
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return None
+    state = joblib.load(checkpoint_path)
+    if state.get("fingerprint") != fingerprint:
+        logging.info("Ignoring checkpoint %s: data or streaming params changed", checkpoint_path)
+        return None
+    logging.info("Resuming from checkpoint %s (epoch %s, chunk %s)", checkpoint_path, state["epoch"], state["position"])
+    return state
+
+
+def save_checkpoint(checkpoint_path, model, epoch, position, fingerprint):
+    os.makedirs(os.path.dirname(checkpoint_path) or ".", exist_ok=True)
+    tmp_path = checkpoint_path + ".tmp"
+    joblib.dump({"model": model, "epoch": epoch, "position": position, "fingerprint": fingerprint}, tmp_path)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def train_model_streaming(features_dir, sgd_params, chunk_size=50000, epochs=5, random_state=42,
+                          checkpoint_path=None, checkpoint_every=10):
+    """
+    Fit an SGDClassifier with partial_fit over row chunks of the feature store,
+    ``epochs`` passes in a seeded random chunk order. Only one chunk is held in
+    memory at a time. With ``checkpoint_path`` the model and position are saved
+    every ``checkpoint_every`` chunks and at the end of each epoch, and an
+    interrupted run resumes from there; the checkpoint is removed on completion.
+    """
+    try:
+        meta = read_meta(features_dir)
+        n_chunks = -(-meta["shape"][0] // chunk_size)
+        _, labels = load_features(features_dir, mmap=True)
+        classes = np.unique(labels)
+        fingerprint = {"meta": meta, "sgd_params": dict(sgd_params), "chunk_size": chunk_size,
+                       "epochs": epochs, "random_state": random_state}
+
+        state = load_checkpoint(checkpoint_path, fingerprint)
+        if state is None:
+            model, start_epoch, start_position = SGDClassifier(**sgd_params), 0, 0
+        else:
+            model, start_epoch, start_position = state["model"], state["epoch"], state["position"]
+
+        for epoch in range(start_epoch, epochs):
+            order = np.random.default_rng(random_state + epoch).permutation(n_chunks)
+            chunks = iter_feature_chunks(features_dir, chunk_size, order[start_position:])
+            for position, (X_chunk, y_chunk) in enumerate(chunks, start=start_position + 1):
+                model.partial_fit(X_chunk, y_chunk, classes=classes)
+                if checkpoint_path and position % checkpoint_every == 0 and position < n_chunks:
+                    save_checkpoint(checkpoint_path, model, epoch, position, fingerprint)
+            start_position = 0
+            if checkpoint_path:
+                save_checkpoint(checkpoint_path, model, epoch + 1, 0, fingerprint)
+            logging.info("Streaming training epoch %s/%s done (%s chunks)", epoch + 1, epochs, n_chunks)
+
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        logging.info("Streaming model training completed.")
+        return model
+    except Exception as e:
+        logging.info("Error during streaming model training.")
+        raise customexception(e, sys)
+
+
+# solvers that can start from the previous coefficients (liblinear cannot)
+WARM_START_SOLVERS = ("lbfgs", "newton-cg", "newton-cholesky", "sag", "saga")
+
+_sweep_data = {}
+
+
+def sweep_candidates(grid, search="grid", n_iter=10, random_state=42):
+    """The full parameter grid, or ``n_iter`` random draws from it."""
+    if search == "random":
+        return list(ParameterSampler(grid, n_iter=n_iter, random_state=random_state))
+    return list(ParameterGrid(grid))
+
+
+def regularization_paths(candidates):
+    """Group candidates that differ only in C, each group ordered from strongest to weakest regularization."""
+    paths = {}
+    for candidate in candidates:
+        key = repr(sorted((name, value) for name, value in candidate.items() if name != "C"))
+        paths.setdefault(key, []).append(candidate)
+    return [sorted(path, key=lambda candidate: candidate.get("C", 1.0)) for path in paths.values()]
+
+
+def _init_sweep_worker(features_dir, cv, random_state):
+    # every worker maps the same feature files, so the matrix is shared through the page cache
+    X, y = load_features(features_dir, mmap=True)
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=random_state).split(np.zeros(len(y)), y)
+    _sweep_data.update(X=X, y=y, folds=list(folds))
+
+
+def fit_path(path, fold, model_params, scoring):
+    """Fit one regularization path on one CV fold, warm-starting each C from the previous fit when the solver allows."""
+    X, y = _sweep_data["X"], _sweep_data["y"]
+    train_index, val_index = _sweep_data["folds"][fold]
+    X_train, y_train, X_val, y_val = X[train_index], y[train_index], X[val_index], y[val_index]
+    scorer = get_scorer(scoring)
+
+    warm_start = {**model_params, **path[0]}.get("solver", "lbfgs") in WARM_START_SOLVERS
+    model, rows = None, []
+    for candidate in path:
+        if model is None:
+            model = LogisticRegression(**{**model_params, **candidate, "warm_start": warm_start})
+        else:
+            model.set_params(**candidate)
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        rows.append({"params": candidate, "fold": fold, "score": float(scorer(model, X_val, y_val)),
+                     "fit_s": time.perf_counter() - start, "n_iter": int(np.max(model.n_iter_)),
+                     "warm_started": warm_start and len(rows) > 0})
+    return rows
+
+
+def sweep(features_dir, model_params, sweep_params):
+    """
+    Cross-validate the candidates of ``sweep_params`` (grid or random search
+    over ``model_params`` overrides) in a process pool. A task is one
+    regularization path on one fold. Returns (best params, per-candidate table).
+    """
+    try:
+        cv = sweep_params.get("cv", 5)
+        scoring = sweep_params.get("scoring", "accuracy")
+        random_state = sweep_params.get("random_state", 42)
+        candidates = sweep_candidates(sweep_params["grid"], sweep_params.get("search", "grid"),
+                                      sweep_params.get("n_iter", 10), random_state)
+        paths = regularization_paths(candidates)
+        tasks = [(path, fold) for path in paths for fold in range(cv)]
+        n_jobs = sweep_params.get("n_jobs", 1)
+        n_jobs = os.cpu_count() if n_jobs in (-1, 0, None) else n_jobs
+        logging.info("Sweeping %d candidates (%d paths x %d folds) with %d jobs",
+                     len(candidates), len(paths), cv, n_jobs)
+
+        initargs = (features_dir, cv, random_state)
+        start = time.perf_counter()
+        if n_jobs <= 1 or len(tasks) <= 1:
+            _init_sweep_worker(*initargs)
+            results = [fit_path(path, fold, model_params, scoring) for path, fold in tasks]
+        else:
+            with ProcessPoolExecutor(min(n_jobs, len(tasks)), initializer=_init_sweep_worker,
+                                     initargs=initargs) as pool:
+                futures = [pool.submit(fit_path, path, fold, model_params, scoring) for path, fold in tasks]
+                results = [future.result() for future in futures]
+        logging.info("Sweep finished in %.1fs", time.perf_counter() - start)
+
+        table = {}
+        for row in (row for rows in results for row in rows):
+            entry = table.setdefault(repr(sorted(row["params"].items())), {"params": row["params"], "rows": []})
+            entry["rows"].append(row)
+        table = [{
+            **entry["params"],
+            f"mean_{scoring}": float(np.mean([row["score"] for row in entry["rows"]])),
+            f"std_{scoring}": float(np.std([row["score"] for row in entry["rows"]])),
+            "mean_fit_s": float(np.mean([row["fit_s"] for row in entry["rows"]])),
+            "mean_n_iter": float(np.mean([row["n_iter"] for row in entry["rows"]])),
+            "warm_started": any(row["warm_started"] for row in entry["rows"]),
+        } for entry in table.values()]
+        table.sort(key=lambda row: row[f"mean_{scoring}"], reverse=True)
+
+        best = {**model_params, **{name: table[0][name] for name in sweep_params["grid"]}}
+        return best, table
+    except Exception as e:
+        logging.info("Error during hyperparameter sweep.")
+        raise customexception(e, sys)
+
+
+def save_sweep_report(best_params, table, sweep_params):
+    try:
+        best_params_path = sweep_params.get("best_params_path", "reports/sweep_best_params.yaml")
+        results_path = sweep_params.get("results_path", "reports/sweep_results.csv")
+        scoring = sweep_params.get("scoring", "accuracy")
+        for path in (best_params_path, results_path):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        with open(best_params_path, "w") as f:
+            yaml.dump({"model_params": best_params, f"cv_{scoring}": table[0][f"mean_{scoring}"]}, f)
+        columns = list(dict.fromkeys(name for row in table for name in row))
+        with open(results_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(table)
+        logging.info(f"Sweep results saved to {results_path}, best params to {best_params_path}")
+    except Exception as e:
+        logging.info("Error saving sweep report.")
+        raise customexception(e, sys)
+
+
 def save_model(model, model_path):
     try:
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
@@ -52,8 +245,12 @@ def save_model(model, model_path):
         raise customexception(e, sys)
 
 
-def main():
+def main(argv=None):
     try:
+        parser = argparse.ArgumentParser(description="Train the model, or sweep its hyperparameters with --sweep.")
+        parser.add_argument("--sweep", action="store_true", help="cross-validate model_trainer.sweep instead of training")
+        args = parser.parse_args(argv)
+
         params = load_params("params.yaml")
         trainer_params = params['model_trainer']
         model_params = trainer_params['model_params']
@@ -61,11 +258,38 @@ def main():
         input_train = trainer_params['input_train']
         output_model_path = trainer_params['output_model_path']
 
-        X_train, y_train = load_data(input_train)
+        if args.sweep:
+            with profile_stage("model_sweep"):
+                with step("sweep") as record:
+                    best_params, table = sweep(input_train, model_params, trainer_params['sweep'])
+                    record["rows"] = read_meta(input_train)["shape"][0]
+                save_sweep_report(best_params, table, trainer_params['sweep'])
+            logging.info("Hyperparameter sweep completed, best params: %s", best_params)
+            return
 
-        model = train_model(X_train, y_train, model_params)
+        with profile_stage("model_trainer"):
+            if trainer_params.get('mode', 'batch') == 'streaming':
+                streaming = trainer_params['streaming']
+                with step("train_model_streaming") as record:
+                    model = train_model_streaming(
+                        input_train, streaming['sgd_params'],
+                        chunk_size=streaming.get('chunk_size', 50000),
+                        epochs=streaming.get('epochs', 5),
+                        random_state=streaming.get('random_state', 42),
+                        checkpoint_path=streaming.get('checkpoint_path'),
+                        checkpoint_every=streaming.get('checkpoint_every', 10),
+                    )
+                    record["rows"] = read_meta(input_train)["shape"][0]
+            else:
+                with step("load_data") as record:
+                    X_train, y_train = load_data(input_train)
+                    record["rows"] = X_train.shape[0]
+                with step("train_model") as record:
+                    model = train_model(X_train, y_train, model_params)
+                    record["rows"] = X_train.shape[0]
 
-        save_model(model, output_model_path)
+            with step("save_model"):
+                save_model(model, output_model_path)
 
         logging.info("Model training pipeline completed.")
 
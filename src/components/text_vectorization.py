@@ -1,11 +1,15 @@
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import joblib
 import yaml
-from sklearn.feature_extraction.text import CountVectorizer
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
 from src.logger.logging import logging
 from src.exception.exception import customexception
+from src.utils.feature_store import save_features
+from src.utils.profiling import profile_stage, step
 import pickle
 
 def load_params(params_path: str):
@@ -29,14 +33,55 @@ def load_data(file_path):
         raise customexception(e, sys)
 
 
-def vectorize_text(train_df, test_df, max_features):
-    try:
-        vectorizer = CountVectorizer(max_features=max_features)
+def hashing_vectorizer(n_features):
+    # raw token counts like CountVectorizer, just indexed by hash instead of a fitted vocabulary
+    return HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None)
+
+
+def hashing_transform(vectorizer, texts, n_jobs=1, chunk_size=50000):
+    """Transform ``texts`` in chunks; the vectorizer is stateless, so chunks run in parallel processes."""
+    texts = list(texts)
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    n_jobs = os.cpu_count() if n_jobs in (-1, 0, None) else n_jobs
+    if n_jobs <= 1 or len(chunks) <= 1:
+        matrices = [vectorizer.transform(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(min(n_jobs, len(chunks))) as pool:
+            matrices = list(pool.map(vectorizer.transform, chunks))
+    if not matrices:
+        return vectorizer.transform([])
+    return sparse.vstack(matrices, format='csr')
+
+
+def fit_vectorizer(train_df, max_features, method="count", n_features=2 ** 18, n_jobs=1, chunk_size=50000):
+    """Fit the vectorizer on the training texts; returns (X_train, vectorizer)."""
+    if method == "hashing":
+        vectorizer = hashing_vectorizer(n_features)
+        return hashing_transform(vectorizer, train_df['content'], n_jobs, chunk_size), vectorizer
+
+    if method != "count":
+        raise ValueError(f"Unknown vectorizer {method!r}, expected 'count' or 'hashing'")
+
+    vectorizer = CountVectorizer(max_features=max_features)
+    return vectorizer.fit_transform(train_df['content']), vectorizer
+
 
-        X_train = vectorizer.fit_transform(train_df['content'])
-        X_test = vectorizer.transform(test_df['content'])
+def transform_texts(vectorizer, df, n_jobs=1, chunk_size=50000):
+    """Vectorize ``df['content']`` with a vectorizer returned by fit_vectorizer()."""
+    if isinstance(vectorizer, HashingVectorizer):
+        return hashing_transform(vectorizer, df['content'], n_jobs, chunk_size)
+    return vectorizer.transform(df['content'])
 
-        logging.info("Vectorization done with max_features=%s", max_features)
+
+def vectorize_text(train_df, test_df, max_features, method="count", n_features=2 ** 18, n_jobs=1, chunk_size=50000):
+    try:
+        X_train, vectorizer = fit_vectorizer(train_df, max_features, method, n_features, n_jobs, chunk_size)
+        X_test = transform_texts(vectorizer, test_df, n_jobs, chunk_size)
+
+        if method == "hashing":
+            logging.info("Hashing vectorization done with n_features=%s", n_features)
+        else:
+            logging.info("Vectorization done with max_features=%s", max_features)
         return X_train, X_test, vectorizer
     except Exception as e:
         logging.info("Exception occurred during vectorization.")
@@ -47,26 +92,23 @@ def save_vectorized_data(X_train, X_test, train_df, test_df, vectorizer, output_
     try:
         os.makedirs(output_path, exist_ok=True)
 
-        train_features = pd.DataFrame(X_train.toarray(), columns=vectorizer.get_feature_names_out())
-        train_features['sentiment'] = train_df['sentiment'].values
-
-        test_features = pd.DataFrame(X_test.toarray(), columns=vectorizer.get_feature_names_out())
-        test_features['sentiment'] = test_df['sentiment'].values
-
-        train_path = os.path.join(output_path, "train_vectorized.csv")
-        test_path = os.path.join(output_path, "test_vectorized.csv")
+        # sparse CSR arrays instead of dense CSVs; only non-zero counts are written
+        train_path = os.path.join(output_path, "train_features")
+        test_path = os.path.join(output_path, "test_features")
         vectorizer_path = os.path.join(output_path, "vectorizer.pkl")
 
-        train_features.to_csv(train_path, index=False)
-        test_features.to_csv(test_path, index=False)
+        save_features(train_path, X_train, train_df['sentiment'].values)
+        save_features(test_path, X_test, test_df['sentiment'].values)
         joblib.dump(vectorizer, vectorizer_path)
 
-        logging.info("Vectorized datasets and vectorizer saved to %s", output_path)
+        logging.info("Vectorized datasets (%s and %s non-zeros) and vectorizer saved to %s",
+                     X_train.nnz, X_test.nnz, output_path)
     except Exception as e:
         logging.info("Exception occurred during saving vectorized data.")
         raise customexception(e, sys)
 
 
+@profile_stage("text_vectorization")
 def main():
     try:
         params = load_params("params.yaml")
@@ -77,12 +119,27 @@ def main():
         output_path = vectorizer_params['output_path']
         max_features = vectorizer_params['max_features']
 
-        train_df = load_data(input_train)
-        test_df = load_data(input_test)
-
-        X_train, X_test, vectorizer = vectorize_text(train_df, test_df, max_features)
-
-        save_vectorized_data(X_train, X_test, train_df, test_df, vectorizer, output_path)
+        with step("load_data") as record:
+            train_df = load_data(input_train)
+            test_df = load_data(input_test)
+            record["rows"] = len(train_df) + len(test_df)
+
+        # vectorizer: count (fitted vocabulary) or hashing (stateless, chunked, parallel)
+        with step("vectorize_text") as record:
+            X_train, X_test, vectorizer = vectorize_text(
+                train_df,
+                test_df,
+                max_features,
+                method=vectorizer_params.get('vectorizer', 'count'),
+                n_features=vectorizer_params.get('n_features', 2 ** 18),
+                n_jobs=vectorizer_params.get('n_jobs', 1),
+                chunk_size=vectorizer_params.get('chunk_size', 50000),
+            )
+            record["rows"] = X_train.shape[0] + X_test.shape[0]
+
+        with step("save_vectorized_data") as record:
+            save_vectorized_data(X_train, X_test, train_df, test_df, vectorizer, output_path)
+            record["rows"] = X_train.shape[0] + X_test.shape[0]
 
     except Exception as e:
         logging.info("Exception occurred in main text_vectorization pipeline.")
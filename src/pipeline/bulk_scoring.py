@@ -0,0 +1,143 @@
+"""
+Offline bulk scoring of large tweet archives.
+
+Reads a CSV or JSONL file in chunks, normalizes and scores each chunk in a
+pool of worker processes (each loads the inference bundle once) and streams
+predictions to the output file in input order. At most ``max_in_flight``
+chunks are pending at any time, so memory stays bounded by the chunk size
+rather than the file size.
+
+    python -m src.pipeline.bulk_scoring tweets.csv predictions.csv --text-column content --workers 8
+"""
+import os
+import sys
+import time
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from src.logger.logging import logging
+from src.exception.exception import customexception
+from src.pipeline.prediction_pipeline import load_bundle
+from src.utils.text_normalizer import normalize_texts
+
+# set once per worker process by _init_worker
+_predictor = None
+
+
+def _init_worker(bundle_dir):
+    global _predictor
+    _predictor = load_bundle(bundle_dir)
+
+
+def score_chunk(texts):
+    """Normalize and score one chunk with the worker's predictor; returns (labels, probabilities)."""
+    labels, probabilities = _predictor.predict_cleaned(normalize_texts(texts))
+    return labels, probabilities
+
+
+def file_format(path):
+    return "jsonl" if path.endswith((".jsonl", ".json")) else "csv"
+
+
+def read_chunks(input_path, text_column, chunk_size, id_column=None):
+    """Yield (ids, texts) per chunk; ids default to the input row numbers."""
+    if file_format(input_path) == "jsonl":
+        reader = pd.read_json(input_path, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        usecols = [text_column] if id_column is None else [id_column, text_column]
+        reader = pd.read_csv(input_path, chunksize=chunk_size, usecols=usecols, dtype={text_column: object})
+
+    with reader:
+        for chunk in reader:
+            texts = chunk[text_column].fillna("").map(str).tolist()
+            ids = chunk[id_column] if id_column is not None else pd.Series(chunk.index, name="row")
+            yield ids.reset_index(drop=True), texts
+
+
+def write_chunk(output_path, ids, labels, probabilities, first):
+    frame = pd.DataFrame({
+        ids.name: ids,
+        "label": labels,
+        "sentiment": ["happy" if label == 1 else "sad" for label in labels],
+        "probability": probabilities,
+    })
+    if file_format(output_path) == "jsonl":
+        with open(output_path, "w" if first else "a", encoding="utf-8") as file:
+            frame.to_json(file, orient="records", lines=True)
+    else:
+        frame.to_csv(output_path, mode="w" if first else "a", header=first, index=False)
+
+
+def bulk_score(input_path, output_path, bundle_dir, text_column="content", id_column=None,
+               chunk_size=10000, workers=None, max_in_flight=None, log_every=10):
+    """Score ``input_path`` into ``output_path``; returns rows, seconds and rows/sec."""
+    try:
+        workers = workers or os.cpu_count() or 1
+        max_in_flight = max_in_flight or 2 * workers
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        chunks = read_chunks(input_path, text_column, chunk_size, id_column)
+
+        rows, written = 0, 0
+        start = time.perf_counter()
+
+        def write(ids, labels, probabilities):
+            nonlocal rows, written
+            write_chunk(output_path, ids, labels, probabilities, first=written == 0)
+            rows += len(ids)
+            written += 1
+            if written % log_every == 0:
+                logging.info(f"Scored {rows} rows ({rows / (time.perf_counter() - start):.0f} rows/sec)")
+
+        if workers == 1:
+            _init_worker(bundle_dir)
+            for ids, texts in chunks:
+                write(ids, *score_chunk(texts))
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(bundle_dir,)) as pool:
+                # futures are drained oldest first, which keeps the output in input order
+                pending = deque()
+                for ids, texts in chunks:
+                    pending.append((ids, pool.submit(score_chunk, texts)))
+                    if len(pending) >= max_in_flight:
+                        ids, future = pending.popleft()
+                        write(ids, *future.result())
+                while pending:
+                    ids, future = pending.popleft()
+                    write(ids, *future.result())
+
+        if written == 0:
+            write_chunk(output_path, pd.Series([], name=id_column or "row", dtype=object), [], [], first=True)
+
+        seconds = time.perf_counter() - start
+        summary = {"rows": rows, "seconds": seconds, "rows_per_sec": rows / seconds if seconds else 0.0,
+                   "workers": workers, "chunk_size": chunk_size}
+        logging.info(f"Bulk scoring finished: {summary}")
+        return summary
+    except Exception as e:
+        logging.info("Error during bulk scoring.")
+        raise customexception(e, sys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or JSONL file of texts")
+    parser.add_argument("output", help="CSV or JSONL file for predictions (format from the extension)")
+    parser.add_argument("--bundle-dir", default=os.getenv("MODEL_BUNDLE_DIR", os.path.join("artifacts", "bundle")))
+    parser.add_argument("--text-column", default="content")
+    parser.add_argument("--id-column", help="column copied to the output (default: input row number)")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-in-flight", type=int, help="chunks queued at once (default: 2 x workers)")
+    args = parser.parse_args()
+
+    summary = bulk_score(args.input, args.output, args.bundle_dir, args.text_column, args.id_column,
+                         args.chunk_size, args.workers, args.max_in_flight)
+    print(f"scored {summary['rows']} rows in {summary['seconds']:.2f}s "
+          f"({summary['rows_per_sec']:.0f} rows/sec, {summary['workers']} workers)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Compact scoring artifact that needs nothing but NumPy.
+
+compile_compact_model() flattens a fitted CountVectorizer and binary
+LogisticRegression into one .npz file holding the coefficient vector (float32,
+float16 or int8 with a scale), the intercept, the classes and the vocabulary
+in index order. load_compact_model() reads it back as a CompactPredictor with
+the same interface as Predictor, without joblib, scipy or scikit-learn.
+"""
+import re
+import json
+import numpy as np
+
+COMPACT_FORMAT_VERSION = 1
+QUANTIZATION_MODES = ("float32", "float16", "int8")
+
+
+class CompactFeatures:
+    """Bag-of-words counts as parallel (row, column) arrays, one entry per token occurrence."""
+
+    def __init__(self, rows, columns, n_rows):
+        self.rows = rows
+        self.columns = columns
+        self.n_rows = n_rows
+
+
+class CompactVectorizer:
+    """Reproduces CountVectorizer.transform for word unigrams with the stored token pattern."""
+
+    def __init__(self, vocabulary, token_pattern, lowercase=True, binary=False):
+        self.vocabulary = {token: index for index, token in enumerate(vocabulary)}
+        self.token_pattern = re.compile(token_pattern)
+        self.lowercase = lowercase
+        self.binary = binary
+
+    def transform(self, texts):
+        rows, columns = [], []
+        vocabulary = self.vocabulary
+        for row, text in enumerate(texts):
+            if self.lowercase:
+                text = text.lower()
+            indices = [vocabulary[token] for token in self.token_pattern.findall(text) if token in vocabulary]
+            if self.binary:
+                indices = set(indices)
+            rows.extend([row] * len(indices))
+            columns.extend(indices)
+        return CompactFeatures(np.asarray(rows, dtype=np.intp), np.asarray(columns, dtype=np.intp), len(texts))
+
+
+class CompactPredictor:
+
+    def __init__(self, vectorizer, coefficients, intercept, classes, version, manifest=None):
+        self.vectorizer = vectorizer
+        self.coefficients = coefficients
+        self.intercept = intercept
+        self.classes = classes
+        self.version = str(version)
+        self.manifest = manifest or {}
+
+    def score_features(self, features):
+        """Sum the coefficients of every token occurrence per row; cost is O(tokens)."""
+        weights = self.coefficients[features.columns]
+        scores = np.bincount(features.rows, weights=weights, minlength=features.n_rows) + self.intercept
+        labels = self.classes[(scores > 0).astype(int)]
+        probabilities = 1.0 / (1.0 + np.exp(-scores))
+        return labels, probabilities
+
+    def predict_cleaned(self, cleaned_texts):
+        return self.score_features(self.vectorizer.transform(cleaned_texts))
+
+
+def _check_supported(model, vectorizer):
+    if len(model.classes_) != 2 or model.coef_.shape[0] != 1:
+        raise ValueError("only binary linear models can be compiled")
+    unsupported = {
+        "analyzer": vectorizer.analyzer != "word",
+        "ngram_range": tuple(vectorizer.ngram_range) != (1, 1),
+        "tokenizer": vectorizer.tokenizer is not None,
+        "preprocessor": vectorizer.preprocessor is not None,
+        "stop_words": vectorizer.stop_words is not None,
+        "strip_accents": vectorizer.strip_accents is not None,
+    }
+    options = [name for name, is_unsupported in unsupported.items() if is_unsupported]
+    if options:
+        raise ValueError(f"vectorizer options not supported by the compact format: {options}")
+
+
+def compile_compact_model(model, vectorizer, output_path, quantization="float32"):
+    """Write ``model`` and ``vectorizer`` to ``output_path`` as a compact .npz."""
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"quantization must be one of {QUANTIZATION_MODES}, got {quantization!r}")
+    _check_supported(model, vectorizer)
+
+    coefficients = model.coef_.ravel().astype(np.float64)
+    scale = 1.0
+    if quantization == "int8":
+        scale = float(np.abs(coefficients).max()) / 127 or 1.0
+        stored = np.round(coefficients / scale).astype(np.int8)
+    else:
+        stored = coefficients.astype(quantization)
+
+    config = {
+        "format_version": COMPACT_FORMAT_VERSION,
+        "quantization": quantization,
+        "token_pattern": vectorizer.token_pattern,
+        "lowercase": bool(vectorizer.lowercase),
+        "binary": bool(vectorizer.binary),
+    }
+    with open(output_path, "wb") as file:
+        np.savez_compressed(
+            file,
+            coefficients=stored,
+            scale=np.float64(scale),
+            intercept=np.float64(model.intercept_[0]),
+            classes=np.asarray(model.classes_),
+            vocabulary=np.asarray(vectorizer.get_feature_names_out(), dtype=str),
+            config=np.asarray(json.dumps(config)),
+        )
+    return output_path
+
+
+def load_compact_model(path, version=None, manifest=None):
+    """Load a CompactPredictor from a file written by compile_compact_model()."""
+    with np.load(path, allow_pickle=False) as data:
+        config = json.loads(str(data["config"]))
+        if config["format_version"] != COMPACT_FORMAT_VERSION:
+            raise ValueError(f"unsupported compact format version {config['format_version']}")
+        coefficients = data["coefficients"].astype(np.float64) * float(data["scale"])
+        vectorizer = CompactVectorizer(data["vocabulary"].tolist(), config["token_pattern"],
+                                       config["lowercase"], config["binary"])
+        return CompactPredictor(vectorizer, coefficients, float(data["intercept"]), data["classes"],
+                                version if version is not None else config["quantization"], manifest)
+
+
+def compare_with_sklearn(model, vectorizer, compact):
+    """
+    Score every vocabulary token on its own (which exercises every coefficient)
+    plus an empty text with both models; returns label agreement and the largest
+    probability difference.
+    """
+    probes = list(vectorizer.get_feature_names_out()) + [""]
+    expected_labels = model.predict(vectorizer.transform(probes))
+    expected_probabilities = model.predict_proba(vectorizer.transform(probes))[:, 1]
+    labels, probabilities = compact.predict_cleaned(probes)
+    return {
+        "label_agreement": float(np.mean(labels == expected_labels)),
+        "max_probability_error": float(np.max(np.abs(probabilities - expected_probabilities))),
+    }
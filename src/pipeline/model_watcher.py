@@ -0,0 +1,84 @@
+"""
+Background hot reload of the serving model.
+
+A ModelWatcher polls a model source (a local bundle directory or the MLflow
+registry) for its latest version. When the version changes it loads and
+warms up the new Predictor on its own thread, then hands it to ``on_swap``,
+which rebinds a single reference. Requests already running keep the
+Predictor they started with, so nothing is dropped or blocked by a reload.
+"""
+import threading
+import time
+from src.logger.logging import logging
+
+
+class ModelWatcher:
+
+    def __init__(self, latest_version, load_version, on_swap, current_version=None,
+                 poll_interval=30.0, warmup=None):
+        """
+        ``latest_version()`` returns the newest available version (or None),
+        ``load_version(version)`` loads it as a Predictor, ``warmup(predictor)``
+        exercises it before the swap and ``on_swap(predictor)`` installs it.
+        """
+        self.latest_version = latest_version
+        self.load_version = load_version
+        self.on_swap = on_swap
+        self.warmup = warmup
+        self.current_version = None if current_version is None else str(current_version)
+        self.poll_interval = poll_interval
+
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"checks": 0, "swaps": 0, "failures": 0, "last_check": None, "last_swap": None, "last_error": None}
+
+    def check(self):
+        """Poll once; returns True when a new model was swapped in."""
+        self.stats["checks"] += 1
+        self.stats["last_check"] = time.time()
+
+        version = self.latest_version()
+        if version is None or str(version) == self.current_version:
+            return False
+
+        predictor = self.load_version(version)
+        if self.warmup is not None:
+            self.warmup(predictor)
+
+        previous_version = self.current_version
+        self.on_swap(predictor)
+        self.current_version = predictor.version
+        self.stats["swaps"] += 1
+        self.stats["last_swap"] = time.time()
+        logging.info(f"Model hot-swapped from version {previous_version} to {predictor.version}")
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as e:
+                # keep serving the current model and retry on the next poll
+                self.stats["failures"] += 1
+                self.stats["last_error"] = str(e)
+                logging.info(f"Model reload failed: {e}")
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def info(self):
+        return {
+            "current_version": self.current_version,
+            "poll_interval": self.poll_interval,
+            "running": self._thread is not None and self._thread.is_alive(),
+            **self.stats,
+        }
@@ -0,0 +1,183 @@
+"""
+Loading and scoring for the Flask app.
+
+A Predictor bundles everything needed to turn normalized texts into
+predictions. It can be loaded from a local inference bundle written by
+src/components/model_export.py, which needs no network, or from the MLflow
+model registry on DagsHub, together with the vectorizer model_evaluation
+logged in the same run. With ``compact=True`` a bundle is served by its
+NumPy-only scorer (src/pipeline/compact_scorer.py) instead of the pickles.
+"""
+import os
+import json
+import pickle
+import hashlib
+import numpy as np
+
+from src.utils.text_normalizer import NORMALIZER_VERSION, set_stop_words, load_lemma_table
+from src.pipeline.compact_scorer import load_compact_model
+
+MANIFEST_FILE = "manifest.json"
+LATEST_FILE = "LATEST"
+COMPACT_FILE = "scorer.npz"
+# run artifact holding the vectorizer a registered model was trained with
+VECTORIZER_ARTIFACT = "vectorizer/vectorizer.pkl"
+
+
+class Predictor:
+    """Vectorizer plus LogisticRegression weights for one model version."""
+
+    def __init__(self, model, vectorizer, version, manifest=None):
+        self.model = model
+        self.vectorizer = vectorizer
+        self.version = str(version)
+        self.manifest = manifest or {}
+
+        # score with the coefficients directly so the sparse bag-of-words
+        # matrix never gets densified or wrapped in a DataFrame
+        self.coefficients = model.coef_.ravel()
+        self.intercept = float(model.intercept_[0])
+        self.classes = model.classes_
+
+    def score_features(self, features):
+        """Score a CSR feature matrix; cost is O(nnz), independent of vocabulary size."""
+        scores = features @ self.coefficients + self.intercept
+        labels = self.classes[(scores > 0).astype(int)]
+        probabilities = 1.0 / (1.0 + np.exp(-scores))
+        return labels, probabilities
+
+    def predict_cleaned(self, cleaned_texts):
+        """Vectorize and score already normalized texts with one call each."""
+        return self.score_features(self.vectorizer.transform(cleaned_texts))
+
+
+def latest_bundle_version(bundle_dir):
+    """Version named by the bundle root's LATEST pointer, or None without one."""
+    latest_path = os.path.join(bundle_dir, LATEST_FILE)
+    if not os.path.exists(latest_path):
+        return None
+    with open(latest_path) as file:
+        return file.read().strip()
+
+
+def resolve_bundle_dir(bundle_dir):
+    """A bundle root with a LATEST pointer resolves to the version it names."""
+    version = latest_bundle_version(bundle_dir)
+    return bundle_dir if version is None else os.path.join(bundle_dir, version)
+
+
+def _sha256(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def load_bundle(bundle_dir, compact=False):
+    """Load a Predictor (or a CompactPredictor) from a local inference bundle using only local file reads."""
+    version_dir = resolve_bundle_dir(bundle_dir)
+    with open(os.path.join(version_dir, MANIFEST_FILE)) as file:
+        manifest = json.load(file)
+
+    for name, checksum in manifest["files"].items():
+        if _sha256(os.path.join(version_dir, name)) != checksum:
+            raise ValueError(f"Checksum mismatch for {name} in bundle {version_dir}")
+
+    if manifest["normalizer_version"] != NORMALIZER_VERSION:
+        raise ValueError(
+            f"Bundle {manifest['version']} was built with normalizer version "
+            f"{manifest['normalizer_version']}, serving code has {NORMALIZER_VERSION}"
+        )
+
+    # the normalizer resources are process-wide; a matching NORMALIZER_VERSION guarantees
+    # they produce the same output as the ones they replace, so hot reloads cannot skew
+    with open(os.path.join(version_dir, "stop_words.json"), encoding='utf-8') as file:
+        set_stop_words(json.load(file))
+    lemma_table_path = os.path.join(version_dir, "lemma_table.json")
+    if os.path.exists(lemma_table_path):
+        load_lemma_table(lemma_table_path)
+
+    if compact:
+        if COMPACT_FILE not in manifest["files"]:
+            raise ValueError(f"Bundle {manifest['version']} has no compact scorer")
+        return load_compact_model(os.path.join(version_dir, COMPACT_FILE), manifest["version"], manifest)
+
+    # both files are written by joblib in model_trainer / text_vectorization
+    import joblib
+    model = joblib.load(os.path.join(version_dir, "model.pkl"))
+    vectorizer = joblib.load(os.path.join(version_dir, "vectorizer.pkl"))
+
+    return Predictor(model, vectorizer, manifest["version"], manifest)
+
+
+def configure_dagshub_tracking():
+    """Point MLflow at the DagsHub tracking server using DAGSHUB_PAT."""
+    import mlflow
+
+    dagshub_token = os.getenv("DAGSHUB_PAT")
+    if not dagshub_token:
+        raise EnvironmentError("DAGSHUB_PAT environment variable is not set")
+
+    os.environ["MLFLOW_TRACKING_USERNAME"] = dagshub_token
+    os.environ["MLFLOW_TRACKING_PASSWORD"] = dagshub_token
+
+    dagshub_url = "https://dagshub.com"
+    repo_owner = "iamprashantjain"
+    repo_name = "Emotion-Detection-MLOps"
+
+    mlflow.set_tracking_uri(f'{dagshub_url}/{repo_owner}/{repo_name}.mlflow')
+
+
+def get_latest_model_version(model_name):
+    import mlflow
+
+    client = mlflow.MlflowClient()
+    latest_version = client.get_latest_versions(model_name, stages=["Production"])
+    if not latest_version:
+        latest_version = client.get_latest_versions(model_name, stages=["None"])
+    return latest_version[0].version if latest_version else None
+
+
+def load_run_vectorizer(model_name, model_version):
+    """Vectorizer logged in the run of a registered model version, or None for runs logged without one."""
+    import tempfile
+    import joblib
+    import mlflow
+
+    run_id = mlflow.MlflowClient().get_model_version(model_name, str(model_version)).run_id
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            path = mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path=VECTORIZER_ARTIFACT,
+                                                       dst_path=tmp_dir)
+        except (mlflow.exceptions.MlflowException, OSError):
+            return None
+        return joblib.load(path)
+
+
+def registry_predictor(model_name, model_version, vectorizer_path=None):
+    """
+    Predictor for a registered model version and the vectorizer of its run.
+
+    ``vectorizer_path`` is only a fallback for versions logged before the
+    vectorizer was; without it such a version is rejected rather than paired
+    with a vectorizer it may not have been trained with.
+    """
+    import mlflow
+
+    model = mlflow.pyfunc.load_model(f'models:/{model_name}/{model_version}')
+    vectorizer = load_run_vectorizer(model_name, model_version)
+    if vectorizer is None:
+        if vectorizer_path is None:
+            raise ValueError(f"Model {model_name} version {model_version} has no {VECTORIZER_ARTIFACT} "
+                             "run artifact to score with")
+        with open(vectorizer_path, 'rb') as file:
+            vectorizer = pickle.load(file)
+
+    # the fitted LogisticRegression behind the pyfunc wrapper
+    return Predictor(model.get_raw_model(), vectorizer, model_version)
+
+
+def load_registry_model(model_name, vectorizer_path=None, model_version=None):
+    """Load a registered model (latest Production by default) and the vectorizer logged with it."""
+    configure_dagshub_tracking()
+    if model_version is None:
+        model_version = get_latest_model_version(model_name)
+    return registry_predictor(model_name, model_version, vectorizer_path)
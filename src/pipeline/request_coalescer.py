@@ -0,0 +1,127 @@
+"""
+Micro-batching for single-text requests.
+
+Callers put texts on a bounded queue and wait on a Future. A scheduler
+thread takes the first waiting text, keeps collecting until it has
+``max_batch_size`` texts or ``max_wait_us`` microseconds have passed, scores
+the whole batch with one vectorized call and hands every caller its own
+result. Larger batches and longer waits trade p99 latency for throughput.
+A caller never waits longer than ``max_wait_us`` plus ``score_timeout_s``
+by default: if the scheduler stalls or dies, predict() cancels the request
+and raises CoalescerTimeoutError so the caller can score it some other way.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+
+class QueueFullError(RuntimeError):
+    """Raised by submit() when the coalescer queue is at capacity."""
+
+
+class CoalescerTimeoutError(TimeoutError):
+    """Raised by predict() when the request was not scored in time."""
+
+
+class RequestCoalescer:
+
+    def __init__(self, score_batch, max_batch_size=64, max_wait_us=2000, max_queue_size=10000, autostart=True,
+                 score_timeout_s=5.0):
+        """
+        ``score_batch`` takes a list of texts and returns (labels, probabilities)
+        in the same order, e.g. the app's predict_texts(). With ``autostart=False``
+        the scheduler thread waits for start(), e.g. until after a fork.
+        ``score_timeout_s`` bounds how long scoring one batch may take before
+        predict() gives up on it.
+        """
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_us / 1_000_000
+        self.timeout = self.max_wait + score_timeout_s
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "batches": 0, "rejected": 0, "queue_wait_total_s": 0.0, "queue_wait_max_s": 0.0,
+                      "timeouts": 0}
+
+        self._thread = None
+        if autostart:
+            self.start()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="request-coalescer", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, text):
+        """Queue ``text`` for scoring; the Future resolves to (label, probability)."""
+        future = Future()
+        try:
+            self._queue.put_nowait((text, future, time.perf_counter()))
+        except queue.Full:
+            with self._stats_lock:
+                self.stats["rejected"] += 1
+            raise QueueFullError(f"coalescer queue is full ({self._queue.maxsize} pending requests)")
+        return future
+
+    def predict(self, text, timeout=None):
+        """Score ``text`` in the next batch; gives up after ``timeout`` (default max wait + score timeout)."""
+        future = self.submit(text)
+        try:
+            return future.result(self.timeout if timeout is None else timeout)
+        except FutureTimeoutError:
+            # a request still queued is dropped; one already being scored just has nobody waiting
+            future.cancel()
+            with self._stats_lock:
+                self.stats["timeouts"] += 1
+            raise CoalescerTimeoutError(f"request not scored within {self.timeout:.3f}s") from None
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # skip requests whose caller already timed out
+            batch = [item for item in self._collect() if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            dispatched_at = time.perf_counter()
+            waits = [dispatched_at - enqueued_at for _, _, enqueued_at in batch]
+
+            try:
+                labels, probabilities = self.score_batch([text for text, _, _ in batch])
+            except Exception as error:
+                for _, future, _ in batch:
+                    future.set_exception(error)
+            else:
+                for (_, future, _), label, probability in zip(batch, labels, probabilities):
+                    future.set_result((label, probability))
+
+            with self._stats_lock:
+                self.stats["requests"] += len(batch)
+                self.stats["batches"] += 1
+                self.stats["queue_wait_total_s"] += sum(waits)
+                self.stats["queue_wait_max_s"] = max(self.stats["queue_wait_max_s"], max(waits))
+
+    def info(self):
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_us": self.max_wait * 1_000_000,
+            "queue_size": self._queue.qsize(),
+            "queue_maxsize": self._queue.maxsize,
+            "running": self._thread is not None and self._thread.is_alive(),
+            **stats,
+            "mean_batch_size": stats["requests"] / stats["batches"] if stats["batches"] else 0.0,
+            "mean_queue_wait_s": stats["queue_wait_total_s"] / stats["requests"] if stats["requests"] else 0.0,
+        }
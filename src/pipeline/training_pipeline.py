@@ -0,0 +1,259 @@
+"""
+In-memory runner for the training pipeline.
+
+Runs data_ingestion -> data_preprocessing -> text_vectorization ->
+model_trainer -> model_evaluation -> model_export in one process, with the
+same component functions and params.yaml as the DVC stages. DataFrames and
+sparse matrices are handed from step to step instead of being written as CSV
+by one stage and parsed back by the next.
+
+The train and test branches run concurrently where they are independent:
+both are normalized in one pass over a shared worker pool (and the
+normalization cache), the test texts are vectorized in a thread while the
+model fits (liblinear releases the GIL), and the outputs of both branches are
+written in parallel at the end. Every out and metrics file that dvc.yaml
+declares for data_ingestion, data_preprocessing, text_vectorization,
+model_trainer, model_evaluation and model_export is written to the same
+path, including a reports/perf/<stage>.json per stage built from the
+runner's steps, so ``dvc commit`` can record those stages afterwards.
+
+    python -m src.pipeline.training_pipeline
+    python -m src.pipeline.training_pipeline --mlflow   # also log the run to DagsHub like model_evaluation
+
+Without --mlflow nothing is sent to the tracking server and
+reports/experiment_info.json records an untracked run (run_id null), which
+model_register refuses to register. Model registration and the
+hyperparameter sweep stay separate steps.
+"""
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import pandas as pd
+import yaml
+from sklearn.model_selection import train_test_split
+
+from src.logger.logging import logging
+from src.exception.exception import customexception
+from src.utils.profiling import PERF_DIR, StageProfiler
+from src.utils.feature_store import save_features
+from src.utils.normalization_cache import NormalizationCache
+from src.utils.text_normalizer import (
+    build_lemma_table,
+    configure_lemma_cache,
+    ensure_nltk_data,
+    normalizer_fingerprint,
+    save_lemma_table,
+    set_lemma_table,
+)
+from src.components.data_ingestion import fetch_source, read_source, save_data
+from src.components.data_preprocessing import normalize_text
+from src.components.text_vectorization import fit_vectorizer, transform_texts
+from src.components.model_trainer import save_model, train_model, train_model_streaming
+from src.components.model_evaluation import evaluate_model, save_metrics, save_model_info
+from src.components.model_export import export_bundle
+
+# runner steps that stand in for each DVC stage; text_vectorization and model_trainer share one
+STAGE_STEPS = {
+    "data_ingestion": ("data_ingestion",),
+    "data_preprocessing": ("data_preprocessing",),
+    "text_vectorization": ("vectorize_and_train",),
+    "model_trainer": ("vectorize_and_train",),
+    "model_evaluation": ("model_evaluation", "mlflow_logging"),
+    "model_export": ("model_export",),
+}
+
+
+def load_params(params_path: str) -> dict:
+    try:
+        with open(params_path, 'r') as file:
+            params = yaml.safe_load(file)
+        logging.info("Parameters loaded from %s", params_path)
+        return params
+    except Exception as e:
+        logging.info("Error loading params.yaml")
+        raise customexception(e, sys)
+
+
+def ingest(params):
+    ingestion_params = params['data_ingestion']
+    source_path = fetch_source(ingestion_params['source_url'],
+                               ingestion_params.get('cache_dir', os.path.join('.cache', 'data_ingestion')))
+    df = read_source(source_path, ingestion_params.get('chunk_size', 100000))
+    return train_test_split(df, test_size=ingestion_params['test_size'],
+                            random_state=ingestion_params['random_state'], stratify=df['sentiment'])
+
+
+def preprocess(train_data, test_data, params):
+    """Normalize both branches in one normalize_text() call; returns (train, test, lemma table)."""
+    preprocessing_params = params['data_preprocessing']
+    ensure_nltk_data()
+    configure_lemma_cache(preprocessing_params['lemma_cache_size'])
+
+    # written empty when disabled, like the data_preprocessing stage, because dvc.yaml declares it
+    lemma_table = {}
+    if preprocessing_params['build_lemma_table']:
+        lemma_table = build_lemma_table(train_data['content'].map(str))
+        set_lemma_table(lemma_table)
+
+    cache = None
+    if preprocessing_params.get('normalization_cache'):
+        cache = NormalizationCache(preprocessing_params['normalization_cache'], normalizer_fingerprint())
+
+    # normalization and the small-sentence filter work row by row, so one pass
+    # over both branches gives the same rows as two separate calls
+    combined = pd.concat([train_data, test_data], keys=["train", "test"])
+    processed = normalize_text(combined, preprocessing_params.get('n_jobs', 1),
+                               preprocessing_params.get('chunk_size', 10000), cache)
+
+    if cache is not None:
+        logging.info("Normalization cache stats: %s", cache.info())
+        cache.compact(preprocessing_params.get('normalization_cache_max_age_days'))
+        cache.close()
+
+    return processed.loc["train"], processed.loc["test"], lemma_table
+
+
+def write_stage_reports(profiler, output_dir=PERF_DIR):
+    """Write reports/perf/<stage>.json for every DVC stage the runner covered, plus the runner's own report."""
+    os.makedirs(output_dir, exist_ok=True)
+    for stage, step_names in STAGE_STEPS.items():
+        steps = {name: profiler.steps[name] for name in step_names if name in profiler.steps}
+        if not steps:
+            continue
+        peaks = [record["peak_rss_mb"] for record in steps.values() if record.get("peak_rss_mb") is not None]
+        report = {
+            "runner": profiler.stage,
+            "wall_s": sum(record["wall_s"] for record in steps.values()),
+            "cpu_s": sum(record["cpu_s"] for record in steps.values()),
+            "peak_rss_mb": max(peaks) if peaks else None,
+            "steps": steps,
+        }
+        with open(os.path.join(output_dir, f"{stage}.json"), "w") as file:
+            json.dump(report, file, indent=4)
+    return profiler.write(output_dir)
+
+
+def run(params, track=False, export=True):
+    """Run the pipeline in memory and write its DVC outputs; returns the evaluation metrics."""
+    try:
+        profiler = StageProfiler("training_pipeline")
+        vectorizer_params = params['text_vectorization']
+        trainer_params = params['model_trainer']
+        eval_params = params['model_evaluation']
+        vectorized_path = vectorizer_params['output_path']
+        n_jobs = vectorizer_params.get('n_jobs', 1)
+        chunk_size = vectorizer_params.get('chunk_size', 50000)
+
+        with profiler.step("data_ingestion") as record:
+            train_data, test_data = ingest(params)
+            record["rows"] = len(train_data) + len(test_data)
+
+        with profiler.step("data_preprocessing") as record:
+            train_processed, test_processed, lemma_table = preprocess(train_data, test_data, params)
+            record["rows"] = len(train_processed) + len(test_processed)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            with profiler.step("vectorize_and_train") as record:
+                X_train, vectorizer = fit_vectorizer(
+                    train_processed, vectorizer_params['max_features'],
+                    method=vectorizer_params.get('vectorizer', 'count'),
+                    n_features=vectorizer_params.get('n_features', 2 ** 18),
+                    n_jobs=n_jobs, chunk_size=chunk_size,
+                )
+                y_train = train_processed['sentiment'].values
+                X_test_future = pool.submit(transform_texts, vectorizer, test_processed, n_jobs, chunk_size)
+
+                if trainer_params.get('mode', 'batch') == 'streaming':
+                    # streaming reads its chunks from the feature store, so the train features go first
+                    save_features(os.path.join(vectorized_path, "train_features"), X_train, y_train)
+                    streaming = trainer_params['streaming']
+                    model = train_model_streaming(
+                        os.path.join(vectorized_path, "train_features"), streaming['sgd_params'],
+                        chunk_size=streaming.get('chunk_size', 50000),
+                        epochs=streaming.get('epochs', 5),
+                        random_state=streaming.get('random_state', 42),
+                        checkpoint_path=streaming.get('checkpoint_path'),
+                        checkpoint_every=streaming.get('checkpoint_every', 10),
+                    )
+                else:
+                    model = train_model(X_train, y_train, trainer_params['model_params'])
+                X_test = X_test_future.result()
+                record["rows"] = X_train.shape[0] + X_test.shape[0]
+
+            with profiler.step("model_evaluation") as record:
+                acc, report = evaluate_model(model, X_test, test_processed['sentiment'].values)
+                record["rows"] = X_test.shape[0]
+
+            with profiler.step("save_outputs"):
+                preprocessing_params = params['data_preprocessing']
+                processed_path = preprocessing_params['output_path']
+                os.makedirs(processed_path, exist_ok=True)
+                os.makedirs(vectorized_path, exist_ok=True)
+                writes = [
+                    pool.submit(save_data, train_data, test_data, params['data_ingestion']['data_path']),
+                    pool.submit(train_processed.to_csv, os.path.join(processed_path, "train_processed.csv"), index=False),
+                    pool.submit(test_processed.to_csv, os.path.join(processed_path, "test_processed.csv"), index=False),
+                    pool.submit(save_features, os.path.join(vectorized_path, "test_features"), X_test,
+                                test_processed['sentiment'].values),
+                    pool.submit(joblib.dump, vectorizer, os.path.join(vectorized_path, "vectorizer.pkl")),
+                    pool.submit(save_model, model, trainer_params['output_model_path']),
+                    pool.submit(save_metrics, acc, report, eval_params['metrics_path']),
+                    pool.submit(save_lemma_table, lemma_table, preprocessing_params['lemma_table_path']),
+                ]
+                if trainer_params.get('mode', 'batch') != 'streaming':
+                    writes.append(pool.submit(save_features, os.path.join(vectorized_path, "train_features"),
+                                              X_train, y_train))
+                for write in writes:
+                    write.result()
+
+        if track:
+            from src.components.model_evaluation import log_to_mlflow, tracked_params
+            from src.pipeline.prediction_pipeline import configure_dagshub_tracking
+            import mlflow
+
+            with profiler.step("mlflow_logging"):
+                configure_dagshub_tracking()
+                mlflow.set_experiment(eval_params['experiment_name'])
+                log_to_mlflow(model, acc, report, tracked_params(trainer_params), eval_params['run_name'],
+                              eval_params['experiment_info_path'], os.path.join(vectorized_path, "vectorizer.pkl"))
+        else:
+            # replaces the previous run's info, which would otherwise be registered next to this model
+            save_model_info(None, "model", eval_params['experiment_info_path'])
+
+        if export:
+            export_params = params['model_export']
+            with profiler.step("model_export"):
+                export_bundle(
+                    model_path=export_params['model_path'],
+                    vectorizer_path=export_params['vectorizer_path'],
+                    lemma_table_path=export_params['lemma_table_path'],
+                    bundle_dir=export_params['bundle_dir'],
+                    model_name=params['model_registration']['model_name'],
+                    compact_quantization=export_params.get('compact_quantization', 'float32'),
+                )
+
+        write_stage_reports(profiler)
+        logging.info("In-memory training pipeline finished: %s", profiler.report())
+        return {"accuracy": float(acc), "report": report}
+    except Exception as e:
+        logging.info("Exception in the in-memory training pipeline.")
+        raise customexception(e, sys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--params", default="params.yaml")
+    parser.add_argument("--mlflow", action="store_true", help="log the evaluation run to DagsHub/MLflow")
+    parser.add_argument("--no-export", action="store_true", help="skip writing the inference bundle")
+    args = parser.parse_args()
+
+    metrics = run(load_params(args.params), track=args.mlflow, export=not args.no_export)
+    print(f"accuracy {metrics['accuracy']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
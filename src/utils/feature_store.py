@@ -0,0 +1,71 @@
+"""
+Sparse on-disk feature format for the vectorized datasets.
+
+A feature set is a directory holding the three CSR arrays of the document-term
+matrix (data.npy, indices.npy, indptr.npy), the labels (labels.npy) and
+meta.json with the shape. Only non-zero counts are stored, so size grows with
+the number of tokens rather than rows x max_features, and every array can be
+memory-mapped instead of parsed. iter_feature_chunks() reads a feature set a
+slice of rows at a time for out-of-core training.
+"""
+import os
+import json
+import numpy as np
+from scipy import sparse
+
+ARRAYS = ("data", "indices", "indptr", "labels")
+META_FILE = "meta.json"
+
+
+def save_features(directory, features, labels):
+    """Write a sparse feature matrix and its labels to ``directory``."""
+    features = sparse.csr_matrix(features)
+    features.sort_indices()
+    os.makedirs(directory, exist_ok=True)
+
+    arrays = {"data": features.data, "indices": features.indices, "indptr": features.indptr,
+              "labels": np.asarray(labels)}
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, f"{name}.npy"), array, allow_pickle=False)
+
+    with open(os.path.join(directory, META_FILE), "w") as file:
+        json.dump({"shape": list(features.shape), "nnz": int(features.nnz), "dtype": str(features.dtype)}, file)
+
+
+def load_features(directory, mmap=True):
+    """
+    Return (CSR matrix, labels) saved by save_features(). With ``mmap`` the arrays
+    are memory-mapped read-only, so only the pages a consumer touches are read.
+    """
+    meta = read_meta(directory)
+    mmap_mode = "r" if mmap else None
+    arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+              for name in ARRAYS}
+    features = sparse.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=tuple(meta["shape"]))
+    return features, arrays["labels"]
+
+
+def read_meta(directory):
+    """Shape, nnz and dtype of the feature set in ``directory``."""
+    with open(os.path.join(directory, META_FILE)) as file:
+        return json.load(file)
+
+
+def iter_feature_chunks(directory, chunk_size, order=None):
+    """
+    Yield (CSR matrix, labels) for consecutive slices of ``chunk_size`` rows, in
+    ``order`` (a sequence of chunk numbers) if given. Only the current slice is
+    copied out of the memory-mapped arrays, so memory is bounded by the chunk size.
+    """
+    features, labels = load_features(directory, mmap=True)
+    n_rows = features.shape[0]
+    n_chunks = -(-n_rows // chunk_size)
+    for chunk in (range(n_chunks) if order is None else order):
+        start, stop = chunk * chunk_size, min((chunk + 1) * chunk_size, n_rows)
+        first, last = features.indptr[start], features.indptr[stop]
+        matrix = sparse.csr_matrix(
+            (np.array(features.data[first:last]), np.array(features.indices[first:last]),
+             np.array(features.indptr[start:stop + 1]) - first),
+            shape=(stop - start, features.shape[1]),
+        )
+        yield matrix, np.array(labels[start:stop])
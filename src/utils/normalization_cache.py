@@ -0,0 +1,110 @@
+"""
+Persistent cache of normalized text for the data_preprocessing stage.
+
+Entries are keyed by a hash of the raw text and tagged with a normalizer
+version, so a rerun only normalizes texts it has never seen and a change to
+the normalizer (or its stop words) invalidates everything at once. The cache
+is one SQLite file; compact() drops entries of other versions and entries
+not used for a given age, then reclaims the space. The last use of every hit
+is recorded in the same transaction that stores the new entries of a run.
+"""
+import os
+import time
+import sqlite3
+import hashlib
+
+# keys per UPDATE ... IN (...) statement, below SQLite's bound-parameter limit
+_SQLITE_BATCH = 500
+
+def content_key(text):
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+class NormalizationCache:
+
+    def __init__(self, db_path, version):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db_path = db_path
+        self.version = str(version)
+        self._db = sqlite3.connect(db_path, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS normalized ("
+            "key BLOB, version TEXT, text TEXT, created_at REAL, last_used REAL, PRIMARY KEY (key, version))"
+        )
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(normalized)")]
+        if "last_used" not in columns:
+            # caches written before last_used existed start from their creation time
+            self._db.execute("ALTER TABLE normalized ADD COLUMN last_used REAL")
+            self._db.execute("UPDATE normalized SET last_used = created_at")
+        self.stats = {"hits": 0, "misses": 0}
+
+    def normalize(self, texts, normalize_texts):
+        """
+        Normalized form of each of ``texts`` (distinct strings), calling
+        ``normalize_texts(list)`` only for the ones missing from the cache.
+        """
+        texts = list(texts)
+        keys = [content_key(text) for text in texts]
+        found = self._lookup(keys)
+        hit_keys = list(found)
+
+        missing = [index for index, key in enumerate(keys) if key not in found]
+        new_entries = {}
+        if missing:
+            normalized = normalize_texts([texts[index] for index in missing])
+            new_entries = {keys[index]: text for index, text in zip(missing, normalized)}
+            found.update(new_entries)
+        self._store(new_entries, hit_keys)
+
+        self.stats["hits"] += len(texts) - len(missing)
+        self.stats["misses"] += len(missing)
+        return [found[key] for key in keys]
+
+    def _lookup(self, keys):
+        # a stage run asks for most of the cache, so one sequential scan beats per-key index probes
+        wanted = set(keys)
+        rows = self._db.execute("SELECT key, text FROM normalized WHERE version = ?", (self.version,))
+        return {key: text for key, text in rows if key in wanted}
+
+    def _store(self, entries, hit_keys):
+        """Insert new entries and mark ``hit_keys`` as used, in one transaction."""
+        if not entries and not hit_keys:
+            return
+        now = time.time()
+        self._db.execute("BEGIN")
+        for start in range(0, len(hit_keys), _SQLITE_BATCH):
+            batch = hit_keys[start:start + _SQLITE_BATCH]
+            self._db.execute(
+                "UPDATE normalized SET last_used = ? WHERE version = ? AND key IN (%s)" % ",".join("?" * len(batch)),
+                [now, self.version, *batch],
+            )
+        self._db.executemany(
+            "INSERT OR REPLACE INTO normalized (key, version, text, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+            [(key, self.version, text, now, now) for key, text in entries.items()],
+        )
+        self._db.execute("COMMIT")
+
+    def compact(self, max_age_days=None):
+        """Drop other versions and, with ``max_age_days``, entries unused for that long; returns rows removed."""
+        removed = self._db.execute("DELETE FROM normalized WHERE version != ?", (self.version,)).rowcount
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            removed += self._db.execute("DELETE FROM normalized WHERE last_used < ?", (cutoff,)).rowcount
+        self._db.execute("VACUUM")
+        return removed
+
+    def info(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        size = self._db.execute("SELECT COUNT(*) FROM normalized WHERE version = ?", (self.version,)).fetchone()[0]
+        return {
+            "version": self.version,
+            "size": size,
+            **self.stats,
+            "hit_ratio": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        self._db.close()
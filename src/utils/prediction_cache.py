@@ -0,0 +1,182 @@
+"""
+Prediction cache keyed by (model version, normalized text).
+
+The first tier is an in-process LRU with a TTL. The optional second tier is
+a SQLite file that every gunicorn worker on the host opens, so a text scored
+by one worker is a hit for all of them. Entries of both tiers are keyed by
+model version, so requests still running on a previous model (a long
+/predict_stream, calls in flight during a hot swap) never see or wipe the
+entries of the live one. Old versions are purged only by set_live_version(),
+when the serving model actually changes, and are not stored afterwards.
+Every ``purge_every`` writes a worker deletes the expired shared rows and,
+past ``db_max_rows``, the rows closest to expiry, so the file stays bounded
+however long a model version is served.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# SQLite's default limit on host parameters is 999
+_SQLITE_BATCH = 500
+
+
+class PredictionCache:
+
+    def __init__(self, maxsize=10000, ttl=3600, db_path=None, db_max_rows=1000000, purge_every=1000):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.db_max_rows = db_max_rows
+        self.purge_every = purge_every
+        self._writes = 0
+        self.model_version = None
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.db_path = db_path or None
+        self._connection = None
+        self._connection_pid = None
+        self.stats = {"hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0, "expired": 0,
+                      "shared_purged": 0}
+
+    @property
+    def _db(self):
+        """This process's SQLite connection; one opened before a fork (gunicorn --preload) is never reused."""
+        if self.db_path is None:
+            return None
+        if self._connection_pid != os.getpid():
+            connection = sqlite3.connect(self.db_path, timeout=5, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "model_version TEXT, text TEXT, label INTEGER, probability REAL, expires_at REAL, "
+                "PRIMARY KEY (model_version, text))"
+            )
+            self._connection, self._connection_pid = connection, os.getpid()
+        return self._connection
+
+    def set_live_version(self, model_version):
+        """Make ``model_version`` the serving one and purge the entries of every other version."""
+        with self._lock:
+            if model_version == self.model_version:
+                return
+            for key in [key for key in self._memory if key[0] != model_version]:
+                del self._memory[key]
+            if self.db_path is not None:
+                self._db.execute("DELETE FROM predictions WHERE model_version != ?", (str(model_version),))
+            self.model_version = model_version
+
+    def get_many(self, model_version, texts):
+        """Return {text: (label, probability)} for the cached subset of ``texts``."""
+        now = time.monotonic()
+        found = {}
+        missing = []
+        with self._lock:
+            for text in dict.fromkeys(texts):
+                key = (model_version, text)
+                entry = self._memory.get(key)
+                if entry is not None and entry[0] < now:
+                    del self._memory[key]
+                    self.stats["expired"] += 1
+                    entry = None
+                if entry is None:
+                    missing.append(text)
+                    continue
+                self._memory.move_to_end(key)
+                found[text] = entry[1:]
+            self.stats["hits"] += len(found)
+
+            if missing and self.db_path is not None:
+                shared = self._get_shared(model_version, missing)
+                self.stats["shared_hits"] += len(shared)
+                # keep the expiry stored by the worker that scored the text instead of restarting the TTL
+                offset = now - time.time()
+                self._put_memory(model_version, ((text, expires_at + offset, label, probability)
+                                                 for text, (expires_at, label, probability) in shared.items()))
+                found.update((text, entry[1:]) for text, entry in shared.items())
+                missing = [text for text in missing if text not in shared]
+
+            self.stats["misses"] += len(missing)
+        return found
+
+    def _get_shared(self, model_version, texts):
+        wall_now = time.time()
+        shared = {}
+        for start in range(0, len(texts), _SQLITE_BATCH):
+            batch = texts[start:start + _SQLITE_BATCH]
+            rows = self._db.execute(
+                "SELECT text, expires_at, label, probability FROM predictions "
+                "WHERE model_version = ? AND expires_at >= ? AND text IN (%s)" % ",".join("?" * len(batch)),
+                [str(model_version), wall_now, *batch],
+            )
+            for text, expires_at, label, probability in rows:
+                shared[text] = (expires_at, label, probability)
+        return shared
+
+    def _put_memory(self, model_version, entries):
+        """Insert (text, monotonic expiry, label, probability) entries and evict past maxsize."""
+        for text, expires_at, label, probability in entries:
+            key = (model_version, text)
+            self._memory[key] = (expires_at, label, probability)
+            self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def set_many(self, model_version, predictions):
+        """Store {text: (label, probability)} for ``model_version``."""
+        with self._lock:
+            if self.model_version is None:
+                self.model_version = model_version
+            elif model_version != self.model_version:
+                # a request still running on a replaced model; its results would only be purged again
+                return
+            expires_at = time.monotonic() + self.ttl
+            self._put_memory(model_version, ((text, expires_at, label, probability)
+                                             for text, (label, probability) in predictions.items()))
+            if self.db_path is not None:
+                expires_at = time.time() + self.ttl
+                db = self._db
+                try:
+                    db.execute("BEGIN")
+                    db.executemany(
+                        "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                        [(str(model_version), text, label, probability, expires_at)
+                         for text, (label, probability) in predictions.items()],
+                    )
+                    db.execute("COMMIT")
+                except Exception:
+                    # never leave the shared connection inside an open transaction
+                    if db.in_transaction:
+                        db.execute("ROLLBACK")
+                    raise
+                self._writes += 1
+                if self._writes % self.purge_every == 0:
+                    self._purge_shared()
+
+    def _purge_shared(self):
+        """Delete expired rows, then the rows closest to expiry beyond db_max_rows; caller holds the lock."""
+        db = self._db
+        removed = db.execute("DELETE FROM predictions WHERE expires_at < ?", (time.time(),)).rowcount
+        excess = db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] - self.db_max_rows
+        if excess > 0:
+            removed += db.execute(
+                "DELETE FROM predictions WHERE rowid IN "
+                "(SELECT rowid FROM predictions ORDER BY expires_at LIMIT ?)", (excess,)
+            ).rowcount
+        self.stats["shared_purged"] += removed
+
+    def info(self):
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["shared_hits"] + self.stats["misses"]
+            return {
+                "model_version": self.model_version,
+                "size": len(self._memory),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "shared": self.db_path is not None,
+                "db_max_rows": self.db_max_rows,
+                **self.stats,
+                "hit_rate": (self.stats["hits"] + self.stats["shared_hits"]) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,130 @@
+"""
+Per-stage performance reports for the DVC pipeline components.
+
+A component's main() is decorated with ``@profile_stage("<stage>")`` and wraps
+its sub-steps in ``with step("<name>") as record:``. Every step records wall
+time, CPU time (including worker processes it waited for), peak RSS and, when
+the caller sets ``record["rows"]``, the rows it processed. When main() returns
+the report is written to reports/perf/<stage>.json, which dvc.yaml declares as
+a metrics file so ``dvc metrics diff`` shows performance next to accuracy.
+Outside a profiled stage step() is a no-op.
+"""
+import os
+import json
+import time
+from contextlib import contextmanager
+from src.logger.logging import logging
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PERF_DIR = os.path.join("reports", "perf")
+
+_active = []
+
+
+def _cpu_seconds():
+    if resource is None:
+        return time.process_time()
+    own, children = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _proc_status_mb(field):
+    try:
+        with open("/proc/self/status") as file:
+            for line in file:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def current_rss_mb():
+    """Resident set size now (Linux), else None."""
+    return _proc_status_mb("VmRSS")
+
+
+def peak_rss_mb():
+    """Peak resident set size since start or the last reset_peak_rss()."""
+    peak = _proc_status_mb("VmHWM")
+    if peak is None and resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return peak
+
+
+def reset_peak_rss():
+    """Restart the peak RSS measurement; Linux only, elsewhere the process peak keeps growing."""
+    try:
+        with open("/proc/self/clear_refs", "w") as file:
+            file.write("5")
+    except OSError:
+        pass
+
+
+class StageProfiler:
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.steps = {}
+        self.peak_rss_mb = peak_rss_mb()
+        self._start = time.perf_counter()
+        self._start_cpu = _cpu_seconds()
+
+    def _note_peak(self, peak):
+        if peak is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb or 0.0, peak)
+
+    @contextmanager
+    def step(self, name):
+        self._note_peak(peak_rss_mb())
+        reset_peak_rss()
+        record = {}
+        start, start_cpu = time.perf_counter(), _cpu_seconds()
+        yield record
+        peak = peak_rss_mb()
+        self._note_peak(peak)
+        self.steps[name] = {"wall_s": time.perf_counter() - start, "cpu_s": _cpu_seconds() - start_cpu,
+                            "peak_rss_mb": peak, **record}
+        logging.info("[%s] %s: %s", self.stage, name, self.steps[name])
+
+    def report(self):
+        self._note_peak(peak_rss_mb())
+        report = {"wall_s": time.perf_counter() - self._start, "cpu_s": _cpu_seconds() - self._start_cpu,
+                  "peak_rss_mb": self.peak_rss_mb, "steps": self.steps}
+        if resource is not None and resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss:
+            report["children_peak_rss_mb"] = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+        return report
+
+    def write(self, output_dir=PERF_DIR):
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, f"{self.stage}.json")
+        with open(path, "w") as file:
+            json.dump(self.report(), file, indent=4)
+        logging.info("Performance report for %s saved to %s", self.stage, path)
+        return path
+
+
+@contextmanager
+def profile_stage(stage, output_dir=PERF_DIR):
+    """Profile a stage; usable as a decorator on main()."""
+    profiler = StageProfiler(stage)
+    _active.append(profiler)
+    try:
+        yield profiler
+    finally:
+        _active.remove(profiler)
+    profiler.write(output_dir)
+
+
+@contextmanager
+def step(name):
+    """Profile a sub-step of the active stage; yields a dict for extra fields such as ``rows``."""
+    if not _active:
+        yield {}
+        return
+    with _active[-1].step(name) as record:
+        yield record
@@ -0,0 +1,316 @@
+"""
+Text normalization shared by the data_preprocessing stage and the Flask app.
+
+normalize_text() returns exactly what the original chain
+lower_case -> remove_stop_words -> removing_numbers -> removing_punctuations
+-> removing_urls -> lemmatization returned, but walks each text once:
+every word is lower-cased, checked against the stop words, stripped of
+digits and punctuation with a single str.translate and lemmatized.
+The step functions are kept as the reference implementation.
+
+Lemmas are looked up in a frozen token -> lemma table built from the
+training corpus first, then in a bounded LRU cache in front of WordNet.
+
+NLTK is only imported when a corpus is first needed, and corpora are read
+from a vendored data directory (NLTK_DATA_DIR, default <repo>/nltk_data)
+that is populated once at build time instead of on every import.
+"""
+import os
+import re
+import json
+import hashlib
+import time
+import string
+from pathlib import Path
+from functools import lru_cache, partial
+
+PUNCTUATION_PATTERN = re.compile('[%s]' % re.escape(string.punctuation))
+WHITESPACE_PATTERN = re.compile(r'\s+')
+URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+
+
+class _CleanTable(dict):
+    """
+    str.translate table mapping ASCII punctuation to a space and deleting
+    digits and the Arabic semicolon.
+
+    str.isdigit() accepts hundreds of non-ASCII code points, so digits are
+    resolved lazily the first time a code point is seen instead of scanning
+    the whole Unicode range up front.
+    """
+
+    def __missing__(self, codepoint):
+        value = None if chr(codepoint).isdigit() else codepoint
+        self[codepoint] = value
+        return value
+
+
+_CLEAN_TABLE = _CleanTable({ord(char): ' ' for char in string.punctuation})
+_CLEAN_TABLE[ord('؛')] = None
+
+
+NLTK_CORPORA = ("stopwords", "wordnet")
+NLTK_DATA_DIR = os.getenv("NLTK_DATA_DIR", str(Path(__file__).resolve().parents[2] / "nltk_data"))
+
+
+@lru_cache(maxsize=None)
+def use_vendored_nltk_data():
+    """Put the vendored corpora first on NLTK's search path."""
+    import nltk
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+
+
+def _corpus_present(name, data_dir):
+    corpus_path = os.path.join(data_dir, "corpora", name)
+    return os.path.isdir(corpus_path) or os.path.exists(corpus_path + ".zip")
+
+
+def ensure_nltk_data(data_dir=NLTK_DATA_DIR):
+    """
+    Download the required corpora into ``data_dir`` unless already vendored there.
+
+    Once the corpora are present this only checks the local disk, so it is
+    cheap to call at the start of every stage.
+    """
+    missing = [name for name in NLTK_CORPORA if not _corpus_present(name, data_dir)]
+    if missing:
+        import nltk
+        os.makedirs(data_dir, exist_ok=True)
+        for name in missing:
+            if not nltk.download(name, download_dir=data_dir, quiet=True):
+                raise LookupError(f"Could not download NLTK corpus '{name}' into {data_dir}")
+    use_vendored_nltk_data()
+
+
+# bump whenever normalize_text() output changes; bundles record it to catch train/serve skew
+NORMALIZER_VERSION = "1"
+
+_stop_words = None
+
+
+def get_stop_words():
+    """English stop words, loaded once per process unless set_stop_words() supplied them."""
+    global _stop_words
+    if _stop_words is None:
+        use_vendored_nltk_data()
+        from nltk.corpus import stopwords
+        _stop_words = frozenset(stopwords.words("english"))
+    return _stop_words
+
+
+def set_stop_words(words):
+    global _stop_words
+    _stop_words = frozenset(words)
+
+
+def normalizer_fingerprint():
+    """NORMALIZER_VERSION plus a hash of the stop words; changes whenever normalize_text() output can."""
+    digest = hashlib.sha256("\n".join(sorted(get_stop_words())).encode("utf-8")).hexdigest()[:12]
+    return f"{NORMALIZER_VERSION}-{digest}"
+
+
+@lru_cache(maxsize=None)
+def get_lemmatizer():
+    """WordNet lemmatizer, created once per process."""
+    use_vendored_nltk_data()
+    from nltk.stem import WordNetLemmatizer
+    return WordNetLemmatizer()
+
+
+def _wordnet_lemma(token):
+    return get_lemmatizer().lemmatize(token)
+
+
+def warm_up_lemmatizer():
+    """Load the WordNet corpus now instead of on the first lemma table miss."""
+    get_lemmatizer().lemmatize("warming")
+
+
+DEFAULT_LEMMA_CACHE_SIZE = 100_000
+
+_lemma_table = {}
+_cached_lemma = lru_cache(maxsize=DEFAULT_LEMMA_CACHE_SIZE)(_wordnet_lemma)
+
+
+def configure_lemma_cache(maxsize=DEFAULT_LEMMA_CACHE_SIZE):
+    """Replace the WordNet lemma cache with an empty one holding at most ``maxsize`` tokens."""
+    global _cached_lemma
+    _cached_lemma = lru_cache(maxsize=maxsize)(_wordnet_lemma)
+
+
+def set_lemma_table(table):
+    """Install a frozen token -> lemma table consulted before the LRU cache."""
+    global _lemma_table
+    _lemma_table = dict(table)
+
+
+def lemmatize(token):
+    return _lemma_table.get(token) or _cached_lemma(token)
+
+
+def lemma_cache_info():
+    """Size and hit rate of the lemma table and LRU cache."""
+    info = _cached_lemma.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "table_size": len(_lemma_table),
+        "cache_size": info.currsize,
+        "cache_maxsize": info.maxsize,
+        "hits": info.hits,
+        "misses": info.misses,
+        # every miss inserts one entry, so anything missing from the cache was evicted
+        "evictions": info.misses - info.currsize,
+        "hit_rate": info.hits / lookups if lookups else 0.0,
+    }
+
+
+# Reference step functions
+def lemmatization(text):
+    lemmatizer = get_lemmatizer()
+    return " ".join([lemmatizer.lemmatize(word) for word in text.split()])
+
+def remove_stop_words(text):
+    stop_words = get_stop_words()
+    return " ".join([word for word in str(text).split() if word not in stop_words])
+
+def removing_numbers(text):
+    return ''.join([char for char in text if not char.isdigit()])
+
+def lower_case(text):
+    return " ".join([word.lower() for word in text.split()])
+
+def removing_punctuations(text):
+    text = PUNCTUATION_PATTERN.sub(' ', text)
+    text = text.replace('؛', "")
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+def removing_urls(text):
+    return URL_PATTERN.sub('', text)
+
+
+def tokenize(text):
+    """Cleaned tokens of ``text``, ready to be lemmatized."""
+    stop_words = get_stop_words()
+
+    tokens = []
+    for word in text.split():
+        word = word.lower()
+        if word not in stop_words:
+            tokens.extend(word.translate(_CLEAN_TABLE).split())
+
+    # removing_urls() is not applied: it ran after removing_punctuations(),
+    # so neither ':' nor '.' survived for the URL pattern to match
+    return tokens
+
+
+def normalize_text(text):
+    """Normalize a single text in one pass."""
+    table = _lemma_table
+    cached_lemma = _cached_lemma
+    return " ".join([table.get(token) or cached_lemma(token) for token in tokenize(text)])
+
+
+def normalize_texts(texts):
+    """Normalize a list of texts; repeated texts are normalized only once."""
+    cleaned = {}
+    for text in texts:
+        if text not in cleaned:
+            cleaned[text] = normalize_text(text)
+    return [cleaned[text] for text in texts]
+
+
+def normalize_texts_staged(texts, observe):
+    """
+    normalize_texts() run as one pass per original step over the whole batch,
+    reporting each step's duration through ``observe(step, seconds)``.
+
+    Output is identical to the fused path but slower, so serving only uses it
+    on a sample of requests to break normalization time down by step.
+    """
+    clock = time.perf_counter
+    start = clock()
+    words = [[word.lower() for word in text.split()] for text in texts]
+    lowered = clock()
+    observe("lower_case", lowered - start)
+
+    stop_words = get_stop_words()
+    words = [[word for word in text_words if word not in stop_words] for text_words in words]
+    filtered = clock()
+    observe("remove_stop_words", filtered - lowered)
+
+    tokens = [" ".join(text_words).translate(_CLEAN_TABLE).split() for text_words in words]
+    stripped = clock()
+    observe("remove_numbers_punctuation", stripped - filtered)
+
+    table = _lemma_table
+    cached_lemma = _cached_lemma
+    cleaned = [" ".join([table.get(token) or cached_lemma(token) for token in text_tokens]) for text_tokens in tokens]
+    observe("lemmatization", clock() - stripped)
+    return cleaned
+
+
+def _init_normalizer_worker(stop_words, lemma_table, lemma_cache_size):
+    """Install the parent's resources and load WordNet once per worker process."""
+    set_stop_words(stop_words)
+    set_lemma_table(lemma_table)
+    configure_lemma_cache(lemma_cache_size)
+    get_lemmatizer()
+
+
+def normalize_parallel(texts, n_jobs, chunk_size=10000):
+    """
+    normalize_texts() over ``chunk_size`` slices of ``texts`` in ``n_jobs`` worker
+    processes (-1 for every core); results come back in input order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    texts = list(texts)
+    n_jobs = os.cpu_count() if n_jobs in (-1, 0, None) else n_jobs
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+    if n_jobs <= 1 or len(chunks) <= 1:
+        return normalize_texts(texts)
+
+    initargs = (get_stop_words(), _lemma_table, _cached_lemma.cache_info().maxsize)
+    with ProcessPoolExecutor(min(n_jobs, len(chunks)), initializer=_init_normalizer_worker, initargs=initargs) as pool:
+        return [text for chunk in pool.map(normalize_texts, chunks) for text in chunk]
+
+
+def normalize_series(series, n_jobs=1, chunk_size=10000, cache=None):
+    """
+    Normalize a pandas Series of texts in a single pass over its distinct values,
+    spread over ``n_jobs`` processes when it is greater than one. With a
+    NormalizationCache only values it has not seen before are normalized.
+    """
+    series = series.map(str)
+    uniques = series.unique()
+    normalize = partial(normalize_parallel, n_jobs=n_jobs, chunk_size=chunk_size)
+    normalized = normalize(uniques) if cache is None else cache.normalize(uniques, normalize)
+    return series.map(dict(zip(uniques, normalized)))
+
+
+def build_lemma_table(texts):
+    """Token -> lemma table covering every token of ``texts``."""
+    tokens = set()
+    for text in set(texts):
+        tokens.update(tokenize(str(text)))
+    return {token: lemmatize(token) for token in sorted(tokens)}
+
+
+def save_lemma_table(table, path):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(table, file, ensure_ascii=False)
+
+
+def load_lemma_table(path):
+    """Load a saved lemma table and install it for normalize_text()."""
+    with open(path, 'r', encoding='utf-8') as file:
+        table = json.load(file)
+    set_lemma_table(table)
+    return table
+
+
+if __name__ == "__main__":
+    # vendor the corpora at build time: python -m src.utils.text_normalizer
+    ensure_nltk_data()
+    print(f"NLTK corpora {', '.join(NLTK_CORPORA)} available in {NLTK_DATA_DIR}")
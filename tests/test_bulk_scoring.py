@@ -0,0 +1,66 @@
+import os
+import json
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.pipeline.bulk_scoring import bulk_score
+from src.pipeline.prediction_pipeline import load_bundle
+from src.utils.text_normalizer import normalize_texts, set_lemma_table
+from tests.test_prediction_pipeline import write_stub_bundle
+
+TEXTS = ["I love the happy day!!", "so sad, I cry", "awful 123 day", "great fun", None, "miss the smile"]
+
+
+class BulkScoringTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.bundle_dir, _, _ = write_stub_bundle(self.tmp_dir.name)
+        self.rows = [{"tweet_id": 1000 + i, "content": TEXTS[i % len(TEXTS)]} for i in range(95)]
+
+    def tearDown(self):
+        set_lemma_table({})
+        self.tmp_dir.cleanup()
+
+    def expected(self):
+        texts = ["" if row["content"] is None else row["content"] for row in self.rows]
+        return load_bundle(self.bundle_dir).predict_cleaned(normalize_texts(texts))
+
+    #chunked multi-process output keeps input order and matches direct scoring
+    def test_csv_in_order_across_workers(self):
+        input_path = os.path.join(self.tmp_dir.name, "tweets.csv")
+        output_path = os.path.join(self.tmp_dir.name, "out", "predictions.csv")
+        pd.DataFrame(self.rows).to_csv(input_path, index=False)
+
+        summary = bulk_score(input_path, output_path, self.bundle_dir, id_column="tweet_id",
+                             chunk_size=10, workers=2, max_in_flight=3)
+
+        output = pd.read_csv(output_path)
+        labels, probabilities = self.expected()
+        self.assertEqual(summary["rows"], len(self.rows))
+        self.assertEqual(output["tweet_id"].tolist(), [row["tweet_id"] for row in self.rows])
+        self.assertEqual(output["label"].tolist(), list(labels))
+        for probability, expected in zip(output["probability"], probabilities):
+            self.assertAlmostEqual(probability, expected)
+
+    #jsonl input without an id column is numbered by row
+    def test_jsonl_single_process(self):
+        input_path = os.path.join(self.tmp_dir.name, "tweets.jsonl")
+        output_path = os.path.join(self.tmp_dir.name, "predictions.jsonl")
+        with open(input_path, "w") as file:
+            for row in self.rows:
+                file.write(json.dumps(row) + "\n")
+
+        bulk_score(input_path, output_path, self.bundle_dir, chunk_size=7, workers=1)
+
+        with open(output_path) as file:
+            output = [json.loads(line) for line in file]
+        labels, _ = self.expected()
+        self.assertEqual([row["row"] for row in output], list(range(len(self.rows))))
+        self.assertEqual([row["label"] for row in output], list(labels))
+
+
+if __name__ == "__main__":
+    unittest.main()
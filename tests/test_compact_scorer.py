@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.pipeline.compact_scorer import compile_compact_model, load_compact_model, compare_with_sklearn
+from src.pipeline.prediction_pipeline import load_bundle
+from src.utils.text_normalizer import normalize_texts, set_lemma_table
+from tests.test_prediction_pipeline import write_stub_bundle
+
+TEXTS = ["I love the happy day!!", "so sad, I cry", "awful 123 day", "love love love", "", "miss the great fun"]
+
+
+class CompactScorerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.bundle_dir, self.model, self.vectorizer = write_stub_bundle(self.tmp_dir.name)
+        load_bundle(self.bundle_dir)  # installs the bundle's stop words and lemma table
+        self.cleaned = normalize_texts(TEXTS)
+
+    def tearDown(self):
+        set_lemma_table({})
+        self.tmp_dir.cleanup()
+
+    def compile(self, quantization):
+        path = os.path.join(self.tmp_dir.name, f"scorer_{quantization}.npz")
+        return load_compact_model(compile_compact_model(self.model, self.vectorizer, path, quantization))
+
+    #float32 reproduces sklearn labels and probabilities
+    def test_float32_matches_sklearn(self):
+        compact = self.compile("float32")
+        labels, probabilities = compact.predict_cleaned(self.cleaned)
+        features = self.vectorizer.transform(self.cleaned)
+        np.testing.assert_array_equal(labels, self.model.predict(features))
+        np.testing.assert_allclose(probabilities, self.model.predict_proba(features)[:, 1], atol=1e-6)
+
+    #quantized modes stay close to the full-precision model
+    def test_quantized_modes(self):
+        for quantization, tolerance in (("float16", 1e-3), ("int8", 2e-2)):
+            parity = compare_with_sklearn(self.model, self.vectorizer, self.compile(quantization))
+            self.assertEqual(parity["label_agreement"], 1.0)
+            self.assertLess(parity["max_probability_error"], tolerance)
+
+    #exported bundles carry the compact scorer, loadable without the pickles
+    def test_bundle_compact_mode(self):
+        compact = load_bundle(self.bundle_dir, compact=True)
+        full = load_bundle(self.bundle_dir)
+        self.assertEqual(compact.version, full.version)
+        self.assertEqual(compact.manifest["compact"]["label_agreement"], 1.0)
+        np.testing.assert_allclose(compact.predict_cleaned(self.cleaned)[1], full.predict_cleaned(self.cleaned)[1])
+
+    def test_unsupported_vectorizer(self):
+        self.vectorizer.ngram_range = (1, 2)
+        with self.assertRaises(ValueError):
+            self.compile("float32")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.components.data_ingestion import basic_cleaning, fetch_source, read_source
+
+EMOTIONS = ["happiness", "sadness", "neutral", "worry", "love"]
+
+
+class ETagHandler(SimpleHTTPRequestHandler):
+    """Static file server answering If-None-Match with 304."""
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        super().do_GET()
+
+    def end_headers(self):
+        self.send_header("ETag", '"v1"')
+        super().end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class UnavailableHandler(ETagHandler):
+    """Serves the file once, then answers every revalidation with 503."""
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match"):
+            self.send_error(503)
+            return
+        super().do_GET()
+
+
+class DataIngestionTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.source = os.path.join(self.tmp_dir.name, "tweet_emotions.csv")
+        pd.DataFrame({
+            "tweet_id": np.arange(1000),
+            "sentiment": rng.choice(EMOTIONS, 1000),
+            "content": [f"tweet number {i}" for i in range(1000)],
+        }).to_csv(self.source, index=False)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    #chunked filtering gives the same rows and the same stratified split as one full read
+    def test_chunked_read_matches_full_read(self):
+        full = basic_cleaning(pd.read_csv(self.source))
+        chunked = read_source(self.source, chunk_size=64)
+        pd.testing.assert_frame_equal(chunked, full, check_dtype=False)
+
+        split = partial(train_test_split, test_size=0.2, random_state=42)
+        full_train, _ = split(full, stratify=full["sentiment"])
+        chunked_train, _ = split(chunked, stratify=chunked["sentiment"])
+        self.assertEqual(full_train.to_csv(index=False), chunked_train.to_csv(index=False))
+
+    #remote source is downloaded once, revalidated by ETag and served from cache offline
+    def test_source_cache(self):
+        handler = partial(ETagHandler, directory=self.tmp_dir.name)
+        ETagHandler.requests_seen = []
+        server = HTTPServer(("127.0.0.1", 0), handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}/tweet_emotions.csv"
+        cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        try:
+            first = fetch_source(url, cache_dir)
+            second = fetch_source(url, cache_dir)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(first, second)
+        self.assertEqual(ETagHandler.requests_seen, [None, '"v1"'])
+        with open(first, "rb") as cached, open(self.source, "rb") as original:
+            self.assertEqual(cached.read(), original.read())
+
+        # server gone: the cached copy is used
+        self.assertEqual(fetch_source(url, cache_dir), first)
+
+    #a server error on revalidation falls back to the verified cached copy
+    def test_server_error_uses_cache(self):
+        server = HTTPServer(("127.0.0.1", 0), partial(UnavailableHandler, directory=self.tmp_dir.name))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}/tweet_emotions.csv"
+        cache_dir = os.path.join(self.tmp_dir.name, "cache")
+        try:
+            first = fetch_source(url, cache_dir)
+            self.assertEqual(fetch_source(url, cache_dir), first)
+            # without a cached copy the error still surfaces
+            with self.assertRaises(Exception):
+                fetch_source(url.replace("tweet_emotions", "missing"), cache_dir)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from scipy import sparse
+
+from src.utils.feature_store import save_features, load_features, iter_feature_chunks
+
+
+class FeatureStoreTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp_dir.name, "train_features")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    #round trip keeps the matrix, the labels and the sparsity
+    def test_round_trip(self):
+        features = sparse.random(200, 50000, density=0.0005, format="csr", random_state=0, dtype=np.float64)
+        labels = np.arange(200) % 2
+        save_features(self.directory, features, labels)
+
+        for mmap in (True, False):
+            loaded, loaded_labels = load_features(self.directory, mmap=mmap)
+            self.assertEqual(loaded.shape, (200, 50000))
+            self.assertEqual((loaded != features).nnz, 0)
+            np.testing.assert_array_equal(loaded_labels, labels)
+
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "dense.npy")))
+        on_disk = sum(os.path.getsize(os.path.join(self.directory, name)) for name in os.listdir(self.directory))
+        self.assertLess(on_disk, 200 * 50000)
+
+    #memory-mapped arrays back the loaded matrix without a copy
+    def test_memory_mapped(self):
+        save_features(self.directory, sparse.eye(10, format="csr"), np.zeros(10))
+        features, labels = load_features(self.directory)
+        self.assertIsInstance(labels, np.memmap)
+        # a read-only view of the mapped file rather than an in-memory copy
+        self.assertFalse(features.data.flags.writeable)
+        self.assertFalse(features.indices.flags.writeable)
+
+    #chunks cover every row once, in the requested order
+    def test_iter_feature_chunks(self):
+        features = sparse.random(25, 40, density=0.2, format="csr", random_state=1)
+        save_features(self.directory, features, np.arange(25))
+
+        chunks = list(iter_feature_chunks(self.directory, 10))
+        self.assertEqual([matrix.shape[0] for matrix, _ in chunks], [10, 10, 5])
+        self.assertEqual((sparse.vstack([matrix for matrix, _ in chunks]) != features).nnz, 0)
+
+        (matrix, labels), = iter_feature_chunks(self.directory, 10, order=[2])
+        self.assertEqual((matrix != features[20:]).nnz, 0)
+        np.testing.assert_array_equal(labels, np.arange(20, 25))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
+import json
 import unittest
-from flask_app.app import app
+from flask_app.app import app, MAX_BATCH_SIZE
 
 class FlaskAppTests(unittest.TestCase):
 
@@ -25,5 +26,52 @@ class FlaskAppTests(unittest.TestCase):
             "Response should contain either 'Happy' or 'Sad'"
         )
 
+    #batch endpoint returns one prediction per text with a probability
+    def test_predict_batch(self):
+        texts = ["I love this!", "This is the worst day ever", "hi how are you"]
+        response = self.client.post('/predict_batch', json={"texts": texts})
+        self.assertEqual(response.status_code, 200)
+        predictions = response.get_json()["predictions"]
+        self.assertEqual(len(predictions), len(texts))
+        for prediction in predictions:
+            self.assertIn(prediction["label"], (0, 1))
+            self.assertGreaterEqual(prediction["probability"], 0.0)
+            self.assertLessEqual(prediction["probability"], 1.0)
+
+    #batches over the configured limit or with a bad payload are rejected
+    def test_predict_batch_rejects_invalid_requests(self):
+        response = self.client.post('/predict_batch', json={"texts": ["hi"] * (MAX_BATCH_SIZE + 1)})
+        self.assertEqual(response.status_code, 413)
+
+        response = self.client.post('/predict_batch', json={"text": "hi"})
+        self.assertEqual(response.status_code, 400)
+
+        for body in (["a"], "x", 5, None):
+            response = self.client.post('/predict_batch', json=body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn("error", response.get_json())
+
+    #streaming endpoint answers each NDJSON line in order, including malformed ones
+    def test_predict_stream(self):
+        body = '"I love this!"\n{"id": "a", "text": "This is the worst day ever"}\nnot json\n"hi how are you"\n'
+        response = self.client.post('/predict_stream', data=body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual([row["index"] for row in rows], [0, 1, 2, 3])
+        self.assertEqual(rows[1]["id"], "a")
+        self.assertIn("error", rows[2])
+        self.assertIn(rows[3]["label"], (0, 1))
+
+    #metrics endpoint exposes per-stage latency histograms
+    def test_metrics_page(self):
+        self.client.post('/predict_batch', json={"texts": ["I love this!"]})
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        body = response.data.decode()
+        self.assertIn('emotion_stage_latency_seconds_bucket{stage="vectorize"', body)
+        self.assertIn('emotion_stage_latency_seconds_count{stage="model_predict"', body)
+        self.assertIn('emotion_requests_total{endpoint="predict_batch",status="200"}', body)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,39 @@
+import unittest
+
+from src.utils.metrics import MetricsRegistry
+
+
+class MetricsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    #histogram buckets are cumulative and end with +Inf
+    def test_histogram_buckets(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value, "vectorize")
+
+        lines = self.registry.render().splitlines()
+        self.assertIn('latency_seconds_bucket{stage="vectorize",le="0.1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{stage="vectorize",le="1.0"} 3', lines)
+        self.assertIn('latency_seconds_bucket{stage="vectorize",le="+Inf"} 4', lines)
+        self.assertIn('latency_seconds_count{stage="vectorize"} 4', lines)
+        self.assertIn('latency_seconds_sum{stage="vectorize"} 2.65', lines)
+
+    #counters and collectors render in the Prometheus text format
+    def test_counter_and_collector(self):
+        counter = self.registry.counter("requests_total", "Requests.", ("endpoint", "status"))
+        counter.inc("predict", "200")
+        counter.inc("predict", "200", amount=2)
+        self.registry.add_collector(lambda: [("model_info", "gauge", "Model.", [({"model_version": 'v"1'}, 1)])])
+
+        text = self.registry.render()
+        self.assertIn("# TYPE requests_total counter", text)
+        self.assertIn('requests_total{endpoint="predict",status="200"} 3', text)
+        self.assertIn('model_info{model_version="v\\"1"} 1', text)
+        self.assertTrue(text.endswith("\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
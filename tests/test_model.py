@@ -5,6 +5,7 @@ import os
 import pandas as pd
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 import pickle
+from src.utils.feature_store import load_features
 
 class TestModelLoading(unittest.TestCase):
 
@@ -38,8 +39,8 @@ class TestModelLoading(unittest.TestCase):
             cls.vectorizer = pickle.load(f)
 
         # Load holdout test data
-        test_data_path = Path('artifacts') / 'data' / 'vectorized' / 'test_vectorized.csv'
-        cls.holdout_data = pd.read_csv(test_data_path)
+        test_data_path = Path('artifacts') / 'data' / 'vectorized' / 'test_features'
+        cls.X_holdout, cls.y_holdout = load_features(test_data_path)
 
     @staticmethod
     def get_latest_model_version(model_name, stage="Staging"):
@@ -60,7 +61,9 @@ class TestModelLoading(unittest.TestCase):
         prediction = self.new_model.predict(input_df)
 
         # Verify the input shape
-        self.assertEqual(input_df.shape[1], len(self.vectorizer.get_feature_names_out()))
+        # a HashingVectorizer has a fixed n_features instead of a vocabulary
+        expected_features = getattr(self.vectorizer, 'n_features', None) or len(self.vectorizer.get_feature_names_out())
+        self.assertEqual(input_df.shape[1], expected_features)
 
         # Verify the output shape (assuming binary classification with a single output)
         self.assertEqual(len(prediction), input_df.shape[0])
@@ -68,8 +71,8 @@ class TestModelLoading(unittest.TestCase):
 
     def test_model_performance(self):
         # Extract features and labels from holdout test data
-        X_holdout = self.holdout_data.iloc[:,0:-1]
-        y_holdout = self.holdout_data.iloc[:,-1]
+        X_holdout = self.X_holdout
+        y_holdout = self.y_holdout
 
         # Predict using the new model
         y_pred_new = self.new_model.predict(X_holdout)
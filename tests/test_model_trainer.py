@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from scipy import sparse
+
+from src.components import model_trainer
+from src.utils.feature_store import save_features, load_features
+
+SGD_PARAMS = {"loss": "log_loss", "penalty": "l2", "alpha": 0.001, "random_state": 0}
+
+
+def make_features(n_rows, seed):
+    """Sparse counts where the first 10 columns carry the label."""
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, 2, n_rows)
+    features = sparse.random(n_rows, 200, density=0.02, format="lil", random_state=seed)
+    for row, label in enumerate(labels):
+        features[row, rng.integers(0, 5) + 5 * label] = 1.0
+    return features.tocsr(), labels
+
+
+class StreamingTrainerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.train_dir = os.path.join(self.tmp_dir.name, "train_features")
+        self.checkpoint = os.path.join(self.tmp_dir.name, "checkpoint", "sgd.pkl")
+        save_features(self.train_dir, *make_features(2000, seed=0))
+        self.X_test, self.y_test = make_features(500, seed=1)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def train(self, **kwargs):
+        return model_trainer.train_model_streaming(self.train_dir, SGD_PARAMS, chunk_size=300, epochs=3, **kwargs)
+
+    #streaming SGD reaches the accuracy of the batch LogisticRegression
+    def test_accuracy_parity(self):
+        X_train, y_train = load_features(self.train_dir)
+        batch = model_trainer.train_model(X_train, y_train, {"C": 1.0, "solver": "liblinear"})
+        streaming = self.train()
+
+        batch_accuracy = np.mean(batch.predict(self.X_test) == self.y_test)
+        streaming_accuracy = np.mean(streaming.predict(self.X_test) == self.y_test)
+        self.assertGreater(batch_accuracy, 0.9)
+        self.assertGreater(streaming_accuracy, batch_accuracy - 0.02)
+        self.assertEqual(streaming.predict_proba(self.X_test).shape, (500, 2))
+
+    #an interrupted run resumes from its checkpoint and ends with the same model
+    def test_resume_from_checkpoint(self):
+        expected = self.train()
+
+        chunks_seen = []
+        iter_chunks = model_trainer.iter_feature_chunks
+
+        def interrupted(*args):
+            for chunk in iter_chunks(*args):
+                if len(chunks_seen) == 10:
+                    raise KeyboardInterrupt
+                chunks_seen.append(chunk)
+                yield chunk
+
+        with mock.patch.object(model_trainer, "iter_feature_chunks", interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                self.train(checkpoint_path=self.checkpoint, checkpoint_every=2)
+        self.assertTrue(os.path.exists(self.checkpoint))
+
+        resumed = self.train(checkpoint_path=self.checkpoint, checkpoint_every=2)
+        np.testing.assert_array_equal(resumed.coef_, expected.coef_)
+        np.testing.assert_array_equal(resumed.intercept_, expected.intercept_)
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    #a checkpoint written for other settings is not resumed
+    def test_stale_checkpoint_ignored(self):
+        model_trainer.save_checkpoint(self.checkpoint, None, 2, 0, {"chunk_size": 1})
+        model = self.train(checkpoint_path=self.checkpoint)
+        self.assertIsNotNone(model)
+        np.testing.assert_array_equal(model.coef_, self.train().coef_)
+
+
+class SweepTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.train_dir = os.path.join(self.tmp_dir.name, "train_features")
+        save_features(self.train_dir, *make_features(600, seed=0))
+        self.sweep_params = {"cv": 3, "n_jobs": 1, "grid": {"C": [0.0001, 0.1, 1.0], "solver": ["liblinear", "lbfgs"]},
+                             "best_params_path": os.path.join(self.tmp_dir.name, "reports", "best.yaml"),
+                             "results_path": os.path.join(self.tmp_dir.name, "reports", "results.csv")}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    #paths group candidates by everything but C and order them by increasing C
+    def test_regularization_paths(self):
+        paths = model_trainer.regularization_paths(model_trainer.sweep_candidates(self.sweep_params["grid"]))
+        self.assertEqual(len(paths), 2)
+        for path in paths:
+            self.assertEqual([candidate["C"] for candidate in path], [0.0001, 0.1, 1.0])
+            self.assertEqual(len({candidate["solver"] for candidate in path}), 1)
+
+    #the sweep ranks every candidate, warm-starts lbfgs only, and writes the reports
+    def test_sweep(self):
+        best, table = model_trainer.sweep(self.train_dir, {"max_iter": 100}, self.sweep_params)
+        self.assertEqual(len(table), 6)
+        self.assertNotEqual(best["C"], 0.0001)
+        self.assertEqual(best["max_iter"], 100)
+        self.assertEqual(table[0]["mean_accuracy"], max(row["mean_accuracy"] for row in table))
+        self.assertEqual({row["solver"] for row in table if row["warm_started"]}, {"lbfgs"})
+
+        model_trainer.save_sweep_report(best, table, self.sweep_params)
+        self.assertTrue(os.path.exists(self.sweep_params["best_params_path"]))
+        with open(self.sweep_params["results_path"]) as f:
+            self.assertEqual(len(f.readlines()), 7)
+
+    #a process pool gives the same table as the in-process sweep
+    def test_parallel_sweep_matches(self):
+        _, serial = model_trainer.sweep(self.train_dir, {}, self.sweep_params)
+        _, parallel = model_trainer.sweep(self.train_dir, {}, {**self.sweep_params, "n_jobs": 2})
+        self.assertEqual([row["mean_accuracy"] for row in serial], [row["mean_accuracy"] for row in parallel])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.pipeline.model_watcher import ModelWatcher
+from src.pipeline.prediction_pipeline import load_bundle, latest_bundle_version
+from src.utils.text_normalizer import set_lemma_table
+from tests.test_prediction_pipeline import write_stub_bundle
+
+
+class ModelWatcherTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.bundle_dir, _, _ = write_stub_bundle(self.tmp_dir.name, C=10)
+        self.predictor = load_bundle(self.bundle_dir)
+        self.warmed_up = []
+
+    def tearDown(self):
+        set_lemma_table({})
+        self.tmp_dir.cleanup()
+
+    def swap(self, predictor):
+        self.predictor = predictor
+
+    def make_watcher(self, load_version=None):
+        return ModelWatcher(
+            lambda: latest_bundle_version(self.bundle_dir),
+            load_version or (lambda version: load_bundle(os.path.join(self.bundle_dir, version))),
+            self.swap,
+            current_version=self.predictor.version,
+            warmup=self.warmed_up.append,
+        )
+
+    #the local bundle directory stands in for the registry
+    def test_new_bundle_is_warmed_up_and_swapped(self):
+        watcher = self.make_watcher()
+        self.assertFalse(watcher.check())
+
+        old_version = self.predictor.version
+        write_stub_bundle(self.tmp_dir.name, C=0.1)
+        self.assertTrue(watcher.check())
+
+        self.assertNotEqual(self.predictor.version, old_version)
+        self.assertEqual(self.warmed_up, [self.predictor])
+        self.assertEqual(watcher.info()["swaps"], 1)
+        self.assertFalse(watcher.check())
+
+    def test_failed_load_keeps_current_model(self):
+        def broken(version):
+            raise ValueError("corrupt bundle")
+
+        watcher = self.make_watcher(load_version=broken)
+        current = self.predictor
+        write_stub_bundle(self.tmp_dir.name, C=0.1)
+
+        watcher.poll_interval = 0.01
+        watcher.start()
+        try:
+            deadline = time.time() + 5
+            while watcher.info()["failures"] == 0 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+        self.assertIs(self.predictor, current)
+        self.assertEqual(watcher.info()["last_error"], "corrupt bundle")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.utils.normalization_cache import NormalizationCache
+
+
+class NormalizationCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp_dir.name, "cache", "normalization.sqlite")
+        self.calls = []
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def normalize(self, texts):
+        self.calls.append(list(texts))
+        return [text.lower() for text in texts]
+
+    #a rerun only normalizes texts it has never seen
+    def test_incremental_runs(self):
+        cache = NormalizationCache(self.db_path, "1-abc")
+        self.assertEqual(cache.normalize(["A", "B"], self.normalize), ["a", "b"])
+        cache.close()
+
+        cache = NormalizationCache(self.db_path, "1-abc")
+        self.assertEqual(cache.normalize(["B", "C", "A"], self.normalize), ["b", "c", "a"])
+        self.assertEqual(self.calls, [["A", "B"], ["C"]])
+        info = cache.info()
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (2, 1, 3))
+        self.assertAlmostEqual(info["hit_ratio"], 2 / 3)
+
+    #a new normalizer version misses everything and compaction drops the old entries
+    def test_version_change_and_compact(self):
+        NormalizationCache(self.db_path, "1-abc").normalize(["A", "B"], self.normalize)
+
+        cache = NormalizationCache(self.db_path, "2-abc")
+        cache.normalize(["A"], self.normalize)
+        self.assertEqual(cache.info()["misses"], 1)
+        self.assertEqual(cache.compact(), 2)
+        self.assertEqual(cache.compact(max_age_days=0), 1)
+        self.assertEqual(cache.info()["size"], 0)
+
+    #compaction by age keeps entries that are still being hit, whatever their creation time
+    def test_compact_by_last_use(self):
+        cache = NormalizationCache(self.db_path, "1-abc")
+        cache.normalize(["A", "B"], self.normalize)
+        cache._db.execute("UPDATE normalized SET created_at = 0, last_used = 0")
+
+        cache.normalize(["A"], self.normalize)
+        self.assertEqual(cache.compact(max_age_days=1), 1)
+        self.assertEqual(cache.normalize(["A", "B"], self.normalize), ["a", "b"])
+        self.assertEqual(self.calls, [["A", "B"], ["B"]])
+
+    #a cache file from before last_used existed is migrated in place
+    def test_migrates_old_schema(self):
+        os.makedirs(os.path.dirname(self.db_path))
+        db = sqlite3.connect(self.db_path)
+        db.execute("CREATE TABLE normalized (key BLOB, version TEXT, text TEXT, created_at REAL, "
+                   "PRIMARY KEY (key, version))")
+        db.commit()
+        db.close()
+
+        cache = NormalizationCache(self.db_path, "1-abc")
+        self.assertEqual(cache.normalize(["A"], self.normalize), ["a"])
+        self.assertEqual(cache.normalize(["A"], self.normalize), ["a"])
+        self.assertEqual(cache.info()["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.utils.prediction_cache import PredictionCache
+
+
+class PredictionCacheTests(unittest.TestCase):
+
+    def test_hits_misses_and_evictions(self):
+        cache = PredictionCache(maxsize=2, ttl=60)
+        self.assertEqual(cache.get_many("1", ["love day"]), {})
+
+        cache.set_many("1", {"love day": (1, 0.9), "sad day": (0, 0.2), "cry": (0, 0.1)})
+        self.assertEqual(cache.get_many("1", ["sad day", "cry", "love day"]), {"sad day": (0, 0.2), "cry": (0, 0.1)})
+
+        info = cache.info()
+        self.assertEqual(info["size"], 2)
+        self.assertEqual(info["hits"], 2)
+        self.assertEqual(info["misses"], 2)
+        self.assertEqual(info["evictions"], 1)
+
+    def test_entries_expire(self):
+        cache = PredictionCache(maxsize=10, ttl=0.01)
+        cache.set_many("1", {"love day": (1, 0.9)})
+        time.sleep(0.02)
+        self.assertEqual(cache.get_many("1", ["love day"]), {})
+        self.assertEqual(cache.info()["expired"], 1)
+
+    #a new model version must never see predictions of the previous one
+    def test_model_version_change_invalidates(self):
+        cache = PredictionCache(maxsize=10, ttl=60)
+        cache.set_many("1", {"love day": (1, 0.9)})
+        self.assertEqual(cache.get_many("2", ["love day"]), {})
+
+        cache.set_live_version("2")
+        self.assertEqual(cache.info()["size"], 0)
+        self.assertEqual(cache.get_many("1", ["love day"]), {})
+
+    #requests still running on a replaced model neither wipe nor refill the cache
+    def test_stale_version_does_not_wipe(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = PredictionCache(maxsize=10, ttl=60, db_path=os.path.join(tmp_dir, "predictions.sqlite"))
+            cache.set_live_version("2")
+            cache.set_many("2", {"love day": (1, 0.9)})
+
+            self.assertEqual(cache.get_many("1", ["love day"]), {})
+            cache.set_many("1", {"cry": (0, 0.1)})
+            self.assertEqual(cache.get_many("2", ["love day", "cry"]), {"love day": (1, 0.9)})
+            self.assertEqual(cache.info()["size"], 1)
+            self.assertEqual(cache.info()["shared_hits"], 0)
+
+    #shared sqlite tier is visible to a second cache, like another gunicorn worker
+    def test_shared_tier(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "predictions.sqlite")
+            worker_1 = PredictionCache(maxsize=10, ttl=60, db_path=db_path)
+            worker_2 = PredictionCache(maxsize=10, ttl=60, db_path=db_path)
+
+            worker_1.set_many("1", {"love day": (1, 0.9)})
+            self.assertEqual(worker_2.get_many("1", ["love day", "cry"]), {"love day": (1, 0.9)})
+            self.assertEqual(worker_2.info()["shared_hits"], 1)
+            self.assertEqual(worker_2.info()["misses"], 1)
+
+            worker_2.get_many("2", ["love day"])
+            self.assertEqual(worker_1.get_many("1", ["love day"]), {"love day": (1, 0.9)})
+            self.assertEqual(worker_1.get_many("2", ["love day"]), {})
+
+    #an entry copied from the shared tier keeps the expiry it was stored with
+    def test_shared_hit_keeps_expiry(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "predictions.sqlite")
+            worker_1 = PredictionCache(maxsize=10, ttl=0.2, db_path=db_path)
+            worker_2 = PredictionCache(maxsize=10, ttl=0.2, db_path=db_path)
+
+            worker_1.set_many("1", {"love day": (1, 0.9)})
+            time.sleep(0.15)
+            self.assertEqual(worker_2.get_many("1", ["love day"]), {"love day": (1, 0.9)})
+            time.sleep(0.1)
+            self.assertEqual(worker_2.get_many("1", ["love day"]), {})
+            self.assertEqual(worker_2.info()["expired"], 1)
+
+    #expired shared rows are purged and the rest is capped at db_max_rows
+    def test_shared_tier_is_bounded(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = PredictionCache(maxsize=10, ttl=60, db_path=os.path.join(tmp_dir, "predictions.sqlite"),
+                                    db_max_rows=2, purge_every=2)
+            cache.set_many("1", {"love day": (1, 0.9)})
+            cache._db.execute("UPDATE predictions SET expires_at = 0")
+            cache.set_many("1", {"sad day": (0, 0.2), "cry": (0, 0.1), "fun": (1, 0.8)})
+
+            self.assertEqual(cache.info()["shared_purged"], 2)
+            self.assertEqual(cache._db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0], 2)
+
+    #a failed write is rolled back instead of leaving the connection in a transaction
+    def test_failed_write_rolls_back(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = PredictionCache(maxsize=10, ttl=60, db_path=os.path.join(tmp_dir, "predictions.sqlite"))
+            with self.assertRaises(Exception):
+                cache.set_many("1", {"love day": (object(), 0.9)})
+            self.assertFalse(cache._db.in_transaction)
+
+            cache.set_many("1", {"cry": (0, 0.1)})
+            cache._memory.clear()
+            self.assertEqual(cache.get_many("1", ["cry", "love day"]), {"cry": (0, 0.1)})
+
+    #a worker forked from a preloading master opens its own sqlite connection
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_shared_tier_after_fork(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = PredictionCache(maxsize=10, ttl=60, db_path=os.path.join(tmp_dir, "predictions.sqlite"))
+            cache.set_many("1", {"love day": (1, 0.9)})
+            parent_connection = cache._db
+
+            pid = os.fork()
+            if pid == 0:
+                ok = cache._db is not parent_connection and cache.get_many("1", ["cry"]) == {}
+                cache.set_many("1", {"cry": (0, 0.2)})
+                os._exit(0 if ok else 1)
+            _, status = os.waitpid(pid, 0)
+
+            self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+            self.assertIs(cache._db, parent_connection)
+            cache._memory.clear()
+            self.assertEqual(cache.get_many("1", ["cry"]), {"cry": (0, 0.2)})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import json
+import os
+import tempfile
+import unittest
+
+import joblib
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.linear_model import LogisticRegression
+
+from src.components.model_export import export_bundle
+from src.pipeline.prediction_pipeline import load_bundle
+from src.utils.text_normalizer import normalize_texts, set_lemma_table
+
+TRAIN_TEXTS = [
+    "love happy day", "happy smile love", "great fun day", "love great smile",
+    "sad cry day", "cry miss sad", "bad awful day", "miss bad cry",
+]
+TRAIN_LABELS = [1, 1, 1, 1, 0, 0, 0, 0]
+STOP_WORDS = ["i", "the", "a", "is", "so"]
+LEMMA_TABLE = {token: token for text in TRAIN_TEXTS for token in text.split()}
+
+
+def write_stub_bundle(tmp_dir, C=10):
+    """Export a tiny bundle whose lemma table covers every token, so no NLTK data is needed."""
+    vectorizer = CountVectorizer(max_features=100)
+    model = LogisticRegression(C=C).fit(vectorizer.fit_transform(TRAIN_TEXTS), TRAIN_LABELS)
+
+    model_path = os.path.join(tmp_dir, "model.pkl")
+    vectorizer_path = os.path.join(tmp_dir, "vectorizer.pkl")
+    lemma_table_path = os.path.join(tmp_dir, "lemma_table.json")
+    joblib.dump(model, model_path)
+    joblib.dump(vectorizer, vectorizer_path)
+    with open(lemma_table_path, "w") as file:
+        json.dump(LEMMA_TABLE, file)
+
+    bundle_dir = os.path.join(tmp_dir, "bundle")
+    export_bundle(model_path, vectorizer_path, lemma_table_path, bundle_dir,
+                  model_name="emotion_predictor_model", stop_words=STOP_WORDS)
+    return bundle_dir, model, vectorizer
+
+
+class PredictionPipelineTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.bundle_dir, self.model, self.vectorizer = write_stub_bundle(self.tmp_dir.name)
+
+    def tearDown(self):
+        set_lemma_table({})
+        self.tmp_dir.cleanup()
+
+    #bundle predictions must match the sklearn model it was exported from
+    def test_bundle_matches_sklearn(self):
+        predictor = load_bundle(self.bundle_dir)
+        texts = ["I love the happy day!!", "so sad, I cry", "awful 123 day"]
+        cleaned = normalize_texts(texts)
+
+        labels, probabilities = predictor.predict_cleaned(cleaned)
+        features = self.vectorizer.transform(cleaned)
+        self.assertEqual(list(labels), list(self.model.predict(features)))
+        for probability, expected in zip(probabilities, self.model.predict_proba(features)[:, 1]):
+            self.assertAlmostEqual(probability, expected)
+
+    def test_manifest_and_latest_pointer(self):
+        predictor = load_bundle(self.bundle_dir)
+        with open(os.path.join(self.bundle_dir, "LATEST")) as file:
+            self.assertEqual(file.read(), predictor.version)
+        self.assertEqual(predictor.manifest["model_name"], "emotion_predictor_model")
+        self.assertIn("stop_words.json", predictor.manifest["files"])
+
+    def test_corrupted_bundle_is_rejected(self):
+        version_dir = os.path.join(self.bundle_dir, load_bundle(self.bundle_dir).version)
+        with open(os.path.join(version_dir, "vectorizer.pkl"), "ab") as file:
+            file.write(b"corrupt")
+        with self.assertRaises(ValueError):
+            load_bundle(self.bundle_dir)
+
+
+class RegistryPredictorTests(unittest.TestCase):
+
+    def setUp(self):
+        import mlflow
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.previous_uri = mlflow.get_tracking_uri()
+        mlflow.set_tracking_uri("sqlite:///" + os.path.join(self.tmp_dir.name, "mlflow.db"))
+        mlflow.set_experiment(experiment_id=mlflow.create_experiment(
+            "registry_test", artifact_location=os.path.join(self.tmp_dir.name, "artifacts")))
+
+    def tearDown(self):
+        import mlflow
+
+        mlflow.set_tracking_uri(self.previous_uri)
+        self.tmp_dir.cleanup()
+
+    def register(self, max_features, log_vectorizer=True):
+        import mlflow
+        from src.components.model_evaluation import evaluate_model, log_to_mlflow
+
+        vectorizer = CountVectorizer(max_features=max_features)
+        features = vectorizer.fit_transform(TRAIN_TEXTS)
+        model = LogisticRegression(C=10).fit(features, TRAIN_LABELS)
+        vectorizer_path = os.path.join(self.tmp_dir.name, "vectorizer.pkl")
+        joblib.dump(vectorizer, vectorizer_path)
+
+        info_path = os.path.join(self.tmp_dir.name, "experiment_info.json")
+        acc, report = evaluate_model(model, features, TRAIN_LABELS)
+        log_to_mlflow(model, acc, report, {"C": 10}, "test", info_path,
+                      vectorizer_path if log_vectorizer else None)
+        with open(info_path) as file:
+            run_id = json.load(file)["run_id"]
+        version = mlflow.register_model(f"runs:/{run_id}/model", "emotion_predictor_model").version
+        return version, model, vectorizer
+
+    #every registered version is served with the vectorizer of its own run, not the local one
+    def test_vectorizer_follows_the_version(self):
+        from src.pipeline.prediction_pipeline import registry_predictor
+
+        old_version, _, old_vectorizer = self.register(max_features=3)
+        new_version, new_model, new_vectorizer = self.register(max_features=100)
+        # the local file now holds the newest vectorizer, like after a retrain
+        local_path = os.path.join(self.tmp_dir.name, "vectorizer.pkl")
+
+        old = registry_predictor("emotion_predictor_model", old_version, local_path)
+        new = registry_predictor("emotion_predictor_model", new_version, local_path)
+        self.assertEqual(old.vectorizer.vocabulary_, old_vectorizer.vocabulary_)
+        self.assertEqual(new.vectorizer.vocabulary_, new_vectorizer.vocabulary_)
+        self.assertNotEqual(old.vectorizer.vocabulary_, new.vectorizer.vocabulary_)
+
+        labels, _ = new.predict_cleaned(TRAIN_TEXTS)
+        self.assertEqual(list(labels), list(new_model.predict(new_vectorizer.transform(TRAIN_TEXTS))))
+
+    #a version logged without its vectorizer is only served with an explicit fallback
+    def test_missing_vectorizer_is_rejected(self):
+        from src.pipeline.prediction_pipeline import registry_predictor
+
+        version, _, _ = self.register(max_features=100, log_vectorizer=False)
+        with self.assertRaises(ValueError):
+            registry_predictor("emotion_predictor_model", version)
+        predictor = registry_predictor("emotion_predictor_model", version,
+                                       os.path.join(self.tmp_dir.name, "vectorizer.pkl"))
+        self.assertEqual(predictor.version, str(version))
+
+
+if __name__ == '__main__':
+    unittest.main()
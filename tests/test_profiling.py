@@ -0,0 +1,56 @@
+import os
+import json
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.utils.profiling import profile_stage, step
+
+
+class ProfilingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def read_report(self, stage):
+        with open(os.path.join(self.tmp_dir.name, f"{stage}.json")) as file:
+            return json.load(file)
+
+    #a decorated main writes wall, cpu, peak memory and rows per step
+    def test_stage_report(self):
+        @profile_stage("toy_stage", output_dir=self.tmp_dir.name)
+        def main():
+            with step("allocate") as record:
+                block = np.ones(50 * 2 ** 20 // 8)
+                record["rows"] = len(block)
+            with step("spin"):
+                sum(range(200000))
+
+        main()
+        report = self.read_report("toy_stage")
+        self.assertEqual(list(report["steps"]), ["allocate", "spin"])
+        allocate = report["steps"]["allocate"]
+        self.assertEqual(allocate["rows"], 50 * 2 ** 20 // 8)
+        for key in ("wall_s", "cpu_s", "peak_rss_mb"):
+            self.assertGreaterEqual(allocate[key], 0)
+        self.assertGreaterEqual(report["peak_rss_mb"], allocate["peak_rss_mb"])
+        self.assertGreaterEqual(report["wall_s"], allocate["wall_s"] + report["steps"]["spin"]["wall_s"])
+        self.assertNotIn("rows", report["steps"]["spin"])
+
+    #steps outside a profiled stage are no-ops and a failed stage writes nothing
+    def test_inactive_and_failed(self):
+        with step("outside") as record:
+            record["rows"] = 1
+
+        with self.assertRaises(ValueError):
+            with profile_stage("failed_stage", output_dir=self.tmp_dir.name):
+                raise ValueError("boom")
+        self.assertEqual(os.listdir(self.tmp_dir.name), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
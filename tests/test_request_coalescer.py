@@ -0,0 +1,97 @@
+import threading
+import time
+import unittest
+
+from src.pipeline.request_coalescer import RequestCoalescer, QueueFullError, CoalescerTimeoutError
+
+
+class RequestCoalescerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.batch_sizes = []
+
+    def score_batch(self, texts):
+        self.batch_sizes.append(len(texts))
+        return [len(text) for text in texts], [len(text) / 10 for text in texts]
+
+    #concurrent callers share batches but each gets its own result
+    def test_concurrent_requests_are_batched(self):
+        coalescer = RequestCoalescer(self.score_batch, max_batch_size=8, max_wait_us=50_000)
+        texts = ["x" * i for i in range(1, 33)]
+        results = {}
+
+        def call(text):
+            results[text] = coalescer.predict(text, timeout=5)
+
+        threads = [threading.Thread(target=call, args=(text,)) for text in texts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {text: (len(text), len(text) / 10) for text in texts})
+        self.assertEqual(sum(self.batch_sizes), len(texts))
+        self.assertLess(len(self.batch_sizes), len(texts))
+        self.assertLessEqual(max(self.batch_sizes), 8)
+        self.assertEqual(coalescer.info()["requests"], len(texts))
+
+    def test_scoring_errors_reach_every_caller(self):
+        def fail(texts):
+            raise ValueError("model failed")
+
+        coalescer = RequestCoalescer(fail, max_batch_size=4, max_wait_us=1000)
+        with self.assertRaises(ValueError):
+            coalescer.predict("hello", timeout=5)
+
+    def test_full_queue_rejects(self):
+        release = threading.Event()
+
+        def slow(texts):
+            release.wait(5)
+            return [0] * len(texts), [0.0] * len(texts)
+
+        coalescer = RequestCoalescer(slow, max_batch_size=1, max_wait_us=0, max_queue_size=1)
+        first = coalescer.submit("a")
+        time.sleep(0.05)  # let the scheduler pick up the first request
+        coalescer.submit("b")
+        with self.assertRaises(QueueFullError):
+            coalescer.submit("c")
+        release.set()
+        self.assertEqual(first.result(timeout=5), (0, 0.0))
+        self.assertEqual(coalescer.info()["rejected"], 1)
+
+    #with autostart off requests wait until start(), e.g. in a freshly forked worker
+    def test_deferred_start(self):
+        coalescer = RequestCoalescer(self.score_batch, max_batch_size=4, max_wait_us=0, autostart=False)
+        future = coalescer.submit("abc")
+        time.sleep(0.05)
+        self.assertFalse(future.done())
+        self.assertFalse(coalescer.info()["running"])
+
+        coalescer.start()
+        self.assertEqual(future.result(timeout=5), (3, 0.3))
+
+    #a stalled scheduler makes predict() give up after max wait plus the score timeout
+    def test_stalled_scheduler_times_out(self):
+        release = threading.Event()
+
+        def stalled(texts):
+            release.wait(5)
+            return [0] * len(texts), [0.0] * len(texts)
+
+        coalescer = RequestCoalescer(stalled, max_batch_size=1, max_wait_us=0, score_timeout_s=0.05)
+        coalescer.submit("a")
+        time.sleep(0.05)  # the scheduler is now stuck on "a"
+        start = time.perf_counter()
+        with self.assertRaises(CoalescerTimeoutError):
+            coalescer.predict("b")
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(coalescer.info()["timeouts"], 1)
+
+        # the timed-out request is dropped, later ones are still scored
+        release.set()
+        self.assertEqual(coalescer.predict("c", timeout=5), (0, 0.0))
+        self.assertEqual(coalescer.info()["requests"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+
+from src.utils.text_normalizer import (
+    lemmatization,
+    remove_stop_words,
+    removing_numbers,
+    lower_case,
+    removing_punctuations,
+    removing_urls,
+    normalize_text,
+    normalize_texts,
+    normalize_series,
+    configure_lemma_cache,
+    build_lemma_table,
+    save_lemma_table,
+    load_lemma_table,
+    set_lemma_table,
+    lemma_cache_info,
+)
+
+
+def chained_normalize(text):
+    text = lower_case(text)
+    text = remove_stop_words(text)
+    text = removing_numbers(text)
+    text = removing_punctuations(text)
+    text = removing_urls(text)
+    text = lemmatization(text)
+    return text
+
+
+class TextNormalizerTests(unittest.TestCase):
+
+    texts = [
+        "I love this!",
+        "",
+        "   ",
+        "The cats were RUNNING to the parks yesterday",
+        "check https://t.co/abc123 and www.example.com now",
+        "2nd time in 24hrs... can't believe it :( #sad @friend",
+        "numbers ٣٤ and ² everywhere 100%",
+        "tabs\tand\nnewlines　and؛semicolons",
+        "ΣΟΦΟΣ Straße İstanbul",
+        "don't won't isn't",
+    ]
+
+    #single pass output must match the original six step chain exactly
+    def test_matches_chained_steps(self):
+        for text in self.texts:
+            self.assertEqual(normalize_text(text), chained_normalize(text), text)
+
+    def test_list_and_series_api(self):
+        texts = self.texts + self.texts[:3]
+        expected = [chained_normalize(text) for text in texts]
+
+        self.assertEqual(normalize_texts(texts), expected)
+        self.assertEqual(normalize_series(pd.Series(texts)).tolist(), expected)
+
+    #process pool output is byte-identical to the serial path and keeps the order
+    def test_parallel_matches_serial(self):
+        series = pd.Series([f"{text} {i % 7}" for i in range(60) for text in self.texts])
+        serial = normalize_series(series)
+        parallel = normalize_series(series, n_jobs=2, chunk_size=25)
+        self.assertEqual(parallel.to_csv(), serial.to_csv())
+
+    #lru cache is bounded and reports hits, misses and evictions
+    def test_lemma_cache_is_bounded(self):
+        set_lemma_table({})
+        configure_lemma_cache(maxsize=2)
+        try:
+            for text in ["cats dogs", "cats dogs", "birds"]:
+                normalize_text(text)
+            info = lemma_cache_info()
+            self.assertEqual(info["cache_size"], 2)
+            self.assertEqual(info["hits"], 2)
+            self.assertEqual(info["misses"], 3)
+            self.assertEqual(info["evictions"], 1)
+        finally:
+            configure_lemma_cache()
+
+    #frozen lemma table round trips through disk and gives the same output
+    def test_lemma_table(self):
+        expected = [normalize_text(text) for text in self.texts]
+        table = build_lemma_table(self.texts)
+        self.assertIn("cat", table.values())
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "lemma_table.json")
+            save_lemma_table(table, path)
+            configure_lemma_cache()
+            try:
+                self.assertEqual(load_lemma_table(path), table)
+                self.assertEqual([normalize_text(text) for text in self.texts], expected)
+                self.assertEqual(lemma_cache_info()["misses"], 0)
+            finally:
+                set_lemma_table({})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+
+import joblib
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from src.components.model_export import export_bundle
+from src.components.text_vectorization import vectorize_text
+from src.pipeline.prediction_pipeline import load_bundle
+from src.utils.text_normalizer import set_lemma_table
+from tests.test_prediction_pipeline import TRAIN_TEXTS, TRAIN_LABELS, STOP_WORDS
+
+
+class TextVectorizationTests(unittest.TestCase):
+
+    def setUp(self):
+        self.train_df = pd.DataFrame({"content": TRAIN_TEXTS * 5, "sentiment": TRAIN_LABELS * 5})
+        self.test_df = pd.DataFrame({"content": TRAIN_TEXTS, "sentiment": TRAIN_LABELS})
+
+    #chunked parallel hashing gives the same matrix as one transform
+    def test_hashing_chunks_match_single_pass(self):
+        X_single, _, vectorizer = vectorize_text(self.train_df, self.test_df, None, method="hashing", n_features=64)
+        X_chunked, _, _ = vectorize_text(self.train_df, self.test_df, None, method="hashing", n_features=64,
+                                         n_jobs=2, chunk_size=7)
+        self.assertEqual(X_chunked.shape, (40, 64))
+        self.assertEqual((X_single != X_chunked).nnz, 0)
+        self.assertEqual(X_single.sum(), vectorize_text(self.train_df, self.test_df, 100)[0].sum())
+        self.assertFalse(hasattr(vectorizer, "vocabulary_"))
+
+    #a hashing bundle has no compact scorer but serves through the pickles
+    def test_hashing_bundle(self):
+        X_train, _, vectorizer = vectorize_text(self.train_df, self.test_df, None, method="hashing", n_features=64)
+        model = LogisticRegression(C=10).fit(X_train, self.train_df["sentiment"])
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = os.path.join(tmp_dir, "model.pkl")
+            vectorizer_path = os.path.join(tmp_dir, "vectorizer.pkl")
+            joblib.dump(model, model_path)
+            joblib.dump(vectorizer, vectorizer_path)
+            bundle_dir = export_bundle(model_path, vectorizer_path, None, os.path.join(tmp_dir, "bundle"),
+                                       model_name="emotion_predictor_model", stop_words=STOP_WORDS)
+            try:
+                predictor = load_bundle(bundle_dir)
+                self.assertIsNone(predictor.manifest["compact"])
+                labels, _ = predictor.predict_cleaned(["love happy day", "sad cry day"])
+                self.assertEqual(list(labels), [1, 0])
+            finally:
+                set_lemma_table({})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import json
+import filecmp
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.pipeline import training_pipeline
+from src.components import data_ingestion, data_preprocessing, text_vectorization, model_trainer, model_evaluation
+from tests.test_prediction_pipeline import TRAIN_TEXTS, TRAIN_LABELS
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUTS = ["artifacts/data/raw/train.csv", "artifacts/data/raw/test.csv",
+           "artifacts/data/processed/train_processed.csv", "artifacts/data/processed/test_processed.csv",
+           "artifacts/data/processed/lemma_table.json"]
+
+
+class TrainingPipelineTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+
+        texts = [text for text in TRAIN_TEXTS for _ in range(10)]
+        labels = [label for label in TRAIN_LABELS for _ in range(10)]
+        source = pd.DataFrame({"tweet_id": range(len(texts)), "content": texts,
+                               "sentiment": ["happiness" if label else "sadness" for label in labels]})
+        source.loc[::7, "sentiment"] = "worry"
+        self.source_path = os.path.join(self.tmp_dir.name, "source.csv")
+        source.to_csv(self.source_path, index=False)
+
+        with open(os.path.join(REPO_ROOT, "params.yaml")) as file:
+            self.params = yaml.safe_load(file)
+        self.params["data_ingestion"]["source_url"] = self.source_path
+        self.params["data_preprocessing"]["normalization_cache"] = None
+        self.params["text_vectorization"]["n_jobs"] = 1
+        self.params["data_preprocessing"]["n_jobs"] = 1
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp_dir.cleanup()
+
+    def workdir(self, name):
+        path = os.path.join(self.tmp_dir.name, name)
+        os.makedirs(path)
+        with open(os.path.join(path, "params.yaml"), "w") as file:
+            yaml.safe_dump(self.params, file)
+        os.chdir(path)
+        return path
+
+    #the in-memory runner writes the same outputs as the stages run one after another
+    def test_matches_stages(self):
+        stages_dir = self.workdir("stages")
+        data_ingestion.main()
+        data_preprocessing.main()
+        text_vectorization.main()
+        model_trainer.main([])
+
+        runner_dir = self.workdir("runner")
+        metrics = training_pipeline.run(self.params, export=False)
+        self.assertGreater(metrics["accuracy"], 0.5)
+        self.assertTrue(os.path.exists(os.path.join(runner_dir, "reports", "metrics.yaml")))
+        #the evaluation outs declared in dvc.yaml mark an untracked run, and every covered stage gets its perf report
+        with open(os.path.join(runner_dir, "reports", "experiment_info.json")) as file:
+            self.assertIsNone(json.load(file)["run_id"])
+        for stage in training_pipeline.STAGE_STEPS:
+            if stage != "model_export":
+                self.assertTrue(os.path.exists(os.path.join(runner_dir, "reports", "perf", f"{stage}.json")), stage)
+
+        for path in OUTPUTS:
+            self.assertTrue(filecmp.cmp(os.path.join(stages_dir, path), os.path.join(runner_dir, path), shallow=False),
+                            path)
+        for split in ("train_features", "test_features"):
+            for array in ("data", "indices", "indptr", "labels"):
+                expected = np.load(os.path.join(stages_dir, "artifacts/data/vectorized", split, f"{array}.npy"))
+                actual = np.load(os.path.join(runner_dir, "artifacts/data/vectorized", split, f"{array}.npy"))
+                np.testing.assert_array_equal(actual, expected)
+
+    #with build_lemma_table off both write the empty table dvc.yaml declares, and the export still runs
+    def test_lemma_table_disabled(self):
+        self.params["data_preprocessing"]["build_lemma_table"] = False
+        stages_dir = self.workdir("stages")
+        data_ingestion.main()
+        data_preprocessing.main()
+
+        runner_dir = self.workdir("runner")
+        training_pipeline.run(self.params)
+        for workdir in (stages_dir, runner_dir):
+            with open(os.path.join(workdir, "artifacts/data/processed/lemma_table.json")) as file:
+                self.assertEqual(json.load(file), {})
+        self.assertTrue(os.path.isdir(os.path.join(runner_dir, self.params["model_export"]["bundle_dir"])))
+
+    #a streaming run is tracked with the SGD params it was trained with, not the batch ones
+    def test_tracked_params(self):
+        trainer_params = self.params["model_trainer"]
+        self.assertEqual(model_evaluation.tracked_params({**trainer_params, "mode": "batch"}),
+                         trainer_params["model_params"])
+        tracked = model_evaluation.tracked_params({**trainer_params, "mode": "streaming"})
+        streaming = trainer_params["streaming"]
+        self.assertEqual(tracked, {**streaming["sgd_params"], "mode": "streaming",
+                                   "epochs": streaming["epochs"], "chunk_size": streaming["chunk_size"]})
+
+
+if __name__ == "__main__":
+    unittest.main()